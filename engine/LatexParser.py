@@ -6,6 +6,7 @@ Created on Sun Dec 27 19:15:16 2020
 @author: semyonc
 """
 import re
+import threading
 
 import ply.yacc as yacc
 from lexer import MathLexer
@@ -261,6 +262,51 @@ def _brace_span(latex, pos):
      return n
 
 
+class _ParserPool(object):
+     """Process-wide pool of built LALR machines and their lexers.
+
+     ``yacc.yacc`` reflects over the grammar, checks the parsetab signature
+     and binds every production; ``lex.lex`` compiles the master token
+     regex.  Together they cost several times a whole parse, yet a built
+     machine keeps no state between parses.  Each lease is exclusive: a
+     parse on another thread, or a nested parse started from a grammar
+     action, takes a different entry (built on demand), so no two parses
+     ever share a live LR stack.  The notation target and the admitted
+     command words are bound per lease, never per build.
+     """
+
+     def __init__(self):
+          self._lock = threading.Lock()
+          self._idle = []
+          self.built = 0
+
+     def _build(self):
+          grammar = MathParser(None)
+          grammar.yacc = yacc.yacc(module=grammar, start='formula')
+          with self._lock:
+               self.built += 1
+          return grammar, MathLexer()
+
+     def acquire(self):
+          with self._lock:
+               if self._idle:
+                    return self._idle.pop()
+          return self._build()
+
+     def release(self, entry):
+          grammar, lexer = entry
+          grammar.notation = None
+          with self._lock:
+               self._idle.append(entry)
+
+     def clear(self):
+          with self._lock:
+               self._idle = []
+
+
+_POOL = _ParserPool()
+
+
 class MathParser(object):
      tokens = MathLexer.tokens
      literals = MathLexer.literals
@@ -272,21 +318,32 @@ class MathParser(object):
          ('right', '^', '_'),
      )
 
-     def __init__(self, notation, command_names=None):
+     def __init__(self, notation, command_names=None, pool=None):
+         # Construction is cheap: the LALR machine comes from the pool at
+         # parse time, so callers may make a parser per string.
          self.notation = notation
          self.command_names = (MathLexer.KNOWN_COMMANDS
                                if command_names is None
                                else frozenset(command_names))
-         self.yacc = yacc.yacc(module=self,start='formula')
+         self.pool = _POOL if pool is None else pool
 
      def parse(self, input):
          input = _normalize_plain_array_envs(input)
          input = _normalize_collection_literals(input)
          input = _lower_bare_abs(input)
+         entry = self.pool.acquire()
+         grammar, lexer = entry
+         grammar.notation = self.notation
+         lexer.command_names = self.command_names
+         try:
+             return self._parse(grammar, lexer, input)
+         finally:
+             self.pool.release(entry)
+
+     def _parse(self, grammar, lexer, input):
          self.notation.clear()
          try:
-             return self.yacc.parse(
-                 input, lexer=MathLexer(command_names=self.command_names))
+             return grammar.yacc.parse(input, lexer=lexer)
          except Exception:
              # TeX reads \frac12 as \frac{1}{2} (one token per unbraced
              # argument), but this dialect's lexer fuses the digit run
@@ -299,8 +356,7 @@ class MathParser(object):
              if rewritten == input:
                  raise
              self.notation.clear()
-             return self.yacc.parse(
-                 rewritten, lexer=MathLexer(command_names=self.command_names))
+             return grammar.yacc.parse(rewritten, lexer=lexer)
 
      def p_formula(self, p):
          'formula : logical-expr'
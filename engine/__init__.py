@@ -1,12 +1,12 @@
 from os.path import dirname, realpath
 import sys
-import IPython.display
 
 sys.path.append(dirname(realpath(__file__)))
 
 math_shell = None
 
-handler = IPython.display.display
+# None until set: IPython's own display, imported on first use
+handler = None
 
 
 def get_mathshell():
@@ -18,6 +18,9 @@ def setShell(shell):
     math_shell = shell
 
 def display(*objs, **kwargs):
+    if handler is None:
+        import IPython.display
+        setHandler(IPython.display.display)
     handler(*objs, **kwargs)
 
 
@@ -853,6 +853,7 @@ class CodexRunHandle(ThreadedRunHandle):
 
     def run(self):
         import observability
+        import primitives
         metadata = dict(self.request.trace_metadata or {})
         metadata.update(backend=CodexBackend.name,
                         model=self.thread.model or 'default')
@@ -869,6 +870,7 @@ class CodexRunHandle(ThreadedRunHandle):
                 'status': outcome.status,
                 'tool_calls': len(outcome.tool_calls),
                 'native_tool_calls': list(outcome.native_tool_calls),
+                'oracle_cache': primitives.VERDICT_CACHE.stats(),
             })
             return self._translate(outcome)
 
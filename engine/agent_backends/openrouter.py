@@ -297,6 +297,9 @@ class OpenRouterRunHandle(ThreadedRunHandle):
                 return AgentOutcome(status=INTERRUPTED)
             final = str(result.final_output or '').strip()
             observability.set_output(span, final or None)
+            import primitives
+            observability.set_metadata(span, {
+                'oracle_cache': primitives.VERDICT_CACHE.stats()})
             return AgentOutcome(status=COMPLETED, final_text=final)
 
     async def _drive(self):
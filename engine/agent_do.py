@@ -75,7 +75,9 @@ The compact core tactic skill is already present. For a subject workflow,
 call `load_skill` before attempting one of its tactics. The loaded skill gives
 the exact interface. Call `run_tactic` with a tactic name and an ordered list
 of string arguments. Successful transformations are appended to the notebook
-ledger and rendered immediately.
+ledger and rendered immediately. When the next several moves are already
+fixed, `run_tactics` runs them as one call, piping results forward with
+"@prev".
 """
 
 _DO_RULES = """
@@ -283,6 +285,8 @@ class DoSession(object):
         # the SDK executes sync tools on a thread pool, so parallel tool
         # calls hit the ledger concurrently - serialize the appends
         self._lock = threading.RLock()
+        #: steps recorded inside an open transaction, streamed on commit
+        self._deferred = None
 
     # -- cancellation boundary --------------------------------------------
     def close(self, reason=USER):
@@ -396,6 +400,29 @@ class DoSession(object):
                 self._refuse()
             yield
 
+    @contextlib.contextmanager
+    def transaction(self):
+        """Hold the ledger boundary across several records, all-or-nothing.
+
+        Steps reach `on_step` only once the block completes, so the
+        notebook never renders a step that a failure then takes back."""
+        with self._mutate():
+            outer, self._deferred = self._deferred, []
+            try:
+                with self.ledger.transaction():
+                    yield
+                landed = self._deferred
+            finally:
+                self._deferred = outer
+        for step in landed:
+            self._emit_step(step)
+
+    def _emit_step(self, step):
+        if self._deferred is not None:
+            self._deferred.append(step)
+        elif self.on_step is not None:
+            self.on_step(step)
+
     def record(self, result):
         """Ledger a successful transforming result; always return the
         (possibly step-annotated) record."""
@@ -419,8 +446,7 @@ class DoSession(object):
                     return refused
                 result = dict(result)
                 result['step'] = {'id': step['id'], 'hash': step['hash']}
-                if self.on_step is not None:
-                    self.on_step(step)
+                self._emit_step(step)
         return result
 
     def new_steps(self):
@@ -680,6 +706,24 @@ def make_api(session):
         result = tactic_registry.invoke_agent(tactic, arguments, session)
         return json.dumps(result, ensure_ascii=False, default=str)
 
+    def run_tactics(calls: list[list[str]]) -> str:
+        """Run a fixed sequence of tactics as one move; returns one record.
+
+        Each call is [tactic, argument, ...]. An argument "@prev" is the
+        previous call's result and "@N" the N-th call's, so a known
+        pipeline such as expand, collect, factor_quadratic takes one call.
+        The batch stops at the first refusal and then records nothing.
+
+        Args:
+            calls: ordered [tactic, arguments...] lists; tactics from
+                loaded skills only.
+        """
+        try:
+            result = tactic_registry.invoke_batch(calls, session)
+        except ValueError as exc:   # SessionClosed: the run was stopped
+            result = {'ok': False, 'op': 'batch', 'error': str(exc)}
+        return json.dumps(result, ensure_ascii=False, default=str)
+
     def comment(text: str, from_step: str = '') -> str:
         """Add a short unverified strategy note or exploration marker.
 
@@ -901,6 +945,7 @@ def make_api(session):
     api = {
         'load_skill': load_skill,
         'run_tactic': run_tactic,
+        'run_tactics': run_tactics,
         'comment': comment,
         'claim': claim,
         'conclude': conclude,
@@ -932,13 +977,15 @@ def make_api(session):
 # the stable model-visible surface, in the order the model sees it. Tactic
 # growth must never grow this list: subjects arrive through load_skill and
 # run_tactic.
-TOOL_NAMES = ('load_skill', 'run_tactic', 'comment', 'claim', 'conclude',
-              'set_result', 'set_open')
+TOOL_NAMES = ('load_skill', 'run_tactic', 'run_tactics', 'comment', 'claim',
+              'conclude', 'set_result', 'set_open')
 FIGURE_TOOL_NAMES = ('plot', 'tikz')
 
 _JSON_TYPES = {
     str: {'type': 'string'},
     list[str]: {'type': 'array', 'items': {'type': 'string'}},
+    list[list[str]]: {'type': 'array', 'items': {
+        'type': 'array', 'items': {'type': 'string'}}},
 }
 
 
@@ -1149,6 +1196,7 @@ def run_instruction(instruction, ledger=None, on_step=None, model=None,
     # only, and `match` swallows its own failures so a malformed route file
     # can never take a derivation down.
     matched = strategy_routes.match(instruction)
+    oracle_before = primitives.VERDICT_CACHE.stats()
     trace_metadata = {'mode': 'prove' if proof_goal is not None else 'do'}
     if matched:
         trace_metadata['strategy_routes'] = ','.join(
@@ -1193,9 +1241,20 @@ def run_instruction(instruction, ledger=None, on_step=None, model=None,
     # Non-ledger run metadata, always present: a later failure can then say
     # whether guidance was absent, mismatched, or delivered and ignored.
     result['strategy_routes'] = [route['id'] for route in matched]
+    result['oracle_cache'] = _oracle_cache_delta(
+        oracle_before, primitives.VERDICT_CACHE.stats())
     return result
 
 
+def _oracle_cache_delta(before, after):
+    """How this run used the shared verdict cache (counters only; the
+    cache outlives the run)."""
+    delta = {name: after[name] - before[name]
+             for name in ('hits', 'disk_hits', 'misses')}
+    delta['size'] = after['size']
+    return delta
+
+
 # ---------------------------------------------------------------------------
 # finalizer: one run's result, assembled from the ledger
 # ---------------------------------------------------------------------------
@@ -308,7 +308,7 @@ def _is_debris(fragment):
     return fragment.count('\\begin') != fragment.count('\\end')
 
 
-def _accept(text, start, end, bare_seeds):
+def _accept(text, start, end, bare_seeds, cache=None):
     """Validate a candidate, shortening it at prose only.
 
     Returns `(start, end, latex)`: the bounds are the trimmed ones, because
@@ -320,7 +320,7 @@ def _accept(text, start, end, bare_seeds):
     fragment = text[start:end]
     if _is_debris(fragment):
         return None
-    segment = _math_segment(_normalize(fragment))
+    segment = _formula(_normalize(fragment), cache)
     if segment is not None:
         return start, end, segment['latex']
     # The scan reached past the formula into the sentence around it. Retry at
@@ -333,7 +333,7 @@ def _accept(text, start, end, bare_seeds):
         head = text[head_start:head_end]
         if not _seeded(head, bare_seeds):
             continue
-        segment = _math_segment(_normalize(head))
+        segment = _formula(_normalize(head), cache)
         if segment is not None:
             return head_start, head_end, segment['latex']
     return None
@@ -353,7 +353,7 @@ def _prose_cuts(fragment):
     return cuts
 
 
-def formula_spans(text, bare_seeds=True):
+def formula_spans(text, bare_seeds=True, cache=None):
     """Every `(start, end, latex)` in `text` that is a formula.
 
     `bare_seeds` admits fragments whose only evidence is notation rather than
@@ -368,7 +368,8 @@ def formula_spans(text, bare_seeds=True):
         if candidate is None:
             break
         candidate_start, candidate_end = candidate
-        accepted = _accept(text, candidate_start, candidate_end, bare_seeds)
+        accepted = _accept(text, candidate_start, candidate_end, bare_seeds,
+                           cache)
         if accepted is None:
             cursor = max(candidate_end, candidate_start + 1)
             continue
@@ -393,9 +394,9 @@ def _prose_text(segments, text):
         segments.append({'kind': 'text', 'text': text[position:]})
 
 
-def prose_segments(text, bare_seeds=True):
+def prose_segments(text, bare_seeds=True, cache=None):
     """Segments for prose with formulas in it, or None if it holds none."""
-    spans = formula_spans(text, bare_seeds)
+    spans = formula_spans(text, bare_seeds, cache)
     if not spans:
         return None
     segments = []
@@ -426,14 +427,18 @@ def _math_segment(text):
     return {'kind': 'math', 'latex': latex}
 
 
-def _statement_segments(line):
+def _formula(text, cache):
+    return _math_segment(text) if cache is None else cache.formula(text)
+
+
+def _statement_segments(line, cache=None):
     """Segments for one statement, or None if any part of it is not math."""
     segments = []
     position = 0
     for match in _BACKREF_RE.finditer(line):
         head = line[position:match.start()]
         if head.strip():
-            segment = _math_segment(head)
+            segment = _formula(head, cache)
             if segment is None:
                 return None
             segments.append(segment)
@@ -441,14 +446,14 @@ def _statement_segments(line):
         position = match.end()
     tail = line[position:]
     if tail.strip():
-        segment = _math_segment(tail)
+        segment = _formula(tail, cache)
         if segment is None:
             return None
         segments.append(segment)
     return segments or None
 
 
-def whole_formula(body):
+def whole_formula(body, cache=None):
     """Segments for a body that is a formula per statement, or None."""
     if has_prose(body):
         return None
@@ -456,7 +461,8 @@ def whole_formula(body):
     for line in split_lines(body):
         if not line.strip():
             continue
-        statement = _statement_segments(line)
+        statement = (_statement_segments(line) if cache is None
+                     else cache.statement(line))
         if statement is None:
             return None            # all-or-nothing: the cell stays raw
         if segments:
@@ -465,7 +471,8 @@ def whole_formula(body):
     return segments or None
 
 
-def preview(code, command_names=(), prose_commands=(), bare_seeds=True):
+def preview(code, command_names=(), prose_commands=(), bare_seeds=True,
+            cache=None):
     """Segments for the rendered view of `code`, or None to keep it raw.
 
     Returns a list of `{'kind': 'command'|'math'|'ref'|'text'|'break', ...}`
@@ -475,6 +482,9 @@ def preview(code, command_names=(), prose_commands=(), bare_seeds=True):
     where the argument goes to the agent — as prose with formulas in it. So
     `int! \\int x^2 dx` renders as one formula rather than as a sentence that
     happens to contain one.
+
+    A `PreviewCache` makes the reading incremental: statements and fragments
+    it has parsed before are not parsed again.
     """
     stripped = code.strip()
     if not stripped:
@@ -483,11 +493,77 @@ def preview(code, command_names=(), prose_commands=(), bare_seeds=True):
                                          prose_commands)
     if not body:
         return None
-    segments = whole_formula(body)
+    segments = whole_formula(body, cache)
     if segments is None and prose:
-        segments = prose_segments(body, bare_seeds)
+        segments = prose_segments(body, bare_seeds, cache)
     if not segments:
         return None
     if label:
         segments.insert(0, {'kind': 'command', 'text': label})
     return segments
+
+
+# ----------------------------------------------------------------------
+# Previewing as the user types
+#
+# The extension asks again on every edit, and an edit touches one line of a
+# cell. Every reading above is a pure function of the characters it reads,
+# so a statement or fragment seen before can answer from its text alone.
+# ----------------------------------------------------------------------
+
+class PreviewCache:
+    """Formula readings keyed by the text they were read from.
+
+    Holds the parse of each statement of a whole-formula cell and of each
+    candidate fragment of a prose scan — the trial parses are what a
+    preview spends its time on. Bounded: the least recently used reading
+    goes first. The shell keeps one for its lifetime; a reading never
+    depends on history, so nothing in it goes stale.
+    """
+
+    def __init__(self, limit=2048):
+        self.limit = limit
+        self._readings = {}
+
+    def __len__(self):
+        return len(self._readings)
+
+    def _reading(self, key, read):
+        readings = self._readings
+        if key in readings:
+            value = readings.pop(key)
+        else:
+            value = read()
+            while len(readings) >= self.limit:
+                readings.pop(next(iter(readings)))
+        readings[key] = value
+        return value
+
+    def formula(self, text):
+        """`_math_segment(text)`, parsed once per distinct text."""
+        segment = self._reading(('formula', text),
+                                lambda: _math_segment(text))
+        return None if segment is None else dict(segment)
+
+    def statement(self, line):
+        """`_statement_segments(line)`, read once per distinct line."""
+        segments = self._reading(('statement', line),
+                                 lambda: _statement_segments(line, self))
+        return None if segments is None else [dict(s) for s in segments]
+
+
+def diff_segments(old, new):
+    """`(start, end, changed)` such that `old[:start] + changed + old[end:]`
+    is `new`.
+
+    The common head and tail are left out, so an edit inside one line of a
+    long cell travels as the few segments that line renders to.
+    """
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    tail = 0
+    while tail < limit - start and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    return start, len(old) - tail, new[start:len(new) - tail]
@@ -9,6 +9,7 @@ from collections import defaultdict
 from LatexParser import MathParser
 from LatexWriter import LaTexWriter
 from value import *
+from notation import HashConsedNotation
 
 
 class Scanner(LaTexWriter):
@@ -368,5 +369,12 @@ def pattern(expr, params=None):
 
 
 def s_equal(sym1, notation1, sym2, notation2, ctx=None):
+    # one interned node is one tree; `...` is the exception, since the
+    # comparer reads it as a pattern rather than a term
+    if (isinstance(notation1, HashConsedNotation)
+            and notation1.identical(sym1, notation2, sym2)):
+        f = notation1.get(sym1)
+        if f is None or f.plain:
+            return True
     comparer = NotationComparer(sym2, notation2)
     return comparer.match(sym1, notation1, ctx) is not None
@@ -0,0 +1,11 @@
+"""pytest setup shared by the engine suites."""
+import atexit
+import os
+import shutil
+import tempfile
+
+# the first use of the lemma table compiles the committed packs and caches
+# the result; a test run must neither write into nor read from ~/.toymath
+_LEMMA_CACHE = tempfile.mkdtemp(prefix='toymath-lemma-cache-')
+os.environ['TOYMATH_LEMMA_CACHE'] = _LEMMA_CACHE
+atexit.register(shutil.rmtree, _LEMMA_CACHE, True)
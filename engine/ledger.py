@@ -8,17 +8,34 @@ valid arguments plus an independent numeric spot-check. The ledger is the
 artifact: auditable, reproducible (replayable), honestly conditional through
 its accumulated assumptions.
 
-Persistence is a plain JSON file so an agent can keep a session across turns.
+Persistence is a plain-text JSON-Lines log so an agent can keep a session
+across turns; each save appends what changed.
 """
+import contextlib
 import json
+import mmap
 import os
 import hashlib
 import html as _html
+import tempfile
 
+from primitives import engine_fingerprint as _engine_fingerprint
 from tactic_registry import TRANSFORMING_OPS
-from tactics import core as core_tactics
+from tactic_registry import core as core_tactics  # loads on first call
 
-LEDGER_VERSION = 2
+LEDGER_VERSION = 3
+
+# A v3 session is a JSON-Lines log: one header line, then one record per
+# line, appended as the session grows instead of rewriting the document.
+# Steps, assumptions and selections only ever grow; a claim is logged again
+# whole when it changes (conclude), and the later line wins.  A rewrite
+# ("compaction") drops the superseded claim lines once they pile up.
+_LOG_HEADER = {'version': LEDGER_VERSION, 'format': 'toymath-ledger-log'}
+_LOG_KINDS = {'step': 'steps', 'assumption': 'assumptions',
+              'claim': 'claims', 'selection': 'selections'}
+_LOG_SECTIONS = {section: kind for kind, section in _LOG_KINDS.items()}
+_COMPACT_STALE = 64     # superseded claim lines tolerated before a rewrite
+_FSYNC_BATCH = 32       # appended records between fsyncs
 
 
 def _display_latex(latex):
@@ -285,21 +302,382 @@ def _source_ids(step):
     return out
 
 
+def _verify_transform(job):
+    """Re-run one transforming step and compare it with its record.
+
+    Depends on nothing but the step itself, so replay may run it in a
+    worker process.  Returns {'assumptions', 'check'} on success, or a
+    failure record carrying 'reason' (and the two results on a mismatch)."""
+    import tactic_registry
+    op, args, result, solutions = job
+    res = tactic_registry.replay(op, args)
+    if not res.get('ok'):
+        return {'reason': res.get('error')}
+    if res.get('result') != result:
+        # tolerate formatting drift between versions, but only if
+        # the results are semantically equal
+        eq = core_tactics.equal_exprs(res.get('result'), result)
+        if not (eq.get('ok') and eq.get('verdict') == 'yes'):
+            return {'reason': 'result mismatch', 'recorded': result,
+                    'replayed': res.get('result')}
+    if solutions is not None and res.get('solutions') != solutions[0]:
+        return {'reason': 'solution metadata mismatch'}
+    if res.get('check', {}).get('status') == 'disagree':
+        return {'reason': 'numeric oracle disagrees on replay'}
+    return {'assumptions': res.get('assumptions', []),
+            'check': res.get('check', {'status': 'skipped'})}
+
+
+def _transform_job(step):
+    solutions = (step['solutions'],) if 'solutions' in step else None
+    return step['op'], step['args'], step['result'], solutions
+
+
+class ReplayCache(object):
+    """Content-addressed store of transforming steps that replayed clean.
+
+    The key covers the step's hash and everything its verification reads
+    (op, arguments, recorded result and solutions) together with the
+    engine fingerprint, so an entry can only ever be reused for the same
+    step under the same code.  Only successes are stored: a failing step
+    is always re-run.  One small JSON file per entry, written atomically,
+    so concurrent sessions can share a directory."""
+
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def default(cls):
+        path = os.environ.get('TOYMATH_REPLAY_CACHE') or os.path.join(
+            os.path.expanduser('~'), '.toymath', 'replay-cache')
+        return cls(path)
+
+    @staticmethod
+    def key(step):
+        blob = json.dumps([_engine_fingerprint(), step.get('hash'),
+                           _transform_job(step)],
+                          sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], key + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._file(key), 'r', encoding='utf-8') as fh:
+                outcome = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(outcome, dict) or 'check' not in outcome:
+            return None
+        return outcome
+
+    def put(self, key, outcome):
+        folder = os.path.dirname(self._file(key))
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                json.dump(outcome, fh, ensure_ascii=False, default=str)
+            os.replace(tmp, self._file(key))
+        except OSError:
+            pass
+
+
+def verdict_cache_path(session_path):
+    """Where a session keeps its oracle verdicts on disk: a folder beside
+    the ledger file, shared by the sessions kept in the same directory."""
+    return os.path.join(os.path.dirname(os.path.abspath(session_path)),
+                        '.toymath-verdicts')
+
+
+# Below this many steps to re-run, starting the pool costs more than the
+# serial replay it would save.
+_POOL_MIN_JOBS = 8
+
+
+def _run_transforms(jobs, workers):
+    """_verify_transform over jobs, fanned out over a process pool when
+    there are enough of them; serially when the platform cannot start
+    one."""
+    if workers > 1 and len(jobs) >= _POOL_MIN_JOBS:
+        # multiprocessing is a noticeable share of a cold import
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            with ProcessPoolExecutor(
+                    max_workers=min(workers, len(jobs))) as pool:
+                return list(pool.map(_verify_transform, jobs,
+                                     chunksize=max(1, len(jobs)
+                                                   // (4 * workers))))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass
+    return [_verify_transform(job) for job in jobs]
+
+
+def _read_umask():
+    """The process umask, read without changing it where the platform
+    shows it (Linux); elsewhere set-and-restore, which is why this runs
+    once at import rather than while other threads may create files."""
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as fh:
+            for line in fh:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _read_umask()
+
+
+def _log_line(kind, record):
+    return json.dumps({'k': kind, 'v': record}, ensure_ascii=False,
+                      separators=(',', ':')) + '\n'
+
+
+def _claim_text(claim):
+    return json.dumps(claim, sort_keys=True, ensure_ascii=False)
+
+
+class _LogData(dict):
+    """The ledger's data dict over a mapped v3 log.
+
+    Sections other than claims are decoded the first time they are read,
+    so opening a long session to record a claim never decodes a step.
+    Anything that walks the whole dict decodes everything first."""
+
+    def __init__(self, buf, spans, claims):
+        super(_LogData, self).__init__(version=LEDGER_VERSION,
+                                       claims=claims)
+        self._buf = buf
+        self._spans = spans
+
+    def _decode(self, section):
+        buf = self._buf
+        records = [json.loads(buf[a:b])['v']
+                   for a, b in self._spans.pop(section)]
+        dict.__setitem__(self, section, records)
+        if not self._spans:
+            self.close()
+        return records
+
+    def close(self):
+        """Release the mapped file.  Sections not read by then are gone,
+        so this is for a log fully decoded or a ledger being dropped."""
+        if self._buf is not None:
+            self._buf.close()
+            self._buf = None
+
+    def pending(self, section):
+        """True while ``section`` is still undecoded (so unchanged)."""
+        return section in self._spans
+
+    def materialize(self):
+        for section in list(self._spans):
+            self._decode(section)
+        return self
+
+    def __missing__(self, key):
+        if key in self._spans:
+            return self._decode(key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._spans or dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __iter__(self):
+        return dict.__iter__(self.materialize())
+
+    def __len__(self):
+        return dict.__len__(self.materialize())
+
+    def keys(self):
+        return dict.keys(self.materialize())
+
+    def values(self):
+        return dict.values(self.materialize())
+
+    def items(self):
+        return dict.items(self.materialize())
+
+    def __eq__(self, other):
+        return dict.__eq__(self.materialize(), other)
+
+    __hash__ = None
+
+
+def _read_log(path):
+    """(data, state) for a v3 log, or None when ``path`` holds a legacy
+    single-document session.
+
+    The file is mapped rather than read, and only the record kind at the
+    head of each line is looked at here; the records themselves are
+    decoded on demand.  A final line without its newline is a torn append
+    and is ignored — the next save rewrites the file."""
+    with open(path, 'rb') as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return None
+        buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    # every way out short of handing the map to _LogData releases it
+    try:
+        end = buf.find(b'\n')
+        try:
+            header = json.loads(buf[:end if end >= 0 else len(buf)])
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get('format') != \
+                _LOG_HEADER['format']:
+            buf.close()
+            return None
+        if header.get('version') != LEDGER_VERSION:
+            raise ValueError(f'session file version {header.get("version")} '
+                             f'not supported')
+        spans = {section: [] for section in _LOG_SECTIONS}
+        torn = end < 0
+        start = end + 1
+        prefix = b'{"k":"'
+        while not torn and start < len(buf):
+            end = buf.find(b'\n', start)
+            if end < 0:
+                torn = True
+                break
+            if buf[start:start + len(prefix)] != prefix:
+                raise ValueError(f'corrupt session log at byte {start}')
+            close = buf.find(b'"', start + len(prefix), end)
+            kind = buf[start + len(prefix):close].decode('ascii')
+            if kind not in _LOG_KINDS:
+                raise ValueError(f'unknown session record kind {kind!r}')
+            spans[_LOG_KINDS[kind]].append((start, end))
+            start = end + 1
+        claim_lines = len(spans['claims'])
+        claims = {}
+        for a, b in spans.pop('claims'):
+            claim = json.loads(buf[a:b])['v']
+            claims[claim.get('id')] = claim
+    except BaseException:
+        buf.close()
+        raise
+    data = _LogData(buf, spans, list(claims.values()))
+    state = {'path': path, 'torn': torn, 'unsynced': 0,
+             'counts': {section: len(spans[section]) for section in spans},
+             'claims': {cid: _claim_text(c) for cid, c in claims.items()},
+             'claim_lines': claim_lines}
+    return data, state
+
+
+def _assumption_key(assumption):
+    if isinstance(assumption, str):
+        return assumption
+    return json.dumps(assumption, sort_keys=True, ensure_ascii=False,
+                      default=str)
+
+
+class _LedgerIndex(object):
+    """Lookups over a ledger's append-only lists, kept up to date by
+    indexing only what was appended since the last look.
+
+    Each ``*_of`` call syncs one list and returns the index: a list that
+    grew is indexed from where the last sync stopped, and a list that was
+    replaced or shrank is re-indexed from scratch, so the index can never
+    lag behind the ledger it serves — only in-place edits of an indexed
+    record's id, goal, op or result go unseen, and the ledger never makes
+    those."""
+
+    def __init__(self):
+        self._steps = None
+        self._claims = None
+        self._assumptions = None
+
+    def steps_of(self, steps):
+        if steps is not self._steps or len(steps) < self._indexed:
+            self._steps = steps
+            self._indexed = 0
+            self.by_id = {}         # first step with each id
+            self.order = {}         # id -> ledger position
+            self.by_goal = {}       # goal -> steps, in ledger order
+            self.pending = {}       # goal -> unresolved markers, in order
+            self.resolved = {}      # marker id -> the step resolving it
+            self.last_result = {}   # goal -> latest recorded result
+            self.last = None        # latest recorded result overall
+        for step in steps[self._indexed:]:
+            self._add_step(step)
+        self._indexed = len(steps)
+        return self
+
+    def _add_step(self, step):
+        goal = step.get('goal')
+        self.by_id.setdefault(step.get('id'), step)
+        self.order.setdefault(step.get('id'), self._indexed)
+        self.by_goal.setdefault(goal, []).append(step)
+        self._indexed += 1
+        result = step.get('result')
+        if result is not None:
+            self.last = result
+            self.last_result[goal] = result
+            if step.get('op') in TRANSFORMING_OPS:
+                for marker in self.pending.pop(goal, ()):
+                    self.resolved[marker.get('id')] = step
+                return
+        if step.get('op') == 'branch':
+            self.pending.setdefault(goal, []).append(step)
+
+    def claims_of(self, claims):
+        if claims is not self._claims or len(claims) < self._claim_count:
+            self._claims = claims
+            self._claim_count = 0
+            self.claim_by_id = {}
+        for claim in claims[self._claim_count:]:
+            self.claim_by_id.setdefault(claim.get('id'), claim)
+        self._claim_count = len(claims)
+        return self
+
+    def assumptions_of(self, assumptions):
+        if (assumptions is not self._assumptions
+                or len(assumptions) < self._assumption_count):
+            self._assumptions = assumptions
+            self._assumption_count = 0
+            self.assumption_keys = set()
+        for assumption in assumptions[self._assumption_count:]:
+            self.assumption_keys.add(_assumption_key(assumption))
+        self._assumption_count = len(assumptions)
+        return self
+
+
 class Ledger(object):
     def __init__(self, path=None):
         self.path = path
         self.data = {'version': LEDGER_VERSION, 'steps': [],
                      'assumptions': [], 'claims': [], 'selections': []}
+        # what the v3 log at `path` already holds; None until the ledger
+        # has been read from or written to one
+        self._log = None
+        self._idx = _LedgerIndex()
         if path and os.path.exists(path):
+            loaded = _read_log(path)
+            if loaded is not None:
+                self.data, self._log = loaded
+                return
             with open(path, 'r', encoding='utf-8') as fh:
                 self.data = json.load(fh)
             version = self.data.get('version')
-            if version == 1:
-                # v1 steps are valid v2 steps. Upgrade in memory; the next
-                # save writes the v2 envelope without changing old records.
+            if version in (1, 2):
+                # v1 steps are valid v2 steps, and v2 documents hold
+                # exactly the v3 records. Upgrade in memory; the next save
+                # writes the v3 log without changing old records.
                 self.data['version'] = LEDGER_VERSION
-                self.data.setdefault('claims', [])
-            elif version != LEDGER_VERSION:
+            else:
                 raise ValueError(
                     f'session file version {version} '
                     f'not supported')
@@ -322,32 +700,22 @@ class Ledger(object):
     def selections(self):
         return self.data['selections']
 
+    def _steps_index(self):
+        return self._idx.steps_of(self.steps)
+
     @staticmethod
-    def _pending_branches_in(steps, goal):
+    def _pending_branches_in(index, goal):
         """Return unresolved markers for ``goal`` in ledger order.
 
         This is derived solely from ledger order: the first later
         transforming step in the same goal resolves a marker.  No hidden
         mutable branch cursor participates in recording or replay.
         """
-        pending = []
-        for step in reversed(steps):
-            if step.get('goal') != goal:
-                continue
-            if (step.get('op') in TRANSFORMING_OPS
-                    and step.get('result') is not None):
-                break
-            if step.get('op') == 'branch':
-                pending.append(step)
-        return list(reversed(pending))
-
-    @classmethod
-    def _pending_branch_in(cls, steps, goal):
-        pending = cls._pending_branches_in(steps, goal)
-        return pending[-1] if pending else None
+        return list(index.pending.get(goal, ()))
 
     def _pending_branch(self, goal):
-        return self._pending_branch_in(self.steps, goal)
+        pending = self._steps_index().pending.get(goal)
+        return pending[-1] if pending else None
 
     def _branch_edge(self, marker, target):
         args = marker.get('args') or {}
@@ -363,8 +731,7 @@ class Ledger(object):
         # Only the abandon-the-source-itself form (the target restarts from
         # the source step's recorded INPUT) marks its anchor; the result
         # anchor wins when both match, so replay re-derives deterministically.
-        source = next((s for s in self.steps
-                       if s.get('id') == args.get('from')), None)
+        source = self._steps_index().by_id.get(args.get('from'))
         if (source is not None
                 and not _chain_links(source.get('result'),
                                      target.get('input'))
@@ -374,7 +741,7 @@ class Ledger(object):
         return edge
 
     def get_claim(self, claim_id):
-        return next((c for c in self.claims if c['id'] == claim_id), None)
+        return self._idx.claims_of(self.claims).claim_by_id.get(claim_id)
 
     def record_claim(self, statement, parent=None):
         """Record a parseable root claim or subclaim, initially open.
@@ -422,6 +789,22 @@ class Ledger(object):
         self.claims.append(claim)
         return claim
 
+    @contextlib.contextmanager
+    def transaction(self):
+        """Record several steps all-or-nothing: if the block raises, every
+        step, assumption and selection appended inside it is dropped again.
+        Claims are edited in place and are not covered."""
+        marks = {section: len(self.data[section])
+                 for section in ('steps', 'assumptions', 'selections')}
+        try:
+            yield self
+        except BaseException:
+            for section, mark in marks.items():
+                del self.data[section][mark:]
+            # the lists shrank in place and may grow back past the index
+            self._idx = _LedgerIndex()
+            raise
+
     def record(self, result, goal=None):
         """Append a successful primitive result; returns the step record."""
         if not result.get('ok'):
@@ -432,8 +815,7 @@ class Ledger(object):
         pending_branch = self._pending_branch(goal)
         if pending_branch is not None:
             source_id = pending_branch['args']['from']
-            source = next((s for s in self.steps
-                           if s.get('id') == source_id), None)
+            source = self._steps_index().by_id.get(source_id)
             if (source is None
                     or not (_chain_links(source.get('result'),
                                          result.get('input'))
@@ -499,7 +881,7 @@ class Ledger(object):
                 'or take a different route')
         import tactic_registry
         provenance_error = tactic_registry.validate_provenance(
-            step, {s['id']: s for s in self.steps})
+            step, self._steps_index().by_id)
         if provenance_error:
             raise ValueError(
                 f'{provenance_error}; a step that would fail replay is '
@@ -507,7 +889,8 @@ class Ledger(object):
                 'steps, or run without a session for an unrecorded check')
         self.steps.append(step)
         for a in step['assumptions']:
-            if a not in self.assumptions:
+            if (_assumption_key(a) not in self._idx.assumptions_of(
+                    self.assumptions).assumption_keys):
                 self.assumptions.append(a)
         return step
 
@@ -559,8 +942,7 @@ class Ledger(object):
                 'transforming step; markers do not stack — record a plain '
                 'comment (no from_step) for a note, or run the continuing '
                 'tactic first')
-        source = next((s for s in self.steps if s.get('id') == from_step),
-                      None)
+        source = self._steps_index().by_id.get(from_step)
         if source is None:
             raise ValueError(f'unknown branch source {from_step!r}')
         if (source.get('op') not in TRANSFORMING_OPS
@@ -597,8 +979,10 @@ class Ledger(object):
         if len(set(step_ids)) != len(step_ids):
             raise ValueError('conclusion step ids must be unique')
 
-        by_id = {s['id']: s for s in (steps if steps is not None
-                                      else self.steps)}
+        if steps is None:
+            by_id = self._steps_index().by_id
+        else:
+            by_id = {s['id']: s for s in steps}
         selected = []
         for step_id in step_ids:
             step = by_id.get(step_id)
@@ -819,28 +1203,170 @@ class Ledger(object):
                       'reason': (reason or '').strip()}
         return self.record_selection(None, provenance, goal=goal)
 
-    def save(self, path=None):
+    def save(self, path=None, sync=False):
+        """Persist the session as a v3 log.
+
+        Appends only what was recorded since the last save — new steps,
+        assumptions and selections, and claims whose record changed — so
+        a save costs the size of the change, not of the session.  The
+        file is rewritten whole ("compacted") when it is new, legacy,
+        torn, saved under another path, shorter in memory than on disk,
+        or carrying more than _COMPACT_STALE superseded claim lines.
+        Appends are fsynced in batches of _FSYNC_BATCH records, or at
+        once with ``sync``."""
+        path = path or self.path
+        if not path:
+            raise ValueError('no session path')
+        log = self._log
+        if (log is None or log['path'] != path or log['torn']
+                or not os.path.exists(path)):
+            self.compact(path)
+            return
+        lines = []
+        counts = {}
+        for section in ('steps', 'assumptions', 'selections'):
+            if isinstance(self.data, _LogData) and self.data.pending(section):
+                continue
+            records = self.data[section]
+            done = log['counts'][section]
+            if len(records) < done:
+                self.compact(path)
+                return
+            lines += [_log_line(_LOG_SECTIONS[section], r)
+                      for r in records[done:]]
+            counts[section] = len(records)
+        claims = {}
+        for claim in self.claims:
+            text = _claim_text(claim)
+            claims[claim.get('id')] = text
+            if log['claims'].get(claim.get('id')) != text:
+                lines.append(_log_line('claim', claim))
+        stale = log['claim_lines'] + sum(
+            line.startswith('{"k":"claim"') for line in lines) - len(claims)
+        if (len(claims) < len(log['claims'])
+                or not set(log['claims']) <= set(claims)
+                or stale > _COMPACT_STALE):
+            self.compact(path)
+            return
+        if lines:
+            with open(path, 'a', encoding='utf-8') as fh:
+                fh.write(''.join(lines))
+                log['unsynced'] += len(lines)
+                if sync or log['unsynced'] >= _FSYNC_BATCH:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                    log['unsynced'] = 0
+            log['counts'].update(counts)
+            log['claim_lines'] += sum(
+                line.startswith('{"k":"claim"') for line in lines)
+            log['claims'] = claims
+        self.path = path
+
+    def close(self):
+        """Release the mapped session file (a dropped ledger)."""
+        if isinstance(self.data, _LogData):
+            self.data.close()
+
+    def compact(self, path=None):
+        """Rewrite the session as a fresh v3 log holding each record once,
+        atomically and durably."""
         path = path or self.path
         if not path:
             raise ValueError('no session path')
-        with open(path, 'w', encoding='utf-8') as fh:
-            json.dump(self.data, fh, indent=1, ensure_ascii=False)
+        if isinstance(self.data, _LogData):
+            self.data.materialize()
+        lines = [json.dumps(_LOG_HEADER) + '\n']
+        for section in ('steps', 'assumptions', 'claims', 'selections'):
+            lines += [_log_line(_LOG_SECTIONS[section], r)
+                      for r in self.data[section]]
+        folder = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        try:
+            # mkstemp is private; keep the mode a plain open() would give
+            if os.path.exists(path):
+                os.chmod(tmp, os.stat(path).st_mode & 0o777)
+            else:
+                os.chmod(tmp, 0o666 & ~_UMASK)
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                fh.write(''.join(lines))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._log = {'path': path, 'torn': False, 'unsynced': 0,
+                     'counts': {section: len(self.data[section])
+                                for section in ('steps', 'assumptions',
+                                                'selections')},
+                     'claims': {c.get('id'): _claim_text(c)
+                                for c in self.claims},
+                     'claim_lines': len(self.claims)}
         self.path = path
 
     def last_result(self):
-        for step in reversed(self.steps):
-            if step.get('result') is not None:
-                return step['result']
-        return None
+        return self._steps_index().last
+
+    def _transform_outcomes(self, cache, full, workers):
+        """Verification outcome of every transforming step, by index.
 
-    def replay(self):
+        Cache hits are taken as they are unless ``full``; the rest run
+        up front on ``workers`` processes, or — with one worker — lazily,
+        as the replay loop reaches them, so a ledger that fails early
+        costs no more than it used to."""
+        outcomes = {}
+        pending = []
+        for index, step in enumerate(self.steps):
+            if step['op'] in ('branch', 'comment'):
+                continue
+            key = cache.key(step) if cache is not None else None
+            hit = cache.get(key) if key is not None and not full else None
+            if hit is not None:
+                outcomes[index] = hit
+            else:
+                pending.append((index, key))
+        stats = {'cached': len(outcomes), 'verified': 0}
+
+        def store(index, key, outcome):
+            outcomes[index] = outcome
+            stats['verified'] += 1
+            if key is not None and 'reason' not in outcome:
+                cache.put(key, outcome)
+
+        if workers > 1:
+            jobs = [_transform_job(self.steps[index])
+                    for index, _key in pending]
+            for (index, key), outcome in zip(
+                    pending, _run_transforms(jobs, workers)):
+                store(index, key, outcome)
+            keys = {}
+        else:
+            keys = dict(pending)
+
+        def outcome(index):
+            if index not in outcomes:
+                store(index, keys[index],
+                      _verify_transform(_transform_job(self.steps[index])))
+            return outcomes[index]
+        return outcome, stats
+
+    def replay(self, cache=None, full=False, workers=1):
         """Re-run every step through its primitive and confirm the recorded
-        result. Returns {'status': 'verified'|'failed', ...}."""
+        result. Returns {'status': 'verified'|'failed', ...}.
+
+        Transforming steps depend only on their own recorded arguments, so
+        with ``workers`` > 1 they are re-run on a process pool; branch,
+        provenance, claim and selection validation is order-dependent and
+        stays here.  With a ReplayCache, steps that replayed clean under
+        the same engine before are not re-run unless ``full``."""
         import primitives
         import tactic_registry
+        outcome_of, stats = self._transform_outcomes(cache, full, workers)
         seen = {}
         replayed_steps = []
-        for step in self.steps:
+        replay_index = _LedgerIndex()
+        for index, step in enumerate(self.steps):
             if step['op'] == 'branch':
                 args = step.get('args') or {}
                 from_step = args.get('from')
@@ -862,7 +1388,7 @@ class Ledger(object):
                              f'{step.get("goal")!r}')
                 else:
                     pending = self._pending_branches_in(
-                        replayed_steps, step.get('goal'))
+                        replay_index.steps_of(replayed_steps), step.get('goal'))
                     current_is_legacy = (step.get('hash')
                                          == _legacy_branch_hash(
                                              from_step, reason))
@@ -895,7 +1421,7 @@ class Ledger(object):
                 replayed_steps.append(step)
                 continue
             pending_branches = self._pending_branches_in(
-                replayed_steps, step.get('goal'))
+                replay_index.steps_of(replayed_steps), step.get('goal'))
             if pending_branches:
                 for pending_branch in pending_branches:
                     source_id = pending_branch['args']['from']
@@ -934,31 +1460,13 @@ class Ledger(object):
             if provenance_error:
                 return {'status': 'failed', 'step': step['id'],
                         'reason': provenance_error}
-            res = tactic_registry.replay(step['op'], step['args'])
-            if not res.get('ok'):
-                return {'status': 'failed', 'step': step['id'],
-                        'reason': res.get('error')}
-            if res.get('result') != step['result']:
-                # tolerate formatting drift between versions, but only if
-                # the results are semantically equal
-                eq = core_tactics.equal_exprs(res.get('result'),
-                                              step['result'])
-                if not (eq.get('ok') and eq.get('verdict') == 'yes'):
-                    return {'status': 'failed', 'step': step['id'],
-                            'reason': 'result mismatch',
-                            'recorded': step['result'],
-                            'replayed': res.get('result')}
-            if ('solutions' in step
-                    and res.get('solutions') != step['solutions']):
-                return {'status': 'failed', 'step': step['id'],
-                        'reason': 'solution metadata mismatch'}
-            if res.get('check', {}).get('status') == 'disagree':
-                return {'status': 'failed', 'step': step['id'],
-                        'reason': 'numeric oracle disagrees on replay'}
+            res = outcome_of(index)
+            if 'reason' in res:
+                return {'status': 'failed', 'step': step['id'], **res}
             seen[step['id']] = step
             replayed = dict(step)
-            replayed['assumptions'] = res.get('assumptions', [])
-            replayed['check'] = res.get('check', {'status': 'skipped'})
+            replayed['assumptions'] = res['assumptions']
+            replayed['check'] = res['check']
             replayed_steps.append(replayed)
         for claim in self.claims:
             try:
@@ -1001,12 +1509,15 @@ class Ledger(object):
                 return {'status': 'failed',
                         'selection': selection.get('id', '?'),
                         'reason': f'final selection invalid: {error}'}
-        return {'status': 'verified', 'steps': len(self.steps),
-                'claims': len(self.claims),
-                'selections': len(self.selections),
-                'open_claims': sum(c.get('verdict') == 'open'
-                                   for c in self.claims),
-                'assumptions': self.assumptions}
+        report = {'status': 'verified', 'steps': len(self.steps),
+                  'claims': len(self.claims),
+                  'selections': len(self.selections),
+                  'open_claims': sum(c.get('verdict') == 'open'
+                                     for c in self.claims),
+                  'assumptions': self.assumptions}
+        if cache is not None:
+            report.update(stats)
+        return report
 
     def branch_edges(self):
         """Return the exploration edges encoded by marker/target order.
@@ -1015,15 +1526,13 @@ class Ledger(object):
         scan remains deterministic so legacy files can derive the same edge.
         Unresolved end-of-session markers have ``to=None`` and are not errors.
         """
+        resolved = self._steps_index().resolved
         edges = []
-        for index, marker in enumerate(self.steps):
+        for marker in self.steps:
             if marker.get('op') != 'branch':
                 continue
             goal = marker.get('goal')
-            target = next((step for step in self.steps[index + 1:]
-                           if (step.get('goal') == goal
-                               and step.get('op') in TRANSFORMING_OPS
-                               and step.get('result') is not None)), None)
+            target = resolved.get(marker.get('id'))
             args = marker.get('args') or {}
             edge = {
                 'marker': marker.get('id'),
@@ -1075,8 +1584,8 @@ class Ledger(object):
         transforms = [s for s in self.steps
                       if (s.get('op') in TRANSFORMING_OPS
                           and s.get('result') is not None)]
-        by_id = {s['id']: s for s in self.steps}
-        order = {s['id']: i for i, s in enumerate(self.steps)}
+        index = self._steps_index()
+        by_id, order = index.by_id, index.order
         edges = self.branch_edges()
         edge_by_target = {e['to']: e for e in edges if e.get('to')}
 
@@ -276,6 +276,10 @@ class MathLexer(object):
          raise Exception("Illegal character '%s'" % t.value[0])
          
      def input(self, s):
+         # Pooled lexers serve many parses; one that failed inside a
+         # \text{...} argument must not leave the next input in that state.
+         self.lexer.begin('INITIAL')
+         self.lexer.lineno = 1
          self.lexer.input(s)
          
      def token(self):
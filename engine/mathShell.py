@@ -11,13 +11,11 @@ from processor import MathProcessor
 from LatexWriter import LaTexWriter
 from replicator import Replicator
 from ledger import Ledger
-import agent_config
 import cell_input
 import model_config
 import prompt_commands
 from cell_input import split_lines
 
-from IPython.display import HTML, Javascript
 from engine import display
 
 BACKREF_RE = re.compile(r'\[\[\s*(\d+)\s*\]\]')
@@ -30,6 +28,18 @@ CMD_PREFIX_RE = re.compile(r'^([A-Za-z_]\w*)!')
 EXPR_TOKEN_RE = re.compile(r'([A-Za-z_][\w-]*)!')
 
 
+# IPython's rich-display objects. The kernel has IPython loaded already;
+# anything else importing this module should not pay for it up front.
+def HTML(*args, **kwargs):
+    from IPython.display import HTML
+    return HTML(*args, **kwargs)
+
+
+def Javascript(*args, **kwargs):
+    from IPython.display import Javascript
+    return Javascript(*args, **kwargs)
+
+
 def _display_latex(latex):
     """Derived rich-view spelling; ledger records remain byte-identical."""
     import primitives
@@ -214,6 +224,8 @@ class MathShell(object):
         self.trace_mode = False
         self.trace_output = None
         self.show_quotes = False
+        # formula readings the input preview has already parsed
+        self.preview_cache = cell_input.PreviewCache()
         # notebook-wide derivation ledger fed by do! cells
         self.ledger = Ledger()
         # Agent routing is notebook-local: backend!/model! change this shell
@@ -221,8 +233,9 @@ class MathShell(object):
         # kernels.
         # No model until one is chosen: each backend supplies its own
         # default, so an OpenRouter model id can never be handed to Codex
-        # (or the reverse) just because auto-resolution moved.
-        self.route = agent_config.AgentRoute(backend=agent_config.AUTO)
+        # (or the reverse) just because auto-resolution moved. Built on
+        # first use, so the kernel starts without the agent stack.
+        self._route = None
         self.model_change_handler = None
         # commands! reloads the discoverable prompt-command registry.
 
@@ -247,12 +260,14 @@ class MathShell(object):
         if BACKREF_RE.search(code):
             try:
                 resolved = cell_input.preview(self.resolve_backrefs(code),
-                                              names, prose)
+                                              names, prose,
+                                              cache=self.preview_cache)
             except Exception:
                 resolved = None
             if resolved:
                 return resolved
-        return cell_input.preview(code, names, prose)
+        return cell_input.preview(code, names, prose,
+                                  cache=self.preview_cache)
 
     def trace_step(self, sym, notation, index):
         if self.trace:
@@ -367,6 +382,17 @@ class MathShell(object):
 
     # Compatibility for embedders and the kernel comm, which read the model
     # routing directly. The route is the single source of truth.
+    @property
+    def route(self):
+        if self._route is None:
+            import agent_config
+            self._route = agent_config.AgentRoute(backend=agent_config.AUTO)
+        return self._route
+
+    @route.setter
+    def route(self, route):
+        self._route = route
+
     @property
     def model_name(self):
         return self.route.model
@@ -379,9 +405,11 @@ class MathShell(object):
     def backend_name(self):
         """The backend this notebook would run on right now (never starts a
         Codex runtime to find out)."""
+        import agent_config
         return agent_config.preview(self.route).backend
 
     def _model_status_html(self):
+        import agent_config
         routing = agent_config.describe(self.route)
         model = routing['model'] or f'{routing["backend"]} default'
         if routing['backend'] == agent_config.CODEX:
@@ -428,6 +456,7 @@ class MathShell(object):
         without the route object changing at all. The toolbar would
         otherwise keep advertising the pre-login answer.
         """
+        import agent_config
         before = self.backend_name
         agent_config.note_codex_account(status)
         if (self.backend_name != before
@@ -437,6 +466,7 @@ class MathShell(object):
 
     def exec_backend(self, arguments):
         """Handle ``backend! [auto|openrouter|codex]`` for this notebook."""
+        import agent_config
         name = (arguments or '').strip().lower()
         if not name:
             display(HTML(self._model_status_html()
@@ -462,6 +492,7 @@ class MathShell(object):
         The catalog is backend-aware: OpenRouter reads `models.yaml` and its
         provider order, while Codex reports its own models and takes no
         provider argument."""
+        import agent_config
         if self.backend_name == agent_config.CODEX:
             self._exec_codex_model(arguments)
             return
@@ -498,6 +529,7 @@ class MathShell(object):
 
     def _exec_codex_model(self, arguments):
         """``model!`` while Codex is selected: its own catalog, no providers."""
+        import agent_config
         import agent_do
         if ',' in (arguments or ''):
             display(HTML('<div style="color:#c00">model! error: the Codex '
@@ -543,6 +575,7 @@ class MathShell(object):
         in never changes which backend this notebook runs on.
         """
         from agent_backends import codex
+        import agent_config
         import agent_do
         action = (arguments or '').strip().lower()
         # the same list the completer offers: an option cannot appear in the
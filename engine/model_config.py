@@ -5,8 +5,6 @@ import os
 import re
 from collections import namedtuple
 
-import yaml
-
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -34,6 +32,7 @@ def current_model():
 
 def parse_model_config(text):
     """Parse ``models.yaml`` into an ordered tuple of model endpoints."""
+    import yaml  # deferred: read once, when a model is first chosen
     try:
         data = yaml.safe_load(text) or {}
     except yaml.YAMLError as e:
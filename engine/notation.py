@@ -7,7 +7,10 @@ Created on Sun Dec 27 15:39:04 2020
 """
 from typing import TypeVar
 from collections import defaultdict
+from types import MappingProxyType
 import json
+import threading
+import weakref
 
 SYMBOL = TypeVar('SYMBOL', bound='Symbol')
 NOTATION = TypeVar('NOTATION', bound='Notation')
@@ -49,6 +52,11 @@ class Symbol(object):
 class Func(object):
     """ Func """
 
+    # set by HashConsedNotation when the node is interned: its node id and
+    # whether the subtree is free of `...` (see HashConsedNotation)
+    node = None
+    plain = False
+
     def __init__(self, sym, args, **kwargs):
         self.sym = sym
         self.args = args
@@ -274,6 +282,9 @@ class Notation(object):
             res.rel[sym] = f
         return res
 
+    def freeze(self):
+        return FrozenNotation(self)
+
     def join(self, notation):
         for sym, f in notation.rel.items():
             self.rel[sym] = f
@@ -296,6 +307,9 @@ class Notation(object):
         self.rel[sym] = func
         return sym
 
+    def remove(self, sym):
+        del self.rel[sym]
+
     def setf(self, f, args, **kwargs):
         return self.repf(None, Func(f, args, **kwargs))
 
@@ -334,3 +348,168 @@ class Notation(object):
             res += f'{sym.__repr__()}: {self.rel[sym]}'
         return res
         
+
+
+class FrozenNotation(Notation):
+    """Read-only snapshot of a Notation.
+
+    Snapshots are shared (the parse cache hands the same one to every
+    caller), so every mutator raises TypeError and `rel` is a read-only
+    view.
+
+    instantiate(sym) is the copy to mutate: every node is re-keyed under a
+    fresh auto symbol — the shape a fresh parse has — and gets its own
+    Func, args list and props dict, so in-place edits (a P_LIST growing
+    an argument, a MULEX flipping its sign prop) never reach the
+    snapshot.  Replicator passes keep node names, so two copies of one
+    snapshot spliced into a single output notation would otherwise
+    alias, and a substitution in one would rewrite the other.  Values
+    and function heads are shared, never copied.
+    """
+
+    def __init__(self, notation=None):
+        self._map = defaultdict()
+        if notation is not None:
+            self._map.update(notation.rel)
+        self.rel = MappingProxyType(self._map)
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('FrozenNotation is read-only; instantiate() a copy')
+
+    clear = join = assign = repf = setf = remove = _readonly
+
+    def freeze(self):
+        return self
+
+    def instantiate(self, sym):
+        renamed = {s: Symbol() for s in self._map}
+
+        def remap(x):
+            if isinstance(x, Symbol):
+                return renamed.get(x, x)
+            if isinstance(x, tuple):
+                return tuple(remap(a) for a in x)
+            if isinstance(x, list):
+                return [remap(a) for a in x]
+            return x
+
+        res = Notation()
+        for s, f in self._map.items():
+            res.rel[renamed[s]] = Func(
+                f.sym, remap(f.args),
+                **{k: remap(v) for k, v in f.props.items()})
+        return remap(sym), res
+
+
+class _Uninternable(Exception):
+    pass
+
+
+_LIST = object()
+_TUPLE = object()
+
+
+class HashConsedNotation(Notation):
+    """Notation whose nodes are hash-consed across every such notation.
+
+    repf/setf look the node up by structure — head, props and the ids of
+    its children — and hand back the one Symbol already standing for it,
+    so structurally identical subtrees share a node and a Replicator pass
+    writing into a HashConsedNotation re-mints nothing for the subtrees it
+    did not change.  A node's Symbol is therefore its id: equal ids mean
+    identical trees, which is what lets s_equal answer in O(1).
+
+    The price is that nodes are immutable and shared.  The `sym` passed to
+    repf is only a hint and is ignored (callers must use the returned
+    symbol, as Replicator does), and remove() keeps the node because
+    another parent may still point at it.  A node with an unhashable prop,
+    or with a child that was not itself interned, is stored under a fresh
+    symbol like in a plain Notation.
+
+    Interned nodes live as long as some notation holds them; an id is only
+    comparable with ids from notations that are still alive.
+    """
+
+    _table = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    def clone(self):
+        res = HashConsedNotation()
+        res.rel.update(self.rel)
+        return res
+
+    def _key(self, x, plain):
+        if isinstance(x, Symbol):
+            f = self.rel.get(x)
+            if f is not None:
+                if f.node != x:
+                    raise _Uninternable()
+                plain[0] = plain[0] and f.plain
+            elif x == Notation.DOT3:
+                plain[0] = False
+            if x.props:
+                return x, tuple(sorted((k, self._key(v, plain))
+                                       for k, v in x.props.items()))
+            return x
+        if isinstance(x, tuple):
+            return (_TUPLE,) + tuple(self._key(a, plain) for a in x)
+        if isinstance(x, list):
+            return (_LIST,) + tuple(self._key(a, plain) for a in x)
+        if x is None:
+            return None
+        hash(x)
+        return type(x), x
+
+    def repf(self, sym, func):
+        assert isinstance(func, Func)
+        plain = [True]
+        try:
+            key = (self._key(func.sym, plain), self._key(func.args, plain),
+                   tuple(sorted((k, self._key(v, plain))
+                                for k, v in func.props.items())))
+            hash(key)
+        except (_Uninternable, TypeError):
+            return super(HashConsedNotation, self).repf(None, func)
+        with HashConsedNotation._lock:
+            node = HashConsedNotation._table.get(key)
+            if node is None:
+                func.node = Symbol()
+                func.plain = plain[0]
+                HashConsedNotation._table[key] = node = func
+        self.rel[node.node] = node
+        return node.node
+
+    def remove(self, sym):
+        pass
+
+    def identical(self, sym1, notation, sym2):
+        """True when sym1 here and sym2 in `notation` are one interned
+        node (or one leaf) — identical trees, decided by id."""
+        if sym1 != sym2:
+            return False
+        f = self.get(sym1)
+        return f is notation.get(sym2) and (f is None or f.node == sym1)
+
+    @staticmethod
+    def intern(sym, notation):
+        """(sym, HashConsedNotation) holding the tree at `sym` interned."""
+        out = HashConsedNotation()
+        done = {}
+
+        def walk(x):
+            if isinstance(x, Symbol):
+                f = notation.get(x)
+                if f is None:
+                    return x
+                if x not in done:
+                    done[x] = out.repf(None, Func(
+                        f.sym, walk(f.args),
+                        **{k: walk(v) for k, v in f.props.items()}))
+                return done[x]
+            if isinstance(x, tuple):
+                return tuple(walk(a) for a in x)
+            if isinstance(x, list):
+                return [walk(a) for a in x]
+            return x
+
+        return walk(sym), out
@@ -38,13 +38,6 @@ FUNCTION_NAMES = set(Notation.unary_f) | {
 # exponents > 0. The empty tuple is the constant monomial.
 # ---------------------------------------------------------------------------
 
-def _mono_mul(m1, m2):
-    d = dict(m1)
-    for var, exp in m2:
-        d[var] = d.get(var, 0) + exp
-    return tuple(sorted((v, e) for v, e in d.items() if e != 0))
-
-
 def _mono_degree(m):
     return sum(e for _, e in m)
 
@@ -54,8 +47,82 @@ def _mono_key(m):
     return (-_mono_degree(m), tuple((v, -e) for v, e in m))
 
 
+# ---------------------------------------------------------------------------
+# Packed monomials: inside one multiplication, power or division the
+# variables get a fixed order (sorted names, the first in the most
+# significant field) and a monomial becomes one int holding its exponent
+# vector in `width`-bit fields.  Multiplying monomials is then an int add
+# and lex comparison an int compare.  `Poly.terms` keeps the tuple form:
+# packing never escapes the operation that chose the layout.
+# ---------------------------------------------------------------------------
+
+class _Packing(object):
+    """Variable order and field width for one packed computation.
+
+    `width` is sized so no field can exceed `max_exp`; the top bit of each
+    field is a guard that stays clear while every exponent fits."""
+
+    def __init__(self, variables, max_exp):
+        self.varlist = sorted(variables)
+        self.width = max(1, max_exp).bit_length() + 1
+        self.mask = (1 << self.width) - 1
+        n = len(self.varlist)
+        self.shift = {v: self.width * (n - 1 - i)
+                      for i, v in enumerate(self.varlist)}
+        self.guard = sum(1 << (self.width - 1 + self.width * i)
+                         for i in range(n))
+        self._tuples = {}
+
+    def pack(self, poly):
+        """({packed monomial: integer numerator}, common denominator), in
+        `poly.terms` order."""
+        shift = self.shift
+        nums, den = poly._scaled()
+        return {sum(e << shift[v] for v, e in mono): n
+                for mono, n in nums.items()}, den
+
+    def mono(self, key):
+        """The sorted (varname, exponent) tuple of a packed monomial."""
+        mono = self._tuples.get(key)
+        if mono is None:
+            mono = self._tuples[key] = tuple(
+                (v, (key >> self.shift[v]) & self.mask)
+                for v in self.varlist
+                if (key >> self.shift[v]) & self.mask)
+        return mono
+
+    def unpack(self, nums, den):
+        """A Poly from packed integer numerators over `den`."""
+        return Poly._from_scaled({self.mono(k): n for k, n in nums.items()},
+                                 den)
+
+
+def _max_exp(poly):
+    return max((e for mono in poly.terms for _v, e in mono), default=0)
+
+
+def _packed_mul(t1, t2):
+    """Product of packed term dicts, inserting monomials in the order the
+    tuple loop of `Poly.__mul__` always has; zero sums are dropped."""
+    terms = {}
+    get = terms.get
+    for m1, c1 in t1.items():
+        for m2, c2 in t2.items():
+            mono = m1 + m2
+            c = get(mono)
+            terms[mono] = c1 * c2 if c is None else c + c1 * c2
+    return {m: c for m, c in terms.items() if c != 0}
+
+
 class Poly(object):
-    """Sparse multivariate polynomial with Fraction coefficients."""
+    """Sparse multivariate polynomial with Fraction coefficients.
+
+    Arithmetic runs on the integer form from `_scaled()` — integer
+    numerators over one common denominator, computed on first use —
+    so the inner loops never pay a Fraction gcd; only the result's
+    coefficients are normalized, once each."""
+
+    _scaled_form = None
 
     def __init__(self, terms=None):
         self.terms = {}
@@ -64,6 +131,34 @@ class Poly(object):
                 if coeff != 0:
                     self.terms[mono] = Fraction(coeff)
 
+    @staticmethod
+    def _from_scaled(nums, den):
+        """The Poly with coefficients ``n / den``, zeros dropped, in
+        `nums` order.  An integral result keeps its integer form."""
+        res = Poly()
+        if den == 1:
+            nums = {m: n for m, n in nums.items() if n}
+            res.terms = {m: Fraction(n) for m, n in nums.items()}
+            res._scaled_form = (nums, 1)
+        else:
+            res.terms = {m: Fraction(n, den) for m, n in nums.items() if n}
+        return res
+
+    def _scaled(self):
+        """(integer numerators by monomial, positive common denominator),
+        the denominator the lcm of the coefficients' own.  Terms are never
+        mutated after construction, so this is computed once."""
+        form = self._scaled_form
+        if form is None:
+            den = math.lcm(*(c.denominator for c in self.terms.values()))
+            if den == 1:
+                nums = {m: c.numerator for m, c in self.terms.items()}
+            else:
+                nums = {m: c.numerator * (den // c.denominator)
+                        for m, c in self.terms.items()}
+            form = self._scaled_form = (nums, den)
+        return form
+
     @staticmethod
     def const(c):
         return Poly({(): Fraction(c)}) if c != 0 else Poly()
@@ -106,35 +201,59 @@ class Poly(object):
         return hash(frozenset(self.terms.items()))
 
     def __add__(self, other):
-        terms = dict(self.terms)
-        for mono, coeff in other.terms.items():
-            terms[mono] = terms.get(mono, Fraction(0)) + coeff
-        return Poly(terms)
+        n1, d1 = self._scaled()
+        n2, d2 = other._scaled()
+        den = d1 * d2 // math.gcd(d1, d2)
+        k1, k2 = den // d1, den // d2
+        nums = {m: n * k1 for m, n in n1.items()} if k1 != 1 else dict(n1)
+        for mono, n in n2.items():
+            nums[mono] = nums.get(mono, 0) + n * k2
+        return Poly._from_scaled(nums, den)
 
     def __neg__(self):
-        return Poly({m: -c for m, c in self.terms.items()})
+        nums, den = self._scaled()
+        return Poly._from_scaled({m: -n for m, n in nums.items()}, den)
 
     def __sub__(self, other):
         return self + (-other)
 
     def __mul__(self, other):
-        terms = {}
-        for m1, c1 in self.terms.items():
-            for m2, c2 in other.terms.items():
-                mono = _mono_mul(m1, m2)
-                terms[mono] = terms.get(mono, Fraction(0)) + c1 * c2
-        return Poly(terms)
+        if not self.terms or not other.terms:
+            return Poly()
+        fa, fb = _dense_form(self), _dense_form(other)
+        if fa is not None and fb is not None and fa[0] == fb[0] \
+                and _dense_worthwhile(self, fa[1]) \
+                and _dense_worthwhile(other, fb[1]):
+            return _from_dense(_dense_mul(fa[1], fb[1]), fa[2] * fb[2],
+                               fa[0])
+        packing = _Packing(self.variables() | other.variables(),
+                           _max_exp(self) + _max_exp(other))
+        t1, d1 = packing.pack(self)
+        t2, d2 = packing.pack(other)
+        return packing.unpack(_packed_mul(t1, t2), d1 * d2)
 
     def __pow__(self, n):
         assert isinstance(n, int) and n >= 0
-        res = Poly.const(1)
-        base = self
-        while n:
+        if n == 0 or not self.terms:
+            return Poly.const(1) if n == 0 else Poly()
+        form = _dense_form(self)
+        if form is not None and n > 1 and 2 * len(self.terms) >= len(form[1]):
+            var, coeffs, den = form
+            return _from_dense(_dense_pow(coeffs, n), den ** n, var)
+        # one layout for the whole ladder: no exponent exceeds n times
+        # the base's largest
+        packing = _Packing(self.variables(), _max_exp(self) * n)
+        res = {0: 1}
+        base, den = packing.pack(self)
+        den **= n
+        while True:
             if n & 1:
-                res = res * base
-            base = base * base
+                res = _packed_mul(res, base)
             n >>= 1
-        return res
+            if not n:
+                break
+            base = _packed_mul(base, base)
+        return packing.unpack(res, den)
 
     def eval(self, point):
         """Evaluate at {varname: Fraction/float}. Returns Fraction or float."""
@@ -168,15 +287,10 @@ class Poly(object):
         leading (canonically first) coefficient carried separately."""
         if self.is_zero():
             return Fraction(1)
-        nums = [abs(c.numerator) for c in self.terms.values()]
-        dens = [c.denominator for c in self.terms.values()]
-        g = 0
-        for n in nums:
-            g = math.gcd(g, n)
-        l = 1
-        for d in dens:
-            l = l * d // math.gcd(l, d)
-        return Fraction(g, l)
+        # gcd of the numerators over the common denominator: per prime,
+        # the smallest valuation among the coefficients either way
+        nums, den = self._scaled()
+        return Fraction(math.gcd(*nums.values()), den)
 
     def leading_coeff(self):
         if self.is_zero():
@@ -213,7 +327,12 @@ class Poly(object):
 
     def scale(self, k):
         k = Fraction(k)
-        return Poly({m: c * k for m, c in self.terms.items()})
+        if not k:
+            return Poly()
+        nums, den = self._scaled()
+        p = k.numerator
+        return Poly._from_scaled({m: n * p for m, n in nums.items()},
+                                 den * k.denominator)
 
     def div_exact(self, other):
         """Exact multivariate division: the quotient q with
@@ -223,6 +342,48 @@ class Poly(object):
         leading term, so a failed step proves non-divisibility."""
         if other.is_zero() or self.is_zero():
             return None
+        # packed with the most significant field first, lex order is int
+        # order; the guard bits catch a divisibility failure (a borrow)
+        # and a remainder exponent outgrowing the layout (then the tuple
+        # loop below takes over from scratch)
+        #
+        # Over the integers: with self = A/da and other = cb*B/db, B
+        # primitive, Gauss's lemma makes an exact quotient A/B integral,
+        # so a leading coefficient that does not divide proves
+        # non-divisibility exactly as a failed monomial step does.
+        packing = _Packing(self.variables() | other.variables(),
+                           2 * max(_max_exp(self), _max_exp(other)))
+        guard = packing.guard
+        divisor, db = packing.pack(other)
+        cb = math.gcd(*divisor.values())
+        if cb != 1:
+            divisor = {m: n // cb for m, n in divisor.items()}
+        lead_o = max(divisor)
+        lc_o = divisor[lead_o]
+        rem, da = packing.pack(self)
+        q = {}
+        while rem:
+            lead_r = max(rem)
+            m = (lead_r | guard) - lead_o
+            if m & guard != guard:
+                return None
+            m -= guard
+            c, r = divmod(rem[lead_r], lc_o)
+            if r:
+                return None
+            q[m] = c
+            for mo, co in divisor.items():
+                mono = m + mo
+                if mono & guard:
+                    return self._div_exact_tuples(other)
+                v = rem.get(mono, 0) - c * co
+                if v:
+                    rem[mono] = v
+                else:
+                    rem.pop(mono, None)
+        return packing.unpack(q, 1).scale(Fraction(db, da * cb))
+
+    def _div_exact_tuples(self, other):
         varlist = sorted(self.variables() | other.variables())
 
         def key(mono):
@@ -260,61 +421,362 @@ class Poly(object):
 
 
 # ---------------------------------------------------------------------------
-# Univariate helpers for GCD cancellation
+# Dense univariate engine: integer coefficient lists, constant term first,
+# no trailing zeros ([] is 0). Karatsuba multiplication above a length
+# cutoff, powers by repeated squaring, and a modular (small-prime + CRT)
+# gcd, so neither products nor remainder sequences pay for Fraction
+# arithmetic or coefficient blowup.
 # ---------------------------------------------------------------------------
 
-def _to_univariate(poly, var):
-    """Return dense coefficient list [c0, c1, ...] or None if not univariate in var."""
-    coeffs = {}
-    for mono, coeff in poly.terms.items():
-        d = dict(mono)
-        exp = d.pop(var, 0)
-        if d:
-            return None
-        coeffs[exp] = coeff
-    deg = max(coeffs, default=0)
-    return [coeffs.get(i, Fraction(0)) for i in range(deg + 1)]
+# Below this many coefficients schoolbook beats Karatsuba's bookkeeping
+_KARATSUBA_CUTOFF = 32
 
 
-def _uni_normalize(c):
-    while c and c[-1] == 0:
-        c.pop()
-    return c
+def _dense_trim(a):
+    while a and not a[-1]:
+        a.pop()
+    return a
+
+
+def _dense_add_into(out, a, shift, sign=1):
+    for i, x in enumerate(a):
+        out[i + shift] += sign * x
+
+
+def _school_mul(a, b):
+    out = [0] * (len(a) + len(b) - 1)
+    width = len(b)
+    for i, x in enumerate(a):
+        if x:
+            out[i:i + width] = [o + x * y
+                                for o, y in zip(out[i:i + width], b)]
+    return out
+
+
+def _dense_mul(a, b):
+    """Product of dense coefficient lists."""
+    if not a or not b:
+        return []
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) <= _KARATSUBA_CUTOFF:
+        return _dense_trim(_school_mul(a, b))
+    out = [0] * (len(a) + len(b) - 1)
+    if 2 * len(b) <= len(a):
+        # unbalanced: slice the long factor into pieces of the short one
+        for k in range(0, len(a), len(b)):
+            _dense_add_into(out, _dense_mul(a[k:k + len(b)], b), k)
+        return _dense_trim(out)
+    k = len(a) // 2
+    a0, a1, b0, b1 = a[:k], a[k:], b[:k], b[k:]
+    z0 = _dense_mul(a0, b0)
+    z2 = _dense_mul(a1, b1)
+    sa = list(a1)
+    _dense_add_into(sa, a0, 0)
+    sb = list(b1) + [0] * max(0, len(b0) - len(b1))
+    _dense_add_into(sb, b0, 0)
+    z1 = _dense_mul(sa, sb)
+    _dense_add_into(out, z0, 0)
+    _dense_add_into(out, z2, 2 * k)
+    _dense_add_into(out, z1, k)
+    _dense_add_into(out, z0, k, -1)
+    _dense_add_into(out, z2, k, -1)
+    return _dense_trim(out)
+
+
+def _dense_pow(a, n):
+    res = [1]
+    while True:
+        if n & 1:
+            res = _dense_mul(res, a)
+        n >>= 1
+        if not n:
+            return res
+        a = _dense_mul(a, a)
 
 
-def _uni_divmod(a, b):
+def _dense_div_exact(a, b):
+    """a / b over the integers, or None when b does not divide a there."""
     a = list(a)
-    q = [Fraction(0)] * max(0, len(a) - len(b) + 1)
-    while len(a) >= len(b) and _uni_normalize(a):
-        k = a[-1] / b[-1]
+    lc = b[-1]
+    q = [0] * max(0, len(a) - len(b) + 1)
+    while len(a) >= len(b):
+        c, r = divmod(a[-1], lc)
+        if r:
+            return None
         d = len(a) - len(b)
-        q[d] = k
-        for i, bc in enumerate(b):
-            a[i + d] -= k * bc
-        _uni_normalize(a)
-    return q, a
+        q[d] = c
+        a[d:] = [x - c * y for x, y in zip(a[d:], b)]
+        _dense_trim(a)
+    return q if not a else None
+
 
+def _dense_primitive(a):
+    """The associate with content 1 and a positive leading coefficient."""
+    c = math.gcd(*a)
+    if a[-1] < 0:
+        c = -c
+    return [x // c for x in a] if c != 1 else list(a)
 
-def _uni_gcd(a, b):
-    a = _uni_normalize(list(a))
-    b = _uni_normalize(list(b))
+
+def _gcd_mod(a, b, p):
+    """Monic gcd of coefficient lists reduced mod the prime p."""
+    a = _dense_trim([x % p for x in a])
+    b = _dense_trim([x % p for x in b])
     while b:
-        _, r = _uni_divmod(a, b)
-        a, b = b, _uni_normalize(r)
-    if a:
-        lead = a[-1]
-        a = [c / lead for c in a]
-    return a
+        inv = pow(b[-1], -1, p)
+        while len(a) >= len(b):
+            c = a[-1] * inv % p
+            d = len(a) - len(b)
+            a[d:] = [(x - c * y) % p for x, y in zip(a[d:], b)]
+            _dense_trim(a)
+        a, b = b, a
+    inv = pow(a[-1], -1, p)
+    return [x * inv % p for x in a]
+
+
+def _is_prime(n):
+    # deterministic Miller-Rabin for n < 3.4e14
+    if n < 2:
+        return False
+    for q in (2, 3, 5, 7, 11, 13, 17):
+        if n % q == 0:
+            return n == q
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for base in (2, 3, 5, 7, 11, 13, 17):
+        x = pow(base, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
 
 
-def _from_univariate(coeffs, var):
-    terms = {}
-    for exp, c in enumerate(coeffs):
-        if c == 0:
+_GCD_PRIMES = []
+
+
+def _gcd_primes():
+    """Primes just below 2^31, generated on demand and kept."""
+    i = 0
+    while True:
+        if i == len(_GCD_PRIMES):
+            n = _GCD_PRIMES[-1] - 2 if _GCD_PRIMES else (1 << 31) - 1
+            while not _is_prime(n):
+                n -= 2
+            _GCD_PRIMES.append(n)
+        yield _GCD_PRIMES[i]
+        i += 1
+
+
+def _dense_gcd(a, b):
+    """Primitive gcd of nonzero integer coefficient lists (Brown's modular
+    algorithm): the gcd mod word-size primes, scaled by gcd(lc a, lc b)
+    and combined by CRT, until the symmetric lift divides both inputs.
+    A prime dividing that scale is skipped; a prime giving a larger
+    degree than seen is unlucky, a smaller one restarts the lift."""
+    a, b = _dense_primitive(a), _dense_primitive(b)
+    if len(a) == 1 or len(b) == 1:
+        return [1]
+    g = math.gcd(a[-1], b[-1])
+    h = None
+    modulus = 1
+    for p in _gcd_primes():
+        if g % p == 0:
+            continue
+        gp = _gcd_mod(a, b, p)
+        if len(gp) == 1:
+            return [1]
+        gp = [x * g % p for x in gp]
+        if h is not None and len(gp) > len(h):
             continue
-        mono = ((var, exp),) if exp > 0 else ()
-        terms[mono] = c
-    return Poly(terms)
+        if h is None or len(gp) < len(h):
+            h, modulus = gp, p
+        else:
+            # CRT: h mod modulus, gp mod p -> mod modulus * p
+            inv = pow(modulus, -1, p)
+            h = [x + modulus * ((y - x) * inv % p) for x, y in zip(h, gp)]
+            modulus *= p
+        half = modulus // 2
+        cand = _dense_primitive([x - modulus if x > half else x
+                                 for x in h])
+        if _dense_div_exact(a, cand) is not None \
+                and _dense_div_exact(b, cand) is not None:
+            return cand
+
+
+def _dense_form(poly):
+    """(var, integer coefficient list, denominator) when `poly` is a
+    nonconstant polynomial in one variable, else None."""
+    variables = poly.variables()
+    if len(variables) != 1:
+        return None
+    var = next(iter(variables))
+    nums, den = poly._scaled()
+    coeffs = [0] * (poly.degree() + 1)
+    for mono, n in nums.items():
+        coeffs[mono[0][1] if mono else 0] = n
+    return var, coeffs, den
+
+
+def _from_dense(coeffs, den, var):
+    """The Poly sum of ``coeffs[k] / den * var^k``, ascending powers."""
+    return Poly._from_scaled(
+        {((var, k),) if k else (): c for k, c in enumerate(coeffs) if c},
+        den)
+
+
+def _dense_worthwhile(poly, dense):
+    # a sparse polynomial (x^1000 + 1) is better multiplied term by term
+    return (len(dense) > _KARATSUBA_CUTOFF
+            and 2 * len(poly.terms) >= len(dense))
+
+
+# ---------------------------------------------------------------------------
+# Multivariate GCD: recursive subresultant PRS over Z[x1..xn]. A
+# polynomial is split as a univariate polynomial in its main variable
+# with coefficients in the remaining ones; the gcd is the gcd of the
+# contents times the primitive part of the last nonzero remainder. The
+# subresultant divisors keep coefficient growth polynomial without a
+# content gcd per step (multiplying by lc every step and never reducing
+# swelled a small three-variable pair past any useful size).
+# ---------------------------------------------------------------------------
+
+def _split(poly, var):
+    """{exponent of var: coefficient Poly free of var}."""
+    groups = {}
+    for mono, coeff in poly.terms.items():
+        exp = 0
+        rest = mono
+        for i, (v, e) in enumerate(mono):
+            if v == var:
+                exp = e
+                rest = mono[:i] + mono[i + 1:]
+                break
+        groups.setdefault(exp, {})[rest] = coeff
+    out = {}
+    for exp, terms in groups.items():
+        coeff = Poly()
+        coeff.terms = terms
+        out[exp] = coeff
+    return out
+
+
+def _join(coeffs, var):
+    res = Poly()
+    for exp, coeff in coeffs.items():
+        if exp:
+            coeff = coeff * Poly({((var, exp),): 1})
+        res = res + coeff
+    return res
+
+
+def _primitive(poly):
+    """`poly` with integer coefficients, content 1 and a positive leading
+    coefficient: the canonical associate over Q."""
+    if poly.is_zero():
+        return poly
+    c = poly.content()
+    if poly.leading_coeff() < 0:
+        c = -c
+    return poly.scale(1 / c)
+
+
+def _content_in(coeffs):
+    """gcd of the coefficient Polys of a split polynomial."""
+    g = None
+    for coeff in coeffs.values():
+        g = coeff if g is None else poly_gcd(g, coeff)
+        if g.is_const():
+            return Poly.const(1)
+    return _primitive(g)
+
+
+def _prem(a, b):
+    """Pseudo-remainder of split polynomials: the remainder of
+    lc(b)^(deg a - deg b + 1) * a by b, exactly that multiple (the
+    subresultant divisors assume it)."""
+    n = max(b)
+    lc = b[n]
+    r = a
+    steps = max(a) - n + 1
+    while r and max(r) >= n:
+        top = max(r)
+        lr = r[top]
+        d = top - n
+        nxt = {e: c * lc for e, c in r.items()}
+        for e, c in b.items():
+            nxt[e + d] = nxt.get(e + d, Poly()) - lr * c
+        r = {e: c for e, c in nxt.items() if not c.is_zero()}
+        steps -= 1
+    if r and steps:
+        r = {e: c * lc ** steps for e, c in r.items()}
+    return r
+
+
+def _split_div(coeffs, d):
+    """Divide every coefficient of a split polynomial by `d` (exact)."""
+    return {e: c.div_exact(d) for e, c in coeffs.items()}
+
+
+def poly_gcd(a, b):
+    """Greatest common divisor of two Polys over Q, as its canonical
+    associate (integer coefficients, content 1, positive leading
+    coefficient); gcd(0, 0) is 0."""
+    if a.is_zero():
+        return _primitive(b)
+    if b.is_zero():
+        return _primitive(a)
+    if a.is_const() or b.is_const():
+        return Poly.const(1)
+    a, b = _primitive(a), _primitive(b)
+    if a == b:
+        return a
+    common = a.variables() & b.variables()
+    if not common:
+        # no shared variable: only the contents can share a factor, and
+        # splitting on any variable of `a` exposes them
+        var = min(a.variables())
+    else:
+        var = min(common)
+    sa, sb = _split(a, var), _split(b, var)
+    ca, cb = _content_in(sa), _content_in(sb)
+    c = poly_gcd(ca, cb) if not (ca.is_const() or cb.is_const()) \
+        else Poly.const(1)
+    if not ca.is_const():
+        sa = _split(a.div_exact(ca), var)
+    if not cb.is_const():
+        sb = _split(b.div_exact(cb), var)
+    if max(sa) == 0 or max(sb) == 0:
+        return c
+    if max(sa) < max(sb):
+        sa, sb = sb, sa
+    g_s = h_s = Poly.const(1)
+    while True:
+        delta = max(sa) - max(sb)
+        r = _prem(sa, sb)
+        if not r:
+            g = sb
+            break
+        if max(r) == 0:
+            return c
+        sa, sb = sb, _split_div(r, g_s * h_s ** delta)
+        g_s = sa[max(sa)]
+        if delta == 1:
+            h_s = g_s
+        elif delta > 1:
+            h_s = (g_s ** delta).div_exact(h_s ** (delta - 1))
+    g = _join(g, var)
+    content = _content_in(_split(g, var))
+    if not content.is_const():
+        g = g.div_exact(content)
+    return _primitive(c * g)
 
 
 # ---------------------------------------------------------------------------
@@ -348,27 +810,21 @@ class RatFunc(object):
         # 2. univariate polynomial gcd when both sides are univariate in one var
         vs = num.variables() | den.variables()
         if len(vs) == 1 and num.degree() > 0 and den.degree() > 0:
-            var = next(iter(vs))
-            ua, ub = _to_univariate(num, var), _to_univariate(den, var)
-            if ua is not None and ub is not None:
-                g = _uni_gcd(ua, ub)
-                if len(g) > 1:
-                    qa, _ = _uni_divmod(ua, g)
-                    qb, _ = _uni_divmod(ub, g)
-                    num = _from_univariate(qa, var)
-                    den = _from_univariate(qb, var)
-        # 2b. multivariate exact division: when one side divides the other,
-        #     cancellation is complete ((x+y)x/(x+y) -> x) without needing
-        #     a full multivariate GCD; partial common factors still stay
-        #     uncancelled (cross-multiplying __eq__ compensates)
-        if len(vs) > 1 and not den.is_const():
-            q = num.div_exact(den)
-            if q is not None:
-                num, den = q, Poly.const(1)
-            elif not num.is_const():
-                q = den.div_exact(num)
-                if q is not None:
-                    num, den = Poly.const(1), q
+            var, ua, da = _dense_form(num)
+            _var, ub, db = _dense_form(den)
+            g = _dense_gcd(ua, ub)
+            if len(g) > 1:
+                # g is primitive: Gauss's lemma keeps both quotients integral
+                num = _from_dense(_dense_div_exact(ua, g), da, var)
+                den = _from_dense(_dense_div_exact(ub, g), db, var)
+        # 2b. multivariate gcd: every common factor cancels, so the pair
+        #     stays reduced through arithmetic chains and the form is
+        #     canonical
+        if len(vs) > 1 and not den.is_const() and not num.is_const():
+            g = poly_gcd(num, den)
+            if not g.is_const():
+                num = num.div_exact(g)
+                den = den.div_exact(g)
         # 3. content + sign normalization: den gets positive leading coeff,
         #    den content becomes 1
         cd = den.content()
@@ -392,10 +848,10 @@ class RatFunc(object):
         return self.num.variables() | self.den.variables()
 
     def __eq__(self, other):
-        # cross-multiplication: exact even when cancellation is incomplete
-        # (multivariate GCD is only monomial-level)
+        # the constructor leaves num/den fully reduced with a normalized
+        # denominator, so equal functions have equal parts
         return (isinstance(other, RatFunc)
-                and self.num * other.den == other.num * self.den)
+                and self.num == other.num and self.den == other.den)
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -10,13 +10,22 @@ are admitted only through tactic_registry.py.
 
 Deliberately absent: solve, simplify, autonomous integrate, general factor.
 """
+import copy
+import functools
+import hashlib
+import json
 import math
+import os
 import random
 import re
+import tempfile
 import threading
+from collections import OrderedDict
 from contextlib import contextmanager
+from fractions import Fraction
 
-from notation import Notation, Symbol, Func
+from notation import (Notation, FrozenNotation, HashConsedNotation, Symbol,
+                      Func)
 from LatexParser import MathParser
 from LatexWriter import LaTexWriter
 from value import Value, IntegerValue, FracValue, FloatValue
@@ -51,7 +60,315 @@ _ELLIPSIS_RE = re.compile(r'\\(?:[lcvdh])?dots[bcimo]?(?![A-Za-z])')
 _DISPLAY_STAR_RE = re.compile(r'(?<!\\)[ \t]*\*[ \t]*')
 
 
-def parse_latex(latex, allow_ellipsis=False, command_names=None):
+class _ParseCache(object):
+    """Bounded LRU of parsed LaTeX: normalized string -> (sym, frozen
+    Notation).
+
+    Tactics re-parse the same strings constantly (equal_exprs feeding the
+    spot check, atom identities, write->parse round trips).  Entries are
+    FrozenNotation snapshots, so a hit can be handed to any number of
+    readers; parse_latex instantiates a private copy per caller.
+    Failed parses are not cached: the error is rebuilt each time.
+    """
+
+    def __init__(self, maxsize=2048):
+        self.maxsize = maxsize
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'enabled': self.enabled, 'size': len(self._entries),
+                    'maxsize': self.maxsize, 'hits': self.hits,
+                    'misses': self.misses}
+
+
+PARSE_CACHE = _ParseCache()
+
+
+@contextmanager
+def parse_cache_disabled():
+    """Parse every string afresh for the duration (tests that count or
+    instrument the parser itself)."""
+    prev = PARSE_CACHE.enabled
+    PARSE_CACHE.enabled = False
+    try:
+        yield
+    finally:
+        PARSE_CACHE.enabled = prev
+
+
+_ENGINE_FINGERPRINT = None
+
+
+def engine_fingerprint():
+    """Digest of the engine's own sources: a verification cached by one
+    build of the primitives says nothing about another."""
+    global _ENGINE_FINGERPRINT
+    if _ENGINE_FINGERPRINT is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256()
+        for folder in (root, os.path.join(root, 'tactics'),
+                       os.path.join(root, 'lemmas')):
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                if name.endswith(('.py', '.yaml', '.json')) \
+                        and not name.startswith('unittests'):
+                    h.update(name.encode('utf-8'))
+                    with open(os.path.join(folder, name), 'rb') as fh:
+                        h.update(fh.read())
+        _ENGINE_FINGERPRINT = h.hexdigest()
+    return _ENGINE_FINGERPRINT
+
+
+class _VerdictCache(object):
+    """Bounded LRU of oracle verdicts: (check, bound arguments) -> verdict.
+
+    The numeric checks are deterministic in their LaTeX inputs, assumptions,
+    seed and tolerance, and the same pair is checked again and again: an
+    agent re-asking equal?, a tactic's own check, then the ledger's replay
+    of the step.  Keys are the check's arguments with defaults applied, so a
+    call that spells out a default shares the entry of one that does not.
+    Verdicts are copied in and out; a caller may annotate what it gets.
+
+    An optional disk tier (`attach`, pointed by the CLI at a folder beside
+    the session file) keeps JSON verdicts across processes, keyed by the
+    engine fingerprint as well, one file per entry written atomically.
+    Only verdicts that survive a JSON round trip unchanged are written
+    there.  The tier holds at most `disk_maxsize` files: a write that goes
+    over the bound drops the least recently read ones, entries of an older
+    engine fingerprint first in practice, down to three quarters of it.
+    """
+
+    def __init__(self, maxsize=4096, disk_maxsize=65536):
+        self.maxsize = maxsize
+        self.disk_maxsize = disk_maxsize
+        self.enabled = True
+        self.path = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries = OrderedDict()
+        self._on_disk = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(check, arguments):
+        blob = json.dumps([check, arguments], sort_keys=True,
+                          ensure_ascii=False, default=repr)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    def attach(self, path):
+        """Back the cache with a directory; None detaches it."""
+        with self._lock:
+            if path != self.path:
+                self._on_disk = None
+            self.path = path
+
+    def _file(self, path, key):
+        return os.path.join(path, engine_fingerprint()[:16], key[:2],
+                            key + '.json')
+
+    def get(self, key):
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(verdict)
+            path = self.path
+        verdict = None
+        if path is not None:
+            target = self._file(path, key)
+            try:
+                with open(target, 'r', encoding='utf-8') as fh:
+                    verdict = json.load(fh)
+                # the mtime is the eviction order: a read keeps it
+                os.utime(target)
+            except (OSError, ValueError):
+                pass
+        with self._lock:
+            if not isinstance(verdict, dict):
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, verdict)
+        return copy.deepcopy(verdict)
+
+    def _remember(self, key, verdict):
+        self._entries[key] = verdict
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def put(self, key, verdict):
+        if not isinstance(verdict, dict):
+            return
+        verdict = copy.deepcopy(verdict)
+        with self._lock:
+            self._remember(key, verdict)
+            path = self.path
+        if path is None:
+            return
+        try:
+            text = json.dumps(verdict, ensure_ascii=False)
+            if json.loads(text) != verdict:
+                return
+        except (TypeError, ValueError):
+            return
+        target = self._file(path, key)
+        try:
+            fresh = not os.path.exists(target)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target),
+                                       suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                fh.write(text)
+            os.replace(tmp, target)
+        except OSError:
+            return
+        if fresh:
+            self._count_write(path)
+
+    @staticmethod
+    def _disk_files(path):
+        for folder, _, names in os.walk(path):
+            for name in names:
+                if name.endswith('.json'):
+                    yield os.path.join(folder, name)
+
+    def _count_write(self, path):
+        with self._lock:
+            if path != self.path:
+                return
+            if self._on_disk is None:
+                self._on_disk = sum(1 for _ in self._disk_files(path))
+            else:
+                self._on_disk += 1
+            if self._on_disk <= self.disk_maxsize:
+                return
+            self._on_disk = self._evict(path, self.disk_maxsize * 3 // 4)
+
+    def _evict(self, path, keep):
+        """Drop the least recently read files under `path` until `keep`
+        remain; returns how many are left."""
+        aged = []
+        for name in self._disk_files(path):
+            try:
+                aged.append((os.stat(name).st_mtime_ns, name))
+            except OSError:
+                continue
+        aged.sort()
+        left = len(aged)
+        root = os.path.normpath(path)
+        for _, name in aged[:max(0, len(aged) - keep)]:
+            try:
+                os.remove(name)
+                left -= 1
+            except OSError:
+                continue
+            # empty key and fingerprint folders go too, never `path` itself
+            folder = os.path.dirname(os.path.normpath(name))
+            while folder.startswith(root + os.sep):
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    break
+                folder = os.path.dirname(folder)
+        return left
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.disk_hits = 0
+
+    def stats(self):
+        with self._lock:
+            return {'enabled': self.enabled, 'size': len(self._entries),
+                    'maxsize': self.maxsize, 'hits': self.hits,
+                    'disk_hits': self.disk_hits, 'misses': self.misses,
+                    'disk': self.path}
+
+
+VERDICT_CACHE = _VerdictCache()
+
+
+@contextmanager
+def verdict_cache_disabled():
+    """Run every oracle check afresh for the duration (tests that
+    instrument a check's internals)."""
+    prev = VERDICT_CACHE.enabled
+    VERDICT_CACHE.enabled = False
+    try:
+        yield
+    finally:
+        VERDICT_CACHE.enabled = prev
+
+
+def verdict_cached(check):
+    """Serve a deterministic oracle check from VERDICT_CACHE.
+
+    A call that cannot be bound to the check's parameters goes straight
+    through, so it fails exactly as the bare check would."""
+    code = check.__code__
+    names = code.co_varnames[:code.co_argcount]
+    defaults = check.__defaults__ or ()
+    defaults = dict(zip(names[len(names) - len(defaults):], defaults))
+    label = f'{check.__module__}.{check.__qualname__}'
+
+    @functools.wraps(check)
+    def cached(*args, **kwargs):
+        if not VERDICT_CACHE.enabled or len(args) > len(names) \
+                or not set(kwargs) <= set(names[len(args):]):
+            return check(*args, **kwargs)
+        arguments = dict(defaults)
+        arguments.update(zip(names, args))
+        arguments.update(kwargs)
+        if len(arguments) != len(names):
+            return check(*args, **kwargs)
+        key = VERDICT_CACHE.key(label, arguments)
+        verdict = VERDICT_CACHE.get(key)
+        if verdict is None:
+            verdict = check(*args, **kwargs)
+            VERDICT_CACHE.put(key, verdict)
+        return verdict
+
+    return cached
+
+
+def parse_latex_frozen(latex, allow_ellipsis=False, command_names=None):
+    """Parse LaTeX -> (root symbol, FrozenNotation), served from the parse
+    cache.  The snapshot is shared with every other caller of the same
+    string: read it, or instantiate() a copy before writing."""
     # the lexer has no bare < / > tokens, only the \lt / \gt commands
     if not allow_ellipsis and _ELLIPSIS_RE.search(latex):
         raise PrimitiveError(
@@ -62,6 +379,12 @@ def parse_latex(latex, allow_ellipsis=False, command_names=None):
             '\\prod_{k=a}^{b} form it abbreviates')
     normalized = re.sub(r'(?<!\\left)<', ' \\\\lt ', latex)
     normalized = re.sub(r'(?<!\\right)>', ' \\\\gt ', normalized)
+    key = (normalized.strip(), bool(allow_ellipsis),
+           None if command_names is None else frozenset(command_names))
+    if PARSE_CACHE.enabled:
+        entry = PARSE_CACHE.get(key)
+        if entry is not None:
+            return entry
     notation = Notation()
     try:
         sym = MathParser(notation, command_names=command_names).parse(normalized)
@@ -73,7 +396,19 @@ def parse_latex(latex, allow_ellipsis=False, command_names=None):
         fresh = Notation()
         sym = _ApplicationPowerNormalizer(notation, fresh)(sym)
         notation = fresh
-    return sym, notation
+    entry = (sym, FrozenNotation(notation))
+    if PARSE_CACHE.enabled:
+        PARSE_CACHE.put(key, entry)
+    return entry
+
+
+def parse_latex(latex, allow_ellipsis=False, command_names=None):
+    """Parse LaTeX -> (root symbol, Notation) owned by the caller.  A cache
+    hit costs one re-keying copy of the snapshot instead of a parse; the
+    copy has fresh node names, exactly like an uncached parse, so results
+    of two calls can be spliced into one notation without aliasing."""
+    sym, frozen = parse_latex_frozen(latex, allow_ellipsis, command_names)
+    return frozen.instantiate(sym)
 
 
 class PrettyWriter(LaTexWriter):
@@ -310,8 +645,8 @@ def _peel_redundant_brackets(sym, notation):
     try:
         out = Notation()
         peeled = _RedundantBracketPeeler(notation, out)(sym)
-        if (_dag_normal_form(peeled, out, all_brackets=True)
-                == _dag_normal_form(sym, notation, all_brackets=True)):
+        if _same_dag_normal_form(peeled, out, sym, notation,
+                                 all_brackets=True):
             return peeled, out
     except Exception:
         pass
@@ -334,6 +669,20 @@ def _dag_normal_form(sym, notation, all_brackets=False):
         _GroupStripper(notation, out, all_brackets=all_brackets)(sym), out)
 
 
+def _same_dag_normal_form(sym1, notation1, sym2, notation2,
+                          all_brackets=False):
+    """_dag_normal_form(sym1, notation1) == _dag_normal_form(sym2, notation2).
+
+    Both sides are stripped into hash-consed notations, so one node id is
+    one normal form and the common case — the spellings agree — never
+    reaches the writer.  Different ids can still print alike (props the
+    writer ignores), so those fall back to comparing the strings."""
+    out = HashConsedNotation()
+    key1 = _GroupStripper(notation1, out, all_brackets=all_brackets)(sym1)
+    key2 = _GroupStripper(notation2, out, all_brackets=all_brackets)(sym2)
+    return key1 == key2 or _write_std(key1, out) == _write_std(key2, out)
+
+
 def same_expression(latex1, latex2):
     """Structural identity modulo grouping and whitespace — no oracle, no
     algebra. Used for provenance linkage, where value-equality via the
@@ -343,8 +692,9 @@ def same_expression(latex1, latex2):
     if latex1 == latex2:
         return True
     try:
-        return (_normal_form(latex1, allow_ellipsis=True)
-                == _normal_form(latex2, allow_ellipsis=True))
+        sym1, notation1 = parse_latex(latex1, allow_ellipsis=True)
+        sym2, notation2 = parse_latex(latex2, allow_ellipsis=True)
+        return _same_dag_normal_form(sym1, notation1, sym2, notation2)
     except PrimitiveError:
         return False
 
@@ -629,34 +979,52 @@ def _graded_quadrature(fs, fn, var, a, b, env, panels=64):
     whenever it cannot vouch for the value (domain break,
     non-convergence), which approach-sampling treats as ignorance,
     never as evidence."""
-    if a == b:
-        return 0.0
-    sign = 1.0
-    if b < a:
-        a, b = b, a
-        sign = -1.0
-    span = b - a
-    rel = [0.5] + [10.0 ** (-k) for k in range(1, 7)]
-    cuts = ([a] + [a + r * span for r in reversed(rel)]
-            + [b - r * span for r in rel[1:]] + [b])
-    total = 0.0
-    err = 0.0
+    return _graded_quadratures(fs, fn, var, [(a, b)], env, panels)[0]
+
+
+def _graded_quadratures(fs, fn, var, intervals, env, panels=64):
+    """``[_graded_quadrature(..., a, b, ...) for a, b in intervals]`` with
+    every slab of every interval evaluated in one batched pass; raises at
+    the first interval, in order, that the sequential calls would."""
+    plans = []
+    spans = []
+    for a, b in intervals:
+        if a == b:
+            plans.append(None)
+            continue
+        sign = 1.0
+        if b < a:
+            a, b = b, a
+            sign = -1.0
+        span = b - a
+        rel = [0.5] + [10.0 ** (-k) for k in range(1, 7)]
+        cuts = ([a] + [a + r * span for r in reversed(rel)]
+                + [b - r * span for r in rel[1:]] + [b])
+        plans.append((sign, len(spans), len(cuts) - 1))
+        spans.extend(zip(cuts, cuts[1:]))
     with _overflow_saturation():
-        for lo, hi in zip(cuts, cuts[1:]):
-            coarse, _bad = _simpson_panels(fs, fn, var, lo, hi, env,
-                                           panels)
-            fine, _bad2 = _simpson_panels(fs, fn, var, lo, hi, env,
-                                          panels * 2)
+        grids = _simpson_grids(fs, fn, var, spans, env, panels) \
+            if spans else []
+    values = []
+    for plan in plans:
+        if plan is None:
+            values.append(0.0)
+            continue
+        sign, first, count = plan
+        total = 0.0
+        err = 0.0
+        for (coarse, _bad), (fine, _bad2) in grids[first:first + count]:
             if coarse is None or fine is None:
                 raise EvalError(
                     'integrand is not evaluable on the interval')
             total += fine
             err += abs(fine - coarse) / 15.0
-    if not math.isfinite(total):
-        raise EvalError('the integral value overflows')
-    if err > 1e-6 * max(1.0, abs(total)):
-        raise EvalError('quadrature over the interval did not converge')
-    return sign * total
+        if not math.isfinite(total):
+            raise EvalError('the integral value overflows')
+        if err > 1e-6 * max(1.0, abs(total)):
+            raise EvalError('quadrature over the interval did not converge')
+        values.append(sign * total)
+    return values
 
 
 def _ladder_value(vals):
@@ -696,11 +1064,10 @@ def _truncation_ladder_value(fs, fn, ivar, finite, sign, env, rungs=7):
     EvalError when no finite value is in evidence; callers treat that
     as oracle ignorance, never as evidence."""
     scale = max(1.0, abs(finite))
-    vals = []
-    for t in [scale * 10.0 ** k for k in range(1, rungs + 1)]:
-        lo, hi = (finite, t) if sign > 0 else (-t, finite)
-        vals.append(_graded_quadrature(fs, fn, ivar, lo, hi, env))
-    return _ladder_value(vals)
+    rungs_at = [(finite, t) if sign > 0 else (-t, finite)
+                for t in [scale * 10.0 ** k for k in range(1, rungs + 1)]]
+    return _ladder_value(
+        _graded_quadratures(fs, fn, ivar, rungs_at, env))
 
 
 def _singular_ladder_value(fs, fn, ivar, a, b, side, env):
@@ -719,8 +1086,8 @@ def _singular_ladder_value(fs, fn, ivar, a, b, side, env):
         regions += [(b - deltas[k], b - deltas[k + 1]) for k in range(6)]
     vals = []
     run = 0.0
-    for lo, hi in regions:
-        run += _graded_quadrature(fs, fn, ivar, lo, hi, env, panels=64)
+    for value in _graded_quadratures(fs, fn, ivar, regions, env, panels=64):
+        run += value
         vals.append(run)
     return _ladder_value(vals)
 
@@ -772,21 +1139,20 @@ def definite_integral_evaluator(sym, notation):
         ls, ln = parse_latex(lower)
         us, un = parse_latex(upper)
         parsed.append((name, ivar, fs, fn,
-                       (ls, ln, _infinity_sign(ls, ln)),
-                       (us, un, _infinity_sign(us, un))))
+                       (compile_numeric(ls, ln), _infinity_sign(ls, ln)),
+                       (compile_numeric(us, un), _infinity_sign(us, un))))
 
     def evaluate(env):
         e = dict(env)
         for name, ivar, fs, fn, lo_spec, hi_spec in parsed:
-            ls, ln, lo_inf = lo_spec
-            us, un, hi_inf = hi_spec
+            lower_fn, lo_inf = lo_spec
+            upper_fn, hi_inf = hi_spec
             if lo_inf is not None and hi_inf is not None:
                 raise EvalError('both bounds are infinite')
             if lo_inf == 1 or hi_inf == -1:
                 raise EvalError('reversed infinite bound')
             if hi_inf == 1 or lo_inf == -1:
-                fin_s, fin_n = (ls, ln) if hi_inf == 1 else (us, un)
-                finite = numeric_eval(fin_s, fin_n, e)
+                finite = (lower_fn if hi_inf == 1 else upper_fn)(e)
                 if (isinstance(finite, list)
                         or not math.isfinite(finite)):
                     raise EvalError('integral bound is not evaluable')
@@ -794,13 +1160,15 @@ def definite_integral_evaluator(sym, notation):
                 e[name] = _truncation_ladder_value(fs, fn, ivar,
                                                    finite, sign, e)
                 continue
-            a = numeric_eval(ls, ln, e)
-            b = numeric_eval(us, un, e)
+            a = lower_fn(e)
+            b = upper_fn(e)
             if (isinstance(a, list) or isinstance(b, list)
                     or not (math.isfinite(a) and math.isfinite(b))):
                 raise EvalError('integral bound is not evaluable')
             e[name] = _graded_quadrature(fs, fn, ivar, a, b, e)
-        return numeric_eval(skeleton, scratch, e)
+        return outer(e)
+
+    outer = compile_numeric(skeleton, scratch)
 
     return evaluate
 
@@ -1426,6 +1794,8 @@ def _apply_unary(fname, v):
     """One table application, saturating only the genuinely monotone
     overflow shapes (sinh/cosh/exp); `coth` saturates to ±1, never
     infinity, so its overflow stays an error."""
+    if isinstance(v, _Noisy):
+        return _noisy_apply(lambda x: _apply_unary(fname, x), v)
     try:
         return _UNARY_TABLE[fname](v)
     except OverflowError:
@@ -1505,6 +1875,8 @@ def _num_pow(b, p):
         for _ in range(n - 1):
             out = _num_mul(out, b)
         return out
+    if isinstance(b, _Noisy) or isinstance(p, _Noisy):
+        return _noisy_apply(_num_pow, b, p)
     if b == 0 and p < 0:
         raise ZeroDivisionError
     if b < 0 and p != int(p):
@@ -1519,6 +1891,18 @@ def _num_pow(b, p):
         return math.inf if int(p) % 2 == 0 else -math.inf
 
 
+def _num_sqrt(v):
+    if isinstance(v, _Noisy):
+        return _noisy_apply(math.sqrt, v)
+    return math.sqrt(v)
+
+
+def _num_root(v, n):
+    if isinstance(v, _Noisy) or isinstance(n, _Noisy):
+        return _noisy_apply(_num_root, v, n)
+    return math.pow(v, 1.0 / n)
+
+
 def _num_abs(v):
     if isinstance(v, list):
         return max((abs(x) for row in v for x in row), default=0.0)
@@ -1540,14 +1924,201 @@ def _num_gap(v1, v2):
     return abs(v1 - v2)
 
 
+class _Untracked(Exception):
+    """A tracked evaluation left the error-carrying arithmetic (a node
+    called into `math` directly), so its bound would be incomplete."""
+
+
+def _half_ulp(v):
+    return 0.5 * math.ulp(v)
+
+
+class _Noisy(object):
+    """An oracle value carrying a running bound on its absolute error.
+
+    Seeded with one ULP on every sampled coordinate — the perturbation the
+    nudge probe used — and widened by every operation it passes through:
+    first-order propagation of the operands' errors plus half an ULP of
+    rounding on the result.  Large intermediates therefore show up in the
+    bound exactly as they do in a nudged re-evaluation, but the whole bound
+    comes out of a single pass.
+
+    Comparisons, `round`, `floor` and `int` read the value alone; anything
+    that needs a real float (``math.*``) raises _Untracked, and the caller
+    falls back to nudging."""
+
+    __slots__ = ('v', 'err')
+
+    def __init__(self, v, err):
+        self.v = v
+        self.err = err
+
+    @staticmethod
+    def parts(x):
+        if isinstance(x, _Noisy):
+            return x.v, x.err
+        return x, 0.0
+
+    def __add__(self, o):
+        b, eb = _Noisy.parts(o)
+        r = self.v + b
+        return _Noisy(r, self.err + eb + _half_ulp(r))
+
+    def __radd__(self, o):
+        b, eb = _Noisy.parts(o)
+        r = b + self.v
+        return _Noisy(r, self.err + eb + _half_ulp(r))
+
+    def __sub__(self, o):
+        b, eb = _Noisy.parts(o)
+        r = self.v - b
+        return _Noisy(r, self.err + eb + _half_ulp(r))
+
+    def __rsub__(self, o):
+        b, eb = _Noisy.parts(o)
+        r = b - self.v
+        return _Noisy(r, self.err + eb + _half_ulp(r))
+
+    def __mul__(self, o):
+        b, eb = _Noisy.parts(o)
+        r = self.v * b
+        return _Noisy(r, abs(b) * self.err + abs(self.v) * eb
+                      + _half_ulp(r))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, o):
+        b, eb = _Noisy.parts(o)
+        r = self.v / b
+        return _Noisy(r, (self.err + abs(r) * eb) / abs(b) + _half_ulp(r))
+
+    def __rtruediv__(self, o):
+        a, ea = _Noisy.parts(o)
+        r = a / self.v
+        return _Noisy(r, (ea + abs(r) * self.err) / abs(self.v)
+                      + _half_ulp(r))
+
+    def __pow__(self, o):
+        return _num_pow(self, o)
+
+    def __rpow__(self, o):
+        return _num_pow(o, self)
+
+    def __neg__(self):
+        return _Noisy(-self.v, self.err)
+
+    def __abs__(self):
+        return _Noisy(abs(self.v), self.err)
+
+    def __eq__(self, o):
+        return self.v == _Noisy.parts(o)[0]
+
+    def __ne__(self, o):
+        return self.v != _Noisy.parts(o)[0]
+
+    def __lt__(self, o):
+        return self.v < _Noisy.parts(o)[0]
+
+    def __le__(self, o):
+        return self.v <= _Noisy.parts(o)[0]
+
+    def __gt__(self, o):
+        return self.v > _Noisy.parts(o)[0]
+
+    def __ge__(self, o):
+        return self.v >= _Noisy.parts(o)[0]
+
+    def __hash__(self):
+        return hash(self.v)
+
+    def __round__(self, n=None):
+        return round(self.v, n)
+
+    def __floor__(self):
+        return math.floor(self.v)
+
+    def __ceil__(self):
+        return math.ceil(self.v)
+
+    def __int__(self):
+        return int(self.v)
+
+    def __float__(self):
+        raise _Untracked()
+
+    def __repr__(self):
+        return f'{self.v!r}±{self.err:.3g}'
+
+
+def _noisy_apply(fn, *args):
+    """fn over the values of args, with the error bound carried through.
+
+    Each operand's sensitivity is measured by stepping it by its own error
+    (at least one ULP, so the step survives rounding), which covers every
+    table function without a derivative table of its own."""
+    xs = [_Noisy.parts(a)[0] for a in args]
+    r = fn(*xs)
+    err = _half_ulp(r)
+    for i, a in enumerate(args):
+        if not isinstance(a, _Noisy) or not a.err:
+            continue
+        step = max(a.err, math.ulp(a.v))
+        shift = 0.0
+        for sign in (1.0, -1.0):
+            ys = list(xs)
+            ys[i] = a.v + sign * step
+            try:
+                shift = max(shift, abs(fn(*ys) - r))
+            except (EvalError, ZeroDivisionError, ValueError, OverflowError):
+                continue
+        err += shift * (a.err / step)
+    return _Noisy(r, err)
+
+
+def _noisy_env(env):
+    return {key: _Noisy(coord, math.ulp(coord))
+            if isinstance(coord, float) else coord
+            for key, coord in env.items()}
+
+
+def _noise_of(v):
+    if isinstance(v, list):
+        return max((_noise_of(x) for row in v for x in row), default=0.0)
+    return _Noisy.parts(v)[1]
+
+
+def _tracked_noise(evaluate, env):
+    """The error bound of ``evaluate(env)`` from one tracked pass — a
+    number, a tuple of them for a pipeline — or None when the pass could
+    not carry it, in which case the caller nudges instead."""
+    if env and not any(isinstance(c, float) for c in env.values()):
+        return None
+    try:
+        out = evaluate(_noisy_env(env))
+    except (_Untracked, EvalError, ZeroDivisionError, ValueError,
+            OverflowError, TypeError):
+        return None
+    if isinstance(out, tuple):
+        return tuple(_noise_of(v) for v in out)
+    return _noise_of(out)
+
+
 def _eval_noise(sym, notation, env, value):
-    """How far this evaluation moves when one coordinate is nudged by a
-    single ULP, or None when no nudge could be evaluated.
+    """How far this evaluation can be off at ``env``: the error bound a
+    tracked evaluation carries from a one-ULP uncertainty in every
+    coordinate, or None when it could not be measured.
 
     Large intermediate terms amplify an input perturbation exactly as they
     amplify round-off, so this is a proxy for the oracle's own numerical
-    noise at ``env`` — and it reuses the SAME evaluator, so a node type the
-    oracle gains later is covered without touching this code."""
+    noise at ``env``.  The bound comes out of one pass over the SAME
+    evaluator; a node that leaves the tracked arithmetic falls back to
+    nudging each coordinate by one ULP both ways and re-evaluating, so a
+    node type the oracle gains later is covered without touching this
+    code."""
+    evaluate = compile_numeric(sym, notation)
+    tracked = _tracked_noise(evaluate, env)
+    if tracked is not None:
+        return tracked
     worst = 0.0
     probed = False
     for key, coord in env.items():
@@ -1557,7 +2128,7 @@ def _eval_noise(sym, notation, env, value):
             nudged = dict(env)
             nudged[key] = math.nextafter(coord, toward)
             try:
-                moved = numeric_eval(sym, notation, nudged)
+                moved = evaluate(nudged)
             except (EvalError, ZeroDivisionError, ValueError, OverflowError):
                 continue
             gap = _num_gap(value, moved)
@@ -1602,7 +2173,8 @@ def _composite_disagreement_resolves(evaluate, base_env, v1, v2):
     spelling cancels 2.3e8 to 1, costing 1e-7 of relative precision, and the
     relation's own terms then cancel a further 5.9e5 to 1.  Nudging only the
     relation's inputs would report the pipeline as quiet, so the whole
-    pipeline is re-run at the nudged point.
+    pipeline is re-run with error tracking, or at nudged points when it
+    leaves the tracked arithmetic.
 
     ``base_env`` holds the SAMPLED coordinates only; the derived values must
     not be nudged directly, or their own noise would be measured twice and
@@ -1613,6 +2185,9 @@ def _composite_disagreement_resolves(evaluate, base_env, v1, v2):
     gap = _num_gap(v1, v2)
     if gap is None:
         return True
+    tracked = _tracked_noise(evaluate, base_env)
+    if tracked is not None:
+        return gap > _RESOLUTION_MARGIN * max(tracked)
     worst = 0.0
     probed = False
     for key, coord in base_env.items():
@@ -1657,152 +2232,11 @@ def _num_agree(v1, v2, tol):
 def numeric_eval(sym, notation, env):
     """Evaluate expression to a float, or to a list-of-lists of floats for
     matrix literals. Raises EvalError outside the numeric fragment,
-    ZeroDivisionError/ValueError on bad sample points."""
-    if isinstance(sym, IntegerValue):
-        return float(sym.val)
-    if isinstance(sym, FracValue):
-        if sym.denom == 0:
-            raise EvalError('zero denominator literal')
-        return sym.num / sym.denom
-    if isinstance(sym, FloatValue):
-        return float(sym.val)
-    if not isinstance(sym, Symbol):
-        raise EvalError(f'cannot evaluate {sym!r}')
-    f = notation.get(sym)
-    if f is None:
-        if sym.name in env:
-            return env[sym.name]
-        if sym.name in CONSTANT_NAMES:
-            return CONSTANT_NAMES[sym.name]
-        raise EvalError(f'unbound symbol {sym.name}')
-    op = f.sym
-    if op in (Notation.GROUP, Notation.V_GROUP, Notation.S_GROUP,
-              Notation.PLUS):
-        if Notation.is_semantic_bracket(f):
-            # bracket operators — the oracle computes the real |·|, floor
-            # and ceiling, sharing nothing with the symbolic atom path.
-            br = f.props['br']
-            v = numeric_eval(f.args[0], notation, env)
-            if isinstance(v, list):
-                raise EvalError(
-                    f'{Notation.BRACKET_NAMES[br]} of a matrix')
-            if br == Notation.ABS_BR:
-                return abs(v)
-            if br == Notation.FLOOR_BR:
-                return float(math.floor(v))
-            return float(math.ceil(v))
-        return numeric_eval(f.args[0], notation, env)
-    if op in (Notation.PAIR, Notation.COLLECTION):
-        raise EvalError(f'{op.name} is a typed result, not a scalar value')
-    if op == Notation.MINUS:
-        return _num_neg(numeric_eval(f.args[0], notation, env))
-    if op == Notation.S_LIST:
-        total = None
-        for t in f.args:
-            v = numeric_eval(t, notation, env)
-            total = v if total is None else _num_add(total, v)
-        return total
-    if op == Notation.P_LIST:
-        return _eval_plist(f.args, notation, env)
-    if op == Notation.SLASH:
-        d = numeric_eval(f.args[1], notation, env)
-        if isinstance(d, list):
-            raise EvalError('division by a matrix')
-        if d == 0:
-            raise ZeroDivisionError
-        return _num_mul(numeric_eval(f.args[0], notation, env), 1.0 / d)
-    if op == Notation.STAR:
-        return _num_mul(numeric_eval(f.args[0], notation, env),
-                        numeric_eval(f.args[1], notation, env))
-    if op == Notation.FACTORIAL:
-        v = numeric_eval(f.args[0], notation, env)
-        if isinstance(v, list):
-            raise EvalError('factorial of a matrix')
-        if not math.isfinite(v) or v < 0 or abs(v - round(v)) > 1e-9:
-            raise ValueError('factorial requires a nonnegative integer')
-        n = int(round(v))
-        if n > _FACTORIAL_FLOAT_CAP:
-            raise OverflowError('factorial is too large for the oracle')
-        return float(math.factorial(n))
-    if op == Notation.BINOM:
-        n = numeric_eval(f.args[0], notation, env)
-        k = numeric_eval(f.args[1], notation, env)
-        if isinstance(n, list) or isinstance(k, list):
-            raise EvalError('binomial coefficient of a matrix')
-        if (not math.isfinite(n) or not math.isfinite(k)
-                or n < 0 or k < 0
-                or abs(n - round(n)) > 1e-9
-                or abs(k - round(k)) > 1e-9
-                or round(k) > round(n)):
-            raise ValueError(
-                'binomial coefficient requires integers 0 <= k <= n')
-        n, k = int(round(n)), int(round(k))
-        if n > _BINOM_EVAL_CAP:
-            raise OverflowError(
-                'binomial coefficient is too large for the oracle')
-        return float(math.comb(n, k))
-    if op == Notation.INDEX:
-        sub, sup_l, power, sup_r = f.args[1]
-        if sub is not None or sup_l is not None or sup_r is not None:
-            key = _subscript_var(sym, notation)
-            if key is not None and key in env:
-                v = env[key]
-                if power is None:
-                    return v
-                return _num_pow(v, numeric_eval(power, notation, env))
-            raise EvalError('subscripted symbol')
-        base = f.args[0]
-        if power is None:
-            return numeric_eval(base, notation, env)
-        b = numeric_eval(base, notation, env)
-        p = numeric_eval(power, notation, env)
-        return _num_pow(b, p)
-    if op == Notation.FUNC:
-        fname, arg = f.args[0], f.args[1]
-        if isinstance(fname, Symbol) and fname.name in _UNARY_TABLE:
-            v = numeric_eval(arg, notation, env)
-            if isinstance(v, list):
-                raise EvalError('matrix argument to a function')
-            return _apply_unary(fname.name, v)
-        raise EvalError(f'unknown function {fname!r}')
-    if op.name in FRAC_NAMES:
-        d = numeric_eval(f.args[1], notation, env)
-        if isinstance(d, list):
-            raise EvalError('division by a matrix')
-        if d == 0:
-            raise ZeroDivisionError
-        return _num_mul(numeric_eval(f.args[0], notation, env), 1.0 / d)
-    if op.name == '\\sqrt':
-        if len(f.args) == 1:
-            v = numeric_eval(f.args[0], notation, env)
-            if isinstance(v, list):
-                raise EvalError('sqrt of a matrix')
-            if v < 0:
-                raise ValueError('sqrt of negative sample')
-            return math.sqrt(v)
-        n = numeric_eval(f.args[1], notation, env)
-        v = numeric_eval(f.args[0], notation, env)
-        if isinstance(v, list) or isinstance(n, list):
-            raise EvalError('root of a matrix')
-        if v < 0:
-            raise ValueError('root of negative sample')
-        return math.pow(v, 1.0 / n)
-    if op.name in _ARRAY_EVAL_NAMES:
-        rows = []
-        width = None
-        for row in f.args:
-            vals = [numeric_eval(c, notation, env) for c in row]
-            if any(isinstance(v, list) for v in vals):
-                raise EvalError('nested matrix literal')
-            if width is None:
-                width = len(vals)
-            elif len(vals) != width:
-                raise EvalError('ragged matrix literal')
-            rows.append(vals)
-        if not rows or width == 0:
-            raise EvalError('empty matrix literal')
-        return rows
-    raise EvalError(f'cannot evaluate operation {op.name}')
+    ZeroDivisionError/ValueError on bad sample points.
+
+    One evaluator: the tree is lowered by compile_numeric (kept on a
+    FrozenNotation, rebuilt for a notation that may still change)."""
+    return compile_numeric(sym, notation)(env)
 
 
 def _func_power(sym, notation):
@@ -1848,18 +2282,85 @@ def _func_arg_span(args, i, notation, is_head):
 
 _SUM_EVAL_CAP = 100000
 
+# Term count from which a finite operator evaluates its body for every k
+# in one vectorized pass; below it numpy's per-call cost loses to the loop.
+_PREFIX_BATCH_MIN = 32
 
-def _eval_finite_bigop(info, notation, env, op):
-    """The oracle's independent leg for finite ``\\sum``/``\\prod``: a
-    literal accumulation loop over integer bound values, sharing nothing
-    with the symbolic sum/product tactics."""
-    word = 'sum' if op == '\\sum' else 'product'
-    if info is None or info['bound'] is None or len(info['parameters']) != 2:
-        raise EvalError(f'{word} without an explicit k=a..b binder')
-    if not info['body']:
-        raise EvalError(f'{word} without a {word} body')
-    lo = numeric_eval(info['parameters'][0], notation, env)
-    hi = numeric_eval(info['parameters'][1], notation, env)
+
+def _batch_body(body, notation):
+    """The batched twin of a big-operator body (a P_LIST tail), or None
+    when numpy is missing or the body needs the scalar path."""
+    if _load_numpy() is None:
+        return None
+    try:
+        compiled = _BatchCompiler(notation).plist(body)
+    except Exception:
+        return None
+
+    def run(columns, n):
+        with np.errstate(all='ignore'):
+            return compiled(columns, n)
+    return run
+
+
+def _bigop_terms(body, batch, bound, env, lo, hi, word):
+    """The body's values for k = lo..hi.  One vectorized pass when
+    ``batch`` (a _batch_body result) can take the point; the scalar loop
+    otherwise, and whenever the pass flags a term, so a failing term
+    raises exactly what the loop raises."""
+    n = hi - lo + 1
+    if batch is not None and n >= _PREFIX_BATCH_MIN and all(
+            v.__class__ in (float, int) for v in env.values()):
+        columns = {name: np.full(n, float(v)) for name, v in env.items()}
+        columns[bound] = np.arange(lo, hi + 1, dtype=float)
+        values, status = batch(columns, n)
+        if not status.any():
+            return np.broadcast_to(values, (n,)).tolist()
+    e = dict(env)
+    terms = []
+    for k in range(lo, hi + 1):
+        e[bound] = float(k)
+        v = body(e)
+        if isinstance(v, list):
+            raise EvalError(f'matrix-valued {word} term')
+        terms.append(v)
+    return terms
+
+
+def _running_totals(terms, is_sum):
+    """[identity, t0, t0+t1, ...] (products for a \\prod).  Sums carry a
+    Neumaier compensation term, so a long sum of mixed magnitudes keeps
+    the digits a plain left-to-right loop rounds away."""
+    if not is_sum:
+        total = 1.0
+        out = [total]
+        for v in terms:
+            total = total * v
+            out.append(total)
+        return out
+    s = c = 0.0
+    out = [s]
+    for v in terms:
+        if v.__class__ is not float:
+            s = s + c + v   # an error-carrying value: plain arithmetic
+            c = 0.0
+            out.append(s)
+            continue
+        t = s + v
+        if math.isfinite(t):
+            c += (s - t) + v if abs(s) >= abs(v) else (v - t) + s
+        s = t
+        out.append(s + c if math.isfinite(s) else s)
+    return out
+
+
+def _bigop_range(info, notation, env, word, lo_fn=None, hi_fn=None):
+    """Validated integer (lo, hi) of a finite operator at ``env``."""
+    if lo_fn is None:
+        lo = numeric_eval(info['parameters'][0], notation, env)
+        hi = numeric_eval(info['parameters'][1], notation, env)
+    else:
+        lo, hi = lo_fn(env), hi_fn(env)
     if isinstance(lo, list) or isinstance(hi, list):
         raise EvalError(f'matrix-valued {word} bound')
     if abs(lo - round(lo)) > 1e-9 or abs(hi - round(hi)) > 1e-9:
@@ -1867,20 +2368,347 @@ def _eval_finite_bigop(info, notation, env, op):
     lo, hi = int(round(lo)), int(round(hi))
     if hi - lo + 1 > _SUM_EVAL_CAP:
         raise EvalError(f'{word} too long to evaluate')
-    # empty-range conventions: sum -> 0, product -> 1
-    total = 0.0 if op == '\\sum' else 1.0
+    return lo, hi
+
+
+def _bigop_word(info, op):
+    word = 'sum' if op == '\\sum' else 'product'
+    if info is None or info['bound'] is None or len(info['parameters']) != 2:
+        raise EvalError(f'{word} without an explicit k=a..b binder')
+    if not info['body']:
+        raise EvalError(f'{word} without a {word} body')
+    return word
+
+
+def bigop_prefixes(sym, notation, env, hi, upper):
+    """Every partial value of the finite ``\\sum``/``\\prod`` at ``sym``
+    up to upper bound ``hi``, from one pass over its body: ``(lo,
+    totals)`` with ``totals[j]`` the operator over k = lo..lo+j-1, so the
+    value at upper bound m is ``totals[max(0, m - lo + 1)]``.
+
+    ``upper`` names the variable the upper bound is written in; it must
+    be exactly that bound and appear nowhere else, or the partial values
+    would not be the operator's values.  Raises EvalError otherwise, and
+    what numeric_eval raises on a term."""
+    sym = _peel_groups(sym, notation)
+    f = notation.getf(sym, Notation.P_LIST)
+    args = [] if f is None else [
+        a for a in f.args
+        if not (isinstance(a, Symbol) and a.name in Notation.styles)]
+    op = _big_operator_name(args[0], notation) if args else None
+    if op not in ('\\sum', '\\prod'):
+        raise EvalError('not a finite sum or product')
+    info = _binder_info(args[0], notation, args[1:])
+    word = _bigop_word(info, op)
+    top = _peel_groups(info['parameters'][1], notation)
+    if not (isinstance(top, Symbol) and notation.get(top) is None
+            and top.name == upper):
+        raise EvalError(f'{word} upper bound is not {upper}')
+    if upper == info['bound'] or any(
+            upper in free_symbols(s, notation)
+            for s in [info['parameters'][0]] + list(info['body'])):
+        raise EvalError(f'{word} depends on {upper} beyond its bound')
     e = dict(env)
-    for k in range(lo, hi + 1):
-        e[info['bound']] = float(k)
-        v = _eval_plist(info['body'], notation, e)
+    e[upper] = float(hi)
+    lo, hi = _bigop_range(info, notation, e, word)
+    terms = _bigop_terms(
+        _NumericCompiler(notation).plist(info['body']),
+        _batch_body(info['body'], notation), info['bound'], env,
+        lo, hi, word)
+    return lo, _running_totals(terms, op == '\\sum')
+
+
+def _sample_point(variables, rng):
+    # rationals with small denominators, avoiding 0 (poles cluster there)
+    env = {}
+    for v in sorted(variables):
+        num = rng.randint(-12, 12)
+        if num == 0:
+            num = 7
+        den = rng.randint(1, 6)
+        env[v] = num / den + rng.random() * 1e-3
+    return env
+
+
+# Bit size past which an exact power is left to the float oracle: the
+# check only asks whether two rationals are equal, and a numerator of this
+# size already costs more than the retries exact evaluation saves.
+_EXACT_BITS_CAP = 1 << 16
+
+
+def _exact_leaf(v):
+    if isinstance(v, (int, float)) and math.isfinite(v):
+        return Fraction(v)
+    return v
+
+
+def exact_eval(sym, notation, env):
+    """numeric_eval over the rationals wherever the tree allows it.
+
+    Sample coordinates are binary floats, so each one IS a rational;
+    literals, + - * /, integer powers, factorial and binomial stay exact
+    on them and the result is a Fraction.  A node outside that fragment —
+    a function, a root, a constant, a matrix — is handed to numeric_eval
+    at the same point, and its float taints every node above it, so a
+    Fraction result means no digit was lost.  Raises what numeric_eval
+    raises."""
+    if isinstance(sym, IntegerValue):
+        return Fraction(sym.val)
+    if isinstance(sym, FracValue):
+        if sym.denom == 0:
+            raise EvalError('zero denominator literal')
+        return Fraction(sym.num, sym.denom)
+    if isinstance(sym, FloatValue):
+        return Fraction(repr(float(sym.val)))
+    if not isinstance(sym, Symbol):
+        raise EvalError(f'cannot evaluate {sym!r}')
+    f = notation.get(sym)
+    if f is None:
+        if sym.name in env:
+            return _exact_leaf(env[sym.name])
+        return numeric_eval(sym, notation, env)
+    op = f.sym
+    if op in (Notation.GROUP, Notation.V_GROUP, Notation.S_GROUP,
+              Notation.PLUS):
+        if not Notation.is_semantic_bracket(f):
+            return exact_eval(f.args[0], notation, env)
+        v = exact_eval(f.args[0], notation, env)
         if isinstance(v, list):
-            raise EvalError(f'matrix-valued {word} term')
-        total = total + v if op == '\\sum' else total * v
-    return total
+            raise EvalError(
+                f'{Notation.BRACKET_NAMES[f.props["br"]]} of a matrix')
+        br = f.props['br']
+        if br == Notation.ABS_BR:
+            return abs(v)
+        if br == Notation.FLOOR_BR:
+            return Fraction(math.floor(v))
+        return Fraction(math.ceil(v))
+    if op == Notation.MINUS:
+        return _num_neg(exact_eval(f.args[0], notation, env))
+    if op == Notation.S_LIST:
+        total = None
+        for t in f.args:
+            v = exact_eval(t, notation, env)
+            total = v if total is None else _num_add(total, v)
+        return total
+    if op == Notation.P_LIST:
+        args = [a for a in f.args if not (isinstance(a, Symbol)
+                                          and a.name in Notation.styles)]
+        if any(_is_func_name(a, notation)
+               or _func_power(a, notation) is not None
+               or _big_operator_name(a, notation) is not None
+               for a in args):
+            return numeric_eval(sym, notation, env)
+        result = Fraction(1)
+        for a in args:
+            result = _num_mul(result, exact_eval(a, notation, env))
+        return result
+    if op == Notation.SLASH or op.name in FRAC_NAMES:
+        d = exact_eval(f.args[1], notation, env)
+        if isinstance(d, list):
+            raise EvalError('division by a matrix')
+        if d == 0:
+            raise ZeroDivisionError
+        return _num_mul(exact_eval(f.args[0], notation, env), 1 / d)
+    if op == Notation.STAR:
+        return _num_mul(exact_eval(f.args[0], notation, env),
+                        exact_eval(f.args[1], notation, env))
+    if op in (Notation.FACTORIAL, Notation.BINOM):
+        args = [exact_eval(a, notation, env) for a in f.args]
+        if not all(isinstance(a, Fraction) and a.denominator == 1
+                   and a >= 0 for a in args):
+            return numeric_eval(sym, notation, env)
+        if op == Notation.FACTORIAL:
+            if args[0] > _FACTORIAL_FLOAT_CAP:
+                raise OverflowError('factorial is too large for the oracle')
+            return Fraction(math.factorial(int(args[0])))
+        n, k = (int(a) for a in args)
+        if k > n:
+            raise ValueError(
+                'binomial coefficient requires integers 0 <= k <= n')
+        if n > _BINOM_EVAL_CAP:
+            raise OverflowError(
+                'binomial coefficient is too large for the oracle')
+        return Fraction(math.comb(n, k))
+    if op == Notation.INDEX:
+        sub, sup_l, power, sup_r = f.args[1]
+        if sub is not None or sup_l is not None or sup_r is not None:
+            key = _subscript_var(sym, notation)
+            if key is None or key not in env:
+                raise EvalError('subscripted symbol')
+            b = _exact_leaf(env[key])
+        else:
+            b = exact_eval(f.args[0], notation, env)
+        if power is None:
+            return b
+        p = exact_eval(power, notation, env)
+        if (isinstance(b, Fraction) and isinstance(p, Fraction)
+                and p.denominator == 1
+                and abs(p.numerator) * max(b.numerator.bit_length(),
+                                           b.denominator.bit_length())
+                <= _EXACT_BITS_CAP):
+            if b == 0 and p < 0:
+                raise ZeroDivisionError
+            return b ** p.numerator
+        return _num_pow(_float_of(b), _float_of(p))
+    return numeric_eval(sym, notation, env)
+
+
+def _float_of(v):
+    return float(v) if isinstance(v, Fraction) else v
+
+
+def _exact_agree(s1, n1, s2, n2, env):
+    """True/False when both sides evaluate exactly at ``env`` — a verdict
+    round-off cannot touch — or None when either side leaves the rational
+    fragment (or cannot be evaluated at all)."""
+    try:
+        v1 = exact_eval(s1, n1, env)
+        v2 = exact_eval(s2, n2, env)
+    except (EvalError, ZeroDivisionError, ValueError, OverflowError):
+        return None
+    if isinstance(v1, Fraction) and isinstance(v2, Fraction):
+        return v1 == v2
+    return None
 
 
-def _eval_plist(args, notation, env):
-    result = 1.0
+# d/dx f(x) in terms of x and y = f(x): the slope half of _UNARY_TABLE
+_DUAL_SLOPES = {
+    '\\sin': lambda x, y: math.cos(x),
+    '\\cos': lambda x, y: -math.sin(x),
+    '\\tan': lambda x, y: 1.0 + y * y,
+    '\\sinh': lambda x, y: math.cosh(x),
+    '\\cosh': lambda x, y: math.sinh(x),
+    '\\tanh': lambda x, y: 1.0 - y * y,
+    '\\cot': lambda x, y: -(1.0 + y * y),
+    '\\coth': lambda x, y: 1.0 - y * y,
+    '\\sec': lambda x, y: y * math.tan(x),
+    '\\csc': lambda x, y: -y * math.cos(x) / math.sin(x),
+    '\\ln': lambda x, y: 1.0 / x,
+    '\\log': lambda x, y: 1.0 / (x * math.log(10.0)),
+    '\\exp': lambda x, y: y,
+    '\\arcsin': lambda x, y: 1.0 / math.sqrt(1.0 - x * x),
+    '\\arccos': lambda x, y: -1.0 / math.sqrt(1.0 - x * x),
+    '\\arctan': lambda x, y: 1.0 / (1.0 + x * x),
+}
+
+
+def _dual_mul(a, b):
+    return a[0] * b[0], a[0] * b[1] + a[1] * b[0]
+
+
+def _dual_div(a, b):
+    if b[0] == 0:
+        raise ZeroDivisionError
+    return a[0] / b[0], (a[1] * b[0] - a[0] * b[1]) / (b[0] * b[0])
+
+
+def _dual_pow(b, p):
+    value = _num_pow(b[0], p[0])
+    if p[1] == 0:
+        if b[1] == 0:
+            return value, 0.0
+        return value, p[0] * _num_pow(b[0], p[0] - 1) * b[1]
+    if b[0] <= 0:
+        raise EvalError('variable exponent on a nonpositive base')
+    return value, value * (p[1] * math.log(b[0]) + p[0] * b[1] / b[0])
+
+
+def _dual_unary(fname, a):
+    slope = _DUAL_SLOPES.get(fname)
+    if slope is None:
+        raise EvalError(f'no dual-number rule for {fname}')
+    y = _apply_unary(fname, a[0])
+    return y, (slope(a[0], y) * a[1] if a[1] else 0.0)
+
+
+def dual_eval(sym, notation, env, var):
+    """Forward-mode derivative: (f, df/d{var}) at ``env`` in one pass.
+
+    Each node carries its value and its derivative along {var} through
+    the same node order as numeric_eval, so the slope is exact to the
+    rounding of the values themselves — no step size, no truncation.  It
+    is the independent leg of a derivative check: nothing here reads the
+    symbolic differentiation rules.  Non-smooth nodes (|·|, floor,
+    ceiling, big operators, a factorial of the variable) and matrices
+    raise EvalError, and the caller falls back to differences; a point
+    outside the domain raises what numeric_eval raises."""
+    if isinstance(sym, (IntegerValue, FracValue, FloatValue)):
+        return numeric_eval(sym, notation, env), 0.0
+    if not isinstance(sym, Symbol):
+        raise EvalError(f'cannot evaluate {sym!r}')
+    f = notation.get(sym)
+    if f is None:
+        if sym.name in env:
+            return env[sym.name], (1.0 if sym.name == var else 0.0)
+        if sym.name in CONSTANT_NAMES:
+            return CONSTANT_NAMES[sym.name], 0.0
+        raise EvalError(f'unbound symbol {sym.name}')
+    op = f.sym
+    if op in (Notation.GROUP, Notation.V_GROUP, Notation.S_GROUP,
+              Notation.PLUS):
+        if Notation.is_semantic_bracket(f):
+            raise EvalError(
+                f'{Notation.BRACKET_NAMES[f.props["br"]]} is not smooth')
+        return dual_eval(f.args[0], notation, env, var)
+    if op == Notation.MINUS:
+        v, d = dual_eval(f.args[0], notation, env, var)
+        return -v, -d
+    if op == Notation.S_LIST:
+        v = d = 0.0
+        for t in f.args:
+            tv, td = dual_eval(t, notation, env, var)
+            v, d = v + tv, d + td
+        return v, d
+    if op == Notation.P_LIST:
+        return _dual_plist(f.args, notation, env, var)
+    if op == Notation.SLASH or op.name in FRAC_NAMES:
+        return _dual_div(dual_eval(f.args[0], notation, env, var),
+                         dual_eval(f.args[1], notation, env, var))
+    if op == Notation.STAR:
+        return _dual_mul(dual_eval(f.args[0], notation, env, var),
+                         dual_eval(f.args[1], notation, env, var))
+    if op in (Notation.FACTORIAL, Notation.BINOM):
+        if any(dual_eval(a, notation, env, var)[1] for a in f.args):
+            raise EvalError(f'{op.name} of the variable is not smooth')
+        return numeric_eval(sym, notation, env), 0.0
+    if op == Notation.INDEX:
+        sub, sup_l, power, sup_r = f.args[1]
+        if sub is not None or sup_l is not None or sup_r is not None:
+            key = _subscript_var(sym, notation)
+            if key is None or key not in env:
+                raise EvalError('subscripted symbol')
+            b = env[key], (1.0 if key == var else 0.0)
+        else:
+            b = dual_eval(f.args[0], notation, env, var)
+        if power is None:
+            return b
+        return _dual_pow(b, dual_eval(power, notation, env, var))
+    if op == Notation.FUNC:
+        fname, arg = f.args[0], f.args[1]
+        if isinstance(fname, Symbol) and fname.name in _UNARY_TABLE:
+            return _dual_unary(fname.name,
+                               dual_eval(arg, notation, env, var))
+        raise EvalError(f'unknown function {fname!r}')
+    if op.name == '\\sqrt':
+        v = dual_eval(f.args[0], notation, env, var)
+        if v[0] < 0:
+            raise ValueError('root of negative sample')
+        n = (2.0, 0.0) if len(f.args) == 1 \
+            else dual_eval(f.args[1], notation, env, var)
+        if n[1]:
+            raise EvalError('root of variable degree')
+        value = math.sqrt(v[0]) if n[0] == 2.0 else math.pow(v[0],
+                                                              1.0 / n[0])
+        if not v[1]:
+            return value, 0.0
+        return value, value / (n[0] * v[0]) * v[1]
+    raise EvalError(f'cannot differentiate operation {op.name}')
+
+
+def _dual_plist(args, notation, env, var):
+    """_NumericCompiler.plist for dual numbers: same function-argument
+    spans."""
+    result = (1.0, 0.0)
     i = 0
     args = [a for a in args if not (isinstance(a, Symbol)
                                     and a.name in Notation.styles)]
@@ -1891,48 +2719,28 @@ def _eval_plist(args, notation, env):
 
     while i < len(args):
         a = args[i]
-        big = _big_operator_name(a, notation)
-        if big in ('\\sum', '\\prod'):
-            # the operator binds every remaining factor as its body
-            info = _binder_info(a, notation, args[i + 1:])
-            return _num_mul(result,
-                            _eval_finite_bigop(info, notation, env, big))
+        if _big_operator_name(a, notation) is not None:
+            raise EvalError('big operator in a dual-number product')
         fname, power = (a.name, None) if _is_func_name(a, notation) else (
             _func_power(a, notation) or (None, None))
-        if fname is not None:
-            inner_syms, j = _func_arg_span(args, i, notation, is_head)
-            if not inner_syms:
-                raise EvalError(f'{fname} without argument')
-            inner = 1.0
-            for t in inner_syms:
-                inner = _num_mul(inner, numeric_eval(t, notation, env))
-            if isinstance(inner, list):
-                raise EvalError('matrix argument to a function')
-            v = _apply_unary(fname, inner)
-            if power is not None:
-                v = _num_pow(v, numeric_eval(power, notation, env))
-            result = _num_mul(result, v)
-            i = j
-        else:
-            # _num_mul keeps left-to-right order: matrix factors must
-            # multiply in the order they appear
-            result = _num_mul(result, numeric_eval(a, notation, env))
+        if fname is None:
+            result = _dual_mul(result, dual_eval(a, notation, env, var))
             i += 1
+            continue
+        inner_syms, j = _func_arg_span(args, i, notation, is_head)
+        if not inner_syms:
+            raise EvalError(f'{fname} without argument')
+        inner = (1.0, 0.0)
+        for t in inner_syms:
+            inner = _dual_mul(inner, dual_eval(t, notation, env, var))
+        v = _dual_unary(fname, inner)
+        if power is not None:
+            v = _dual_pow(v, dual_eval(power, notation, env, var))
+        result = _dual_mul(result, v)
+        i = j
     return result
 
 
-def _sample_point(variables, rng):
-    # rationals with small denominators, avoiding 0 (poles cluster there)
-    env = {}
-    for v in sorted(variables):
-        num = rng.randint(-12, 12)
-        if num == 0:
-            num = 7
-        den = rng.randint(1, 6)
-        env[v] = num / den + rng.random() * 1e-3
-    return env
-
-
 def _eval_kind(sym, notation, env):
     """numeric_eval classified: (None, value) on success, ('domain', None)
     when the point lies outside the expression's domain (log/root of a
@@ -1946,6 +2754,909 @@ def _eval_kind(sym, notation, env):
         return 'oracle', None
 
 
+# ---------------------------------------------------------------------------
+# compiled oracle: the same evaluator, lowered once per tree
+# ---------------------------------------------------------------------------
+
+def _raising(exc):
+    """A compiled node that fails where its tree says it does: at
+    evaluation time, in evaluation order, never while compiling.  Each
+    call raises a fresh copy; re-raising one instance would grow its
+    traceback (and pin every env it saw) for as long as the compiled
+    tree stays cached."""
+    def run(env):
+        raise copy.copy(exc)
+    return run
+
+
+def _const(v):
+    def run(env):
+        return v
+    return run
+
+
+class _NumericCompiler(object):
+    """Lower a notation tree into nested closures ``env -> value``.
+
+    This is ``numeric_eval``: the ``_num_*`` helpers in operand order,
+    and every structural failure deferred to the node that raises it, so
+    ``_eval_kind``'s classification follows evaluation order — a pole
+    reached before an unevaluable factor is still 'domain'.  The per-node
+    dictionary lookup, the dispatch chain and the product-run analysis
+    of P_LIST (function spans, big-operator binders) depend on the tree
+    only, and happen once here."""
+
+    def __init__(self, notation):
+        self.notation = notation
+
+    def __call__(self, sym):
+        return self.node(sym)
+
+    def node(self, sym):
+        try:
+            return self._node(sym)
+        except Exception as e:
+            return _raising(e)
+
+    def _node(self, sym):
+        notation = self.notation
+        if isinstance(sym, IntegerValue):
+            return _const(float(sym.val))
+        if isinstance(sym, FracValue):
+            if sym.denom == 0:
+                return _raising(EvalError('zero denominator literal'))
+            return _const(sym.num / sym.denom)
+        if isinstance(sym, FloatValue):
+            return _const(float(sym.val))
+        if not isinstance(sym, Symbol):
+            return _raising(EvalError(f'cannot evaluate {sym!r}'))
+        f = notation.get(sym)
+        if f is None:
+            return self._leaf(sym.name)
+        op = f.sym
+        if op in (Notation.GROUP, Notation.V_GROUP, Notation.S_GROUP,
+                  Notation.PLUS):
+            if Notation.is_semantic_bracket(f):
+                return self._bracket(f)
+            return self.node(f.args[0])
+        if op in (Notation.PAIR, Notation.COLLECTION):
+            return _raising(EvalError(
+                f'{op.name} is a typed result, not a scalar value'))
+        if op == Notation.MINUS:
+            inner = self.node(f.args[0])
+
+            def run(env):
+                return _num_neg(inner(env))
+            return run
+        if op == Notation.S_LIST:
+            return self._sum([self.node(t) for t in f.args])
+        if op == Notation.P_LIST:
+            return self.plist(f.args)
+        if op == Notation.SLASH or op.name in FRAC_NAMES:
+            return self._quotient(self.node(f.args[0]),
+                                  self.node(f.args[1]))
+        if op == Notation.STAR:
+            left, right = self.node(f.args[0]), self.node(f.args[1])
+
+            def run(env):
+                return _num_mul(left(env), right(env))
+            return run
+        if op == Notation.FACTORIAL:
+            return self._factorial(self.node(f.args[0]))
+        if op == Notation.BINOM:
+            return self._binom(self.node(f.args[0]), self.node(f.args[1]))
+        if op == Notation.INDEX:
+            return self._index(sym, f)
+        if op == Notation.FUNC:
+            fname, arg = f.args[0], f.args[1]
+            if isinstance(fname, Symbol) and fname.name in _UNARY_TABLE:
+                return self._func(fname.name, self.node(arg))
+            return _raising(EvalError(f'unknown function {fname!r}'))
+        if op.name == '\\sqrt':
+            return self._root(f)
+        if op.name in _ARRAY_EVAL_NAMES:
+            return self._array(f)
+        return _raising(EvalError(f'cannot evaluate operation {op.name}'))
+
+    def _leaf(self, name):
+        if name in CONSTANT_NAMES:
+            const = CONSTANT_NAMES[name]
+
+            def run(env):
+                return env[name] if name in env else const
+            return run
+
+        def run(env):
+            if name in env:
+                return env[name]
+            raise EvalError(f'unbound symbol {name}')
+        return run
+
+    def _bracket(self, f):
+        br = f.props['br']
+        inner = self.node(f.args[0])
+        what = Notation.BRACKET_NAMES[br]
+        if br == Notation.ABS_BR:
+            apply = abs
+        elif br == Notation.FLOOR_BR:
+            def apply(v):
+                return float(math.floor(v))
+        else:
+            def apply(v):
+                return float(math.ceil(v))
+
+        def run(env):
+            v = inner(env)
+            if isinstance(v, list):
+                raise EvalError(f'{what} of a matrix')
+            return apply(v)
+        return run
+
+    def _sum(self, terms):
+        if not terms:
+            return _const(None)
+        first, rest = terms[0], terms[1:]
+
+        def run(env):
+            total = first(env)
+            for t in rest:
+                v = t(env)
+                if total.__class__ is float and v.__class__ is float:
+                    total += v
+                else:
+                    total = _num_add(total, v)
+            return total
+        return run
+
+    def _quotient(self, num, den):
+        # the denominator evaluates first: a pole there outranks any
+        # failure in the numerator
+        def run(env):
+            d = den(env)
+            if isinstance(d, list):
+                raise EvalError('division by a matrix')
+            if d == 0:
+                raise ZeroDivisionError
+            return _num_mul(num(env), 1.0 / d)
+        return run
+
+    def _factorial(self, inner):
+        def run(env):
+            v = inner(env)
+            if isinstance(v, list):
+                raise EvalError('factorial of a matrix')
+            if not math.isfinite(v) or v < 0 or abs(v - round(v)) > 1e-9:
+                raise ValueError('factorial requires a nonnegative integer')
+            n = int(round(v))
+            if n > _FACTORIAL_FLOAT_CAP:
+                raise OverflowError('factorial is too large for the oracle')
+            return float(math.factorial(n))
+        return run
+
+    def _binom(self, top, bottom):
+        def run(env):
+            n = top(env)
+            k = bottom(env)
+            if isinstance(n, list) or isinstance(k, list):
+                raise EvalError('binomial coefficient of a matrix')
+            if (not math.isfinite(n) or not math.isfinite(k)
+                    or n < 0 or k < 0
+                    or abs(n - round(n)) > 1e-9
+                    or abs(k - round(k)) > 1e-9
+                    or round(k) > round(n)):
+                raise ValueError(
+                    'binomial coefficient requires integers 0 <= k <= n')
+            n, k = int(round(n)), int(round(k))
+            if n > _BINOM_EVAL_CAP:
+                raise OverflowError(
+                    'binomial coefficient is too large for the oracle')
+            return float(math.comb(n, k))
+        return run
+
+    def _index(self, sym, f):
+        sub, sup_l, power, sup_r = f.args[1]
+        power_fn = None if power is None else self.node(power)
+        if sub is not None or sup_l is not None or sup_r is not None:
+            key = _subscript_var(sym, self.notation)
+
+            def run(env):
+                if key is not None and key in env:
+                    v = env[key]
+                    if power_fn is None:
+                        return v
+                    return _num_pow(v, power_fn(env))
+                raise EvalError('subscripted symbol')
+            return run
+        base = self.node(f.args[0])
+        if power_fn is None:
+            return base
+
+        def run(env):
+            b = base(env)
+            return _num_pow(b, power_fn(env))
+        return run
+
+    def _func(self, fname, inner):
+        def run(env):
+            v = inner(env)
+            if isinstance(v, list):
+                raise EvalError('matrix argument to a function')
+            return _apply_unary(fname, v)
+        return run
+
+    def _unary(self, fname, inner_fns, power_fn):
+        # a function head inside a product run: its argument is the
+        # product of the bound factors, seeded with 1.0 as the walk does
+        if len(inner_fns) == 1:
+            only = inner_fns[0]
+
+            def argument(env):
+                return _num_mul(1.0, only(env))
+        else:
+            def argument(env):
+                inner = 1.0
+                for t in inner_fns:
+                    inner = _num_mul(inner, t(env))
+                return inner
+
+        def run(env):
+            inner = argument(env)
+            if isinstance(inner, list):
+                raise EvalError('matrix argument to a function')
+            v = _apply_unary(fname, inner)
+            if power_fn is not None:
+                v = _num_pow(v, power_fn(env))
+            return v
+        return run
+
+    def _root(self, f):
+        if len(f.args) == 1:
+            inner = self.node(f.args[0])
+
+            def run(env):
+                v = inner(env)
+                if isinstance(v, list):
+                    raise EvalError('sqrt of a matrix')
+                if v < 0:
+                    raise ValueError('sqrt of negative sample')
+                return _num_sqrt(v)
+            return run
+        radicand, degree = self.node(f.args[0]), self.node(f.args[1])
+
+        def run(env):
+            n = degree(env)
+            v = radicand(env)
+            if isinstance(v, list) or isinstance(n, list):
+                raise EvalError('root of a matrix')
+            if v < 0:
+                raise ValueError('root of negative sample')
+            return _num_root(v, n)
+        return run
+
+    def _array(self, f):
+        rows = [[self.node(c) for c in row] for row in f.args]
+
+        def run(env):
+            out = []
+            width = None
+            for row in rows:
+                vals = [c(env) for c in row]
+                if any(isinstance(v, list) for v in vals):
+                    raise EvalError('nested matrix literal')
+                if width is None:
+                    width = len(vals)
+                elif len(vals) != width:
+                    raise EvalError('ragged matrix literal')
+                out.append(vals)
+            if not out or width == 0:
+                raise EvalError('empty matrix literal')
+            return out
+        return run
+
+    def plist(self, args):
+        """A P_LIST product run with its factor-run analysis done once: a
+        list of factor closures multiplied left to right (matrix factors
+        multiply in the order they appear)."""
+        notation = self.notation
+        args = [a for a in args if not (isinstance(a, Symbol)
+                                        and a.name in Notation.styles)]
+
+        def is_head(a):
+            return (_is_func_name(a, notation)
+                    or _func_power(a, notation) is not None)
+
+        factors = []
+        i = 0
+        try:
+            while i < len(args):
+                a = args[i]
+                big = _big_operator_name(a, notation)
+                if big in ('\\sum', '\\prod'):
+                    info = _binder_info(a, notation, args[i + 1:])
+                    factors.append(self._bigop(info, big))
+                    break
+                fname, power = (a.name, None) if _is_func_name(
+                    a, notation) else (_func_power(a, notation)
+                                       or (None, None))
+                if fname is not None:
+                    inner_syms, j = _func_arg_span(args, i, notation,
+                                                   is_head)
+                    if not inner_syms:
+                        factors.append(_raising(
+                            EvalError(f'{fname} without argument')))
+                        break
+                    factors.append(self._unary(
+                        fname, [self.node(t) for t in inner_syms],
+                        None if power is None else self.node(power)))
+                    i = j
+                else:
+                    factors.append(self.node(a))
+                    i += 1
+        except Exception as e:
+            factors.append(_raising(e))
+
+        def run(env):
+            result = 1.0
+            for factor in factors:
+                v = factor(env)
+                if result.__class__ is float and v.__class__ is float:
+                    result *= v
+                else:
+                    result = _num_mul(result, v)
+            return result
+        return run
+
+    def _bigop(self, info, op):
+        try:
+            word = _bigop_word(info, op)
+        except EvalError as e:
+            return _raising(e)
+        lo_fn = self.node(info['parameters'][0])
+        hi_fn = self.node(info['parameters'][1])
+        body = self.plist(info['body'])
+        bound = info['bound']
+        is_sum = op == '\\sum'
+        batch = []   # the body's batched twin, compiled on first long range
+
+        def run(env):
+            lo, hi = _bigop_range(info, None, env, word, lo_fn, hi_fn)
+            if not batch and hi - lo + 1 >= _PREFIX_BATCH_MIN:
+                batch.append(_batch_body(info['body'], self.notation))
+            terms = _bigop_terms(body, batch[0] if batch else None, bound,
+                                 env, lo, hi, word)
+            return _running_totals(terms, is_sum)[-1]
+        return run
+
+
+def compile_numeric(sym, notation):
+    """The tree lowered once: a callable ``env -> value`` with
+    numeric_eval's values and exceptions, for callers that evaluate
+    one expression at many sample points.  A FrozenNotation snapshot
+    cannot change, so its compiled trees are kept on the snapshot and
+    shared by every caller that parsed the same string."""
+    if isinstance(notation, FrozenNotation):
+        compiled = notation.__dict__.setdefault('_compiled_numeric', {})
+        fn = compiled.get(sym)
+        if fn is None:
+            fn = compiled[sym] = _NumericCompiler(notation)(sym)
+        return fn
+    return _NumericCompiler(notation)(sym)
+
+
+def _compiled_kind(evaluate, env):
+    """``_eval_kind`` for a compiled evaluator."""
+    try:
+        return None, evaluate(env)
+    except (ValueError, ZeroDivisionError):
+        return 'domain', None
+    except (EvalError, OverflowError):
+        return 'oracle', None
+
+
+# ---------------------------------------------------------------------------
+# batched oracle: one vectorized pass over many sample points. Optional —
+# without numpy every caller keeps the scalar path.
+# ---------------------------------------------------------------------------
+
+# per-point status codes; _BATCH_KINDS maps them onto _eval_kind's kinds
+_BATCH_OK, _BATCH_DOMAIN, _BATCH_ORACLE = 0, 1, 2
+_BATCH_KINDS = (None, 'domain', 'oracle')
+
+# math-module twins of _UNARY_TABLE. `overflows` marks the functions whose
+# finite-argument infinity is an OverflowError in `math` (the rest raise
+# ValueError: log(0) is a domain error, not a range error).
+_BATCH_UNARY = {
+    '\\sin': 'sin', '\\cos': 'cos', '\\tan': 'tan',
+    '\\sinh': 'sinh', '\\cosh': 'cosh', '\\tanh': 'tanh',
+    '\\ln': 'log', '\\log': 'log10', '\\exp': 'exp',
+    '\\arcsin': 'arcsin', '\\arccos': 'arccos', '\\arctan': 'arctan',
+}
+_BATCH_OVERFLOWS = frozenset({'\\sinh', '\\cosh', '\\exp'})
+
+
+class _Unbatchable(Exception):
+    """The tree needs the scalar path (matrix literal, a point-dependent
+    big-operator range, anything the batch twin does not mirror)."""
+
+
+_numpy_tried = False
+
+
+def _load_numpy():
+    """numpy, imported on first use: only the batched oracle needs it, and
+    it is most of this module's import time.  None when it is missing —
+    the scalar oracle needs no numpy."""
+    global np, _numpy_tried
+    if not _numpy_tried:
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover
+            np = None
+        _numpy_tried = True
+    return np
+
+
+def __getattr__(name):
+    # `primitives.np` before the first batched check loads it
+    if name == 'np':
+        return _load_numpy()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _flag(status, mask, code):
+    """Record `code` where `mask` holds and the point has not failed yet:
+    the scalar walk stops at its FIRST exception, so the earliest failure
+    in evaluation order is the one that classifies the point."""
+    return np.where((status == _BATCH_OK) & mask, code, status)
+
+
+def _first(a, b):
+    return np.where(a != _BATCH_OK, a, b)
+
+
+class _BatchCompiler(object):
+    """The element-wise twin of ``_NumericCompiler``.
+
+    Each node maps ``(columns, n)`` to ``(values, status)`` arrays.
+    Statuses merge in the scalar walk's evaluation order, and each
+    ``math``-module failure is re-derived from the IEEE result (a NaN
+    from a non-NaN argument is ValueError, an infinity from a finite one
+    is OverflowError or ValueError as ``math`` raises it), so every point
+    classifies exactly as ``_eval_kind`` would.  Values at failed points
+    are garbage and never read."""
+
+    def __init__(self, notation):
+        self.notation = notation
+
+    def __call__(self, sym):
+        return self.node(sym)
+
+    def _fill(self, v):
+        def run(cols, n):
+            return np.full(n, v), np.zeros(n, np.int8)
+        return run
+
+    def _fail(self, code):
+        def run(cols, n):
+            return np.full(n, math.nan), np.full(n, code, np.int8)
+        return run
+
+    def node(self, sym):
+        notation = self.notation
+        if isinstance(sym, IntegerValue):
+            return self._fill(float(sym.val))
+        if isinstance(sym, FracValue):
+            if sym.denom == 0:
+                return self._fail(_BATCH_ORACLE)
+            return self._fill(sym.num / sym.denom)
+        if isinstance(sym, FloatValue):
+            return self._fill(float(sym.val))
+        if not isinstance(sym, Symbol):
+            return self._fail(_BATCH_ORACLE)
+        f = notation.get(sym)
+        if f is None:
+            return self._leaf(sym.name)
+        op = f.sym
+        if op in (Notation.GROUP, Notation.V_GROUP, Notation.S_GROUP,
+                  Notation.PLUS):
+            if Notation.is_semantic_bracket(f):
+                return self._bracket(f)
+            return self.node(f.args[0])
+        if op in (Notation.PAIR, Notation.COLLECTION):
+            return self._fail(_BATCH_ORACLE)
+        if op == Notation.MINUS:
+            inner = self.node(f.args[0])
+
+            def run(cols, n):
+                v, st = inner(cols, n)
+                return -v, st
+            return run
+        if op == Notation.S_LIST:
+            return self._sum([self.node(t) for t in f.args])
+        if op == Notation.P_LIST:
+            return self.plist(f.args)
+        if op == Notation.SLASH or op.name in FRAC_NAMES:
+            return self._quotient(self.node(f.args[0]),
+                                  self.node(f.args[1]))
+        if op == Notation.STAR:
+            return self._product([self.node(f.args[0]),
+                                  self.node(f.args[1])])
+        if op == Notation.FACTORIAL:
+            return self._factorial(self.node(f.args[0]))
+        if op == Notation.BINOM:
+            return self._binom(self.node(f.args[0]), self.node(f.args[1]))
+        if op == Notation.INDEX:
+            return self._index(sym, f)
+        if op == Notation.FUNC:
+            fname, arg = f.args[0], f.args[1]
+            if isinstance(fname, Symbol) and fname.name in _UNARY_TABLE:
+                return self._unary(fname.name, [self.node(arg)], None)
+            return self._fail(_BATCH_ORACLE)
+        if op.name == '\\sqrt':
+            return self._root(f)
+        if op.name in _ARRAY_EVAL_NAMES:
+            raise _Unbatchable('matrix literal')
+        return self._fail(_BATCH_ORACLE)
+
+    def _leaf(self, name):
+        const = CONSTANT_NAMES.get(name)
+
+        def run(cols, n):
+            if name in cols:
+                return cols[name], np.zeros(n, np.int8)
+            if const is not None:
+                return np.full(n, const), np.zeros(n, np.int8)
+            return (np.full(n, math.nan),
+                    np.full(n, _BATCH_ORACLE, np.int8))
+        return run
+
+    def _bracket(self, f):
+        br = f.props['br']
+        inner = self.node(f.args[0])
+
+        def run(cols, n):
+            v, st = inner(cols, n)
+            if br == Notation.ABS_BR:
+                return np.abs(v), st
+            # math.floor/ceil: NaN is ValueError, an infinity OverflowError
+            st = _flag(st, np.isnan(v), _BATCH_DOMAIN)
+            st = _flag(st, np.isinf(v), _BATCH_ORACLE)
+            out = np.floor(v) if br == Notation.FLOOR_BR else np.ceil(v)
+            return out, st
+        return run
+
+    def _sum(self, terms):
+        if not terms:
+            raise _Unbatchable('empty sum')
+
+        def run(cols, n):
+            total, st = terms[0](cols, n)
+            for t in terms[1:]:
+                v, s = t(cols, n)
+                total = total + v
+                st = _first(st, s)
+            return total, st
+        return run
+
+    def _product(self, factors):
+        def run(cols, n):
+            result = np.ones(n)
+            st = np.zeros(n, np.int8)
+            for factor in factors:
+                v, s = factor(cols, n)
+                result = result * v
+                st = _first(st, s)
+            return result, st
+        return run
+
+    def _quotient(self, num, den):
+        def run(cols, n):
+            d, st = den(cols, n)
+            st = _flag(st, d == 0, _BATCH_DOMAIN)
+            v, s = num(cols, n)
+            return v * (1.0 / d), _first(st, s)
+        return run
+
+    def _pow(self, b, p, st):
+        """``_num_pow`` element-wise, its pre-checks in its own order."""
+        st = _flag(st, (b == 0) & (p < 0), _BATCH_DOMAIN)
+        neg = b < 0
+        # int(p) itself fails first: inf is OverflowError, NaN ValueError
+        st = _flag(st, neg & np.isinf(p), _BATCH_ORACLE)
+        st = _flag(st, neg & np.isnan(p), _BATCH_DOMAIN)
+        st = _flag(st, neg & np.isfinite(p) & (p != np.trunc(p)),
+                   _BATCH_DOMAIN)
+        r = np.power(b, p)
+        if not getattr(_SATURATE_OVERFLOW, 'on', False):
+            st = _flag(st, np.isinf(r) & np.isfinite(b) & np.isfinite(p),
+                       _BATCH_ORACLE)
+        return r, st
+
+    def _factorial(self, inner):
+        table = np.array([float(math.factorial(k))
+                          for k in range(_FACTORIAL_FLOAT_CAP + 1)])
+
+        def run(cols, n):
+            v, st = inner(cols, n)
+            r = np.round(v)
+            st = _flag(st, ~np.isfinite(v) | (v < 0)
+                       | (np.abs(v - r) > 1e-9), _BATCH_DOMAIN)
+            st = _flag(st, r > _FACTORIAL_FLOAT_CAP, _BATCH_ORACLE)
+            idx = np.where(st == _BATCH_OK, r, 0).astype(np.int64)
+            return table[idx], st
+        return run
+
+    def _binom(self, top, bottom):
+        def run(cols, n):
+            nv, st = top(cols, n)
+            kv, s = bottom(cols, n)
+            st = _first(st, s)
+            nr, kr = np.round(nv), np.round(kv)
+            st = _flag(st, ~np.isfinite(nv) | ~np.isfinite(kv)
+                       | (nv < 0) | (kv < 0)
+                       | (np.abs(nv - nr) > 1e-9)
+                       | (np.abs(kv - kr) > 1e-9) | (kr > nr),
+                       _BATCH_DOMAIN)
+            st = _flag(st, nr > _BINOM_EVAL_CAP, _BATCH_ORACLE)
+            out = np.full(n, math.nan)
+            for i in np.flatnonzero(st == _BATCH_OK):
+                try:
+                    out[i] = float(math.comb(int(nr[i]), int(kr[i])))
+                except OverflowError:
+                    st[i] = _BATCH_ORACLE
+            return out, st
+        return run
+
+    def _index(self, sym, f):
+        sub, sup_l, power, sup_r = f.args[1]
+        power_fn = None if power is None else self.node(power)
+        if sub is not None or sup_l is not None or sup_r is not None:
+            key = _subscript_var(sym, self.notation)
+            if key is None:
+                return self._fail(_BATCH_ORACLE)
+
+            def run(cols, n):
+                if key not in cols:
+                    return (np.full(n, math.nan),
+                            np.full(n, _BATCH_ORACLE, np.int8))
+                v = cols[key]
+                if power_fn is None:
+                    return v, np.zeros(n, np.int8)
+                p, st = power_fn(cols, n)
+                return self._pow(v, p, st)
+            return run
+        base = self.node(f.args[0])
+        if power_fn is None:
+            return base
+
+        def run(cols, n):
+            b, st = base(cols, n)
+            p, s = power_fn(cols, n)
+            return self._pow(b, p, _first(st, s))
+        return run
+
+    def _apply(self, fname, v, st):
+        """``_apply_unary`` element-wise."""
+        if fname in _BATCH_UNARY:
+            r = getattr(np, _BATCH_UNARY[fname])(v)
+            st = _flag(st, np.isnan(r) & ~np.isnan(v), _BATCH_DOMAIN)
+            blown = np.isinf(r) & np.isfinite(v)
+            if fname not in _BATCH_OVERFLOWS:
+                st = _flag(st, blown, _BATCH_DOMAIN)
+            elif not getattr(_SATURATE_OVERFLOW, 'on', False):
+                st = _flag(st, blown, _BATCH_ORACLE)
+            return r, st
+        if fname == '\\coth':
+            c = np.cosh(v)
+            # coth never saturates: its overflow stays an error
+            st = _flag(st, np.isinf(c) & np.isfinite(v), _BATCH_ORACLE)
+            s = np.sinh(v)
+            st = _flag(st, s == 0, _BATCH_DOMAIN)
+            return c / s, st
+        # \cot = cos/sin, \sec = 1/cos, \csc = 1/sin: an infinite argument
+        # is the trig ValueError, a zero divisor ZeroDivisionError
+        st = _flag(st, np.isinf(v), _BATCH_DOMAIN)
+        c, s = np.cos(v), np.sin(v)
+        if fname == '\\cot':
+            st = _flag(st, s == 0, _BATCH_DOMAIN)
+            return c / s, st
+        d = c if fname == '\\sec' else s
+        st = _flag(st, d == 0, _BATCH_DOMAIN)
+        return 1.0 / d, st
+
+    def _unary(self, fname, inner_fns, power_fn):
+        argument = self._product(inner_fns)
+
+        def run(cols, n):
+            v, st = argument(cols, n)
+            r, st = self._apply(fname, v, st)
+            if power_fn is not None:
+                p, s = power_fn(cols, n)
+                r, st = self._pow(r, p, _first(st, s))
+            return r, st
+        return run
+
+    def _root(self, f):
+        if len(f.args) == 1:
+            inner = self.node(f.args[0])
+
+            def run(cols, n):
+                v, st = inner(cols, n)
+                st = _flag(st, v < 0, _BATCH_DOMAIN)
+                return np.sqrt(v), st
+            return run
+        radicand, degree = self.node(f.args[0]), self.node(f.args[1])
+
+        def run(cols, n):
+            d, st = degree(cols, n)
+            v, s = radicand(cols, n)
+            st = _first(st, s)
+            st = _flag(st, v < 0, _BATCH_DOMAIN)
+            st = _flag(st, d == 0, _BATCH_DOMAIN)
+            p = 1.0 / d
+            # a raw math.pow: 0 to a negative power is its ValueError,
+            # and an overflow never saturates here
+            st = _flag(st, (v == 0) & (p < 0), _BATCH_DOMAIN)
+            r = np.power(v, p)
+            st = _flag(st, np.isinf(r) & np.isfinite(v) & np.isfinite(p),
+                       _BATCH_ORACLE)
+            return r, st
+        return run
+
+    def plist(self, args):
+        notation = self.notation
+        args = [a for a in args if not (isinstance(a, Symbol)
+                                        and a.name in Notation.styles)]
+
+        def is_head(a):
+            return (_is_func_name(a, notation)
+                    or _func_power(a, notation) is not None)
+
+        factors = []
+        i = 0
+        while i < len(args):
+            a = args[i]
+            big = _big_operator_name(a, notation)
+            if big in ('\\sum', '\\prod'):
+                info = _binder_info(a, notation, args[i + 1:])
+                factors.append(self._bigop(info, big))
+                break
+            fname, power = (a.name, None) if _is_func_name(
+                a, notation) else (_func_power(a, notation) or (None, None))
+            if fname is not None:
+                inner_syms, j = _func_arg_span(args, i, notation, is_head)
+                if not inner_syms:
+                    factors.append(self._fail(_BATCH_ORACLE))
+                    break
+                factors.append(self._unary(
+                    fname, [self.node(t) for t in inner_syms],
+                    None if power is None else self.node(power)))
+                i = j
+            else:
+                factors.append(self.node(a))
+                i += 1
+        return self._product(factors)
+
+    def _bigop(self, info, op):
+        if info is None or info['bound'] is None \
+                or len(info['parameters']) != 2 or not info['body']:
+            return self._fail(_BATCH_ORACLE)
+        params = info['parameters']
+        if any(free_symbols(p, self.notation) for p in params):
+            raise _Unbatchable('point-dependent big-operator range')
+        lo_fn, hi_fn = (compile_numeric(p, self.notation) for p in params)
+        body = self.plist(info['body'])
+        bound = info['bound']
+        is_sum = op == '\\sum'
+
+        def run(cols, n):
+            kind, lo = _compiled_kind(lo_fn, {})
+            if kind is None:
+                kind, hi = _compiled_kind(hi_fn, {})
+            if kind is not None:
+                return self._fail(_BATCH_KINDS.index(kind))(cols, n)
+            if isinstance(lo, list) or isinstance(hi, list) \
+                    or abs(lo - round(lo)) > 1e-9 \
+                    or abs(hi - round(hi)) > 1e-9:
+                return self._fail(_BATCH_ORACLE)(cols, n)
+            lo, hi = int(round(lo)), int(round(hi))
+            if hi - lo + 1 > _SUM_EVAL_CAP:
+                return self._fail(_BATCH_ORACLE)(cols, n)
+            total = np.full(n, 0.0 if is_sum else 1.0)
+            st = np.zeros(n, np.int8)
+            inner = dict(cols)
+            for k in range(lo, hi + 1):
+                inner[bound] = np.full(n, float(k))
+                v, s = body(inner, n)
+                total = total + v if is_sum else total * v
+                st = _first(st, s)
+            return total, st
+        return run
+
+
+def compile_batch(sym, notation):
+    """The vectorized oracle: a callable ``(columns, n) -> (values,
+    status)`` over ``n`` sample points, ``columns`` mapping each variable
+    to a float array.  ``status`` holds _BATCH_OK/_BATCH_DOMAIN/
+    _BATCH_ORACLE per point, exactly ``_eval_kind``'s classification.
+    None when numpy is missing or the tree needs the scalar path; a
+    FrozenNotation keeps the answer either way."""
+    if _load_numpy() is None:
+        return None
+    cache = None
+    if isinstance(notation, FrozenNotation):
+        cache = notation.__dict__.setdefault('_compiled_batch', {})
+        if sym in cache:
+            return cache[sym]
+    try:
+        fn = _BatchCompiler(notation)(sym)
+    except Exception:
+        # _Unbatchable, or a structural failure the scalar walk reports
+        # in its own words and at its own point
+        fn = None
+    if fn is not None:
+        compiled = fn
+
+        def fn(columns, n):
+            with np.errstate(all='ignore'):
+                return compiled(columns, n)
+    if cache is not None:
+        cache[sym] = fn
+    return fn
+
+
+def _batch_kinds(batch, evaluate, envs):
+    """``[_compiled_kind(evaluate, env) for env in envs]``, in one call to
+    ``batch`` (a compile_batch result) when the points allow it: they
+    must share their variables and hold plain numbers.  Anything else,
+    and every tree compile_batch declined, takes the scalar path."""
+    if batch is not None and envs:
+        keys = envs[0].keys()
+        if all(env.keys() == keys for env in envs) and all(
+                v.__class__ in (float, int)
+                for env in envs for v in env.values()):
+            columns = {k: np.array([env[k] for env in envs], float)
+                       for k in keys}
+            values, status = batch(columns, len(envs))
+            return [(None, v) if code == _BATCH_OK
+                    else (_BATCH_KINDS[code], None)
+                    for code, v in zip(status.tolist(), values.tolist())]
+    return [_compiled_kind(evaluate, env) for env in envs]
+
+
+class _SampleStream(object):
+    """The sample points of a sequential check, drawn from ``rng`` in
+    exactly the order the scalar loop draws them, with every expression
+    classified a chunk of points at a time.  Chunks start at the
+    requested sample count and double, so an unconstrained check that
+    agrees everywhere costs one batched call per expression; the loop
+    consuming the stream keeps its early exits unchanged."""
+
+    def __init__(self, variables, rng, exprs, chunk, budget):
+        self.variables = variables
+        self.rng = rng
+        self.exprs = [(compile_batch(s, n), compile_numeric(s, n))
+                      for s, n in exprs]
+        self.chunk = max(1, chunk)
+        self.left = budget
+        self.pending = []
+
+    def next(self):
+        """(env, [(kind, value) per expression]) for the next point."""
+        if not self.pending:
+            size = max(1, min(self.chunk, self.left))
+            self.chunk *= 2
+            self.left -= size
+            envs = [_sample_point(self.variables, self.rng)
+                    for _ in range(size)]
+            kinds = [_batch_kinds(batch, evaluate, envs)
+                     for batch, evaluate in self.exprs]
+            self.pending = [(env, [k[i] for k in kinds])
+                            for i, env in enumerate(envs)]
+            self.pending.reverse()
+        return self.pending.pop()
+
+
 # ---------------------------------------------------------------------------
 # assumption constraints: the oracle samples only inside the assumed region
 # ---------------------------------------------------------------------------
@@ -2105,7 +3816,11 @@ def _sample_guards(assumptions):
                 members = None
             if members is not None:
                 constraints.extend(members)
-    return nonzero, constraints
+    # lowered once: a guard is read at every sample point
+    return ([(gs, gn, compile_numeric(gs, gn)) for gs, gn in nonzero],
+            [(lhs, rhs, rel, gn, compile_numeric(lhs, gn),
+              compile_numeric(rhs, gn))
+             for lhs, rhs, rel, gn in constraints])
 
 
 def _admissible_point(guards, env):
@@ -2114,12 +3829,12 @@ def _admissible_point(guards, env):
     never widen the sampled region."""
     nonzero, constraints = guards
     try:
-        for gs, gn in nonzero:
-            if _num_abs(numeric_eval(gs, gn, env)) < _DISTINCT_MARGIN:
+        for _gs, _gn, guard in nonzero:
+            if _num_abs(guard(env)) < _DISTINCT_MARGIN:
                 return False
-        for lhs, rhs, rel, gn in constraints:
-            v1 = numeric_eval(lhs, gn, env)
-            v2 = numeric_eval(rhs, gn, env)
+        for _lhs, _rhs, rel, _gn, lhs_fn, rhs_fn in constraints:
+            v1 = lhs_fn(env)
+            v2 = rhs_fn(env)
             if rel in ('\\ne', '\\neq'):
                 if _num_agree(v1, v2, _DISTINCT_MARGIN) is not False:
                     return False
@@ -2137,9 +3852,9 @@ def _guard_variables(guards):
     not mention must still be sampled, or every point is rejected."""
     nonzero, constraints = guards
     names = set()
-    for gs, gn in nonzero:
+    for gs, gn, _guard in nonzero:
         names |= free_symbols(gs, gn)
-    for lhs, rhs, _rel, gn in constraints:
+    for lhs, rhs, _rel, gn, _lhs_fn, _rhs_fn in constraints:
         names |= free_symbols(lhs, gn) | free_symbols(rhs, gn)
     return names
 
@@ -2150,6 +3865,7 @@ def _sample_budget(samples, guards):
     return samples * (24 if guards[1] else 8)
 
 
+@verdict_cached
 def numeric_spot_check(latex1, latex2, assumptions=None, samples=12,
                        seed=20260705, tol=1e-6):
     """Independently check latex1 == latex2 at random sample points.
@@ -2161,8 +3877,8 @@ def numeric_spot_check(latex1, latex2, assumptions=None, samples=12,
     domain says so. Respects recorded assumptions: sample points
     violating them are skipped."""
     try:
-        s1, n1 = parse_latex(latex1)
-        s2, n2 = parse_latex(latex2)
+        s1, n1 = parse_latex_frozen(latex1)
+        s2, n2 = parse_latex_frozen(latex2)
     except PrimitiveError as e:
         return {'status': 'skipped', 'reason': str(e)}
     guards = _sample_guards(assumptions)
@@ -2176,13 +3892,13 @@ def numeric_spot_check(latex1, latex2, assumptions=None, samples=12,
     mismatches = 0
     mismatch = None
     budget = _sample_budget(samples, guards)
+    stream = _SampleStream(variables, rng, [(s1, n1), (s2, n2)],
+                           samples, budget)
     while agreed < samples and tried < budget:
         tried += 1
-        env = _sample_point(variables, rng)
+        env, ((k1, v1), (k2, v2)) = stream.next()
         if not _admissible_point(guards, env):
             continue
-        k1, v1 = _eval_kind(s1, n1, env)
-        k2, v2 = _eval_kind(s2, n2, env)
         if 'oracle' in (k1, k2):
             continue
         if k1 == 'domain' and k2 == 'domain':
@@ -2198,7 +3914,13 @@ def numeric_spot_check(latex1, latex2, assumptions=None, samples=12,
         if agree is None:
             continue
         if not agree:
-            if not _disagreement_resolves(s1, n1, s2, n2, env, v1, v2):
+            exact = _exact_agree(s1, n1, s2, n2, env)
+            if exact is True:
+                agreed += 1
+                continue
+            if (exact is None
+                    and not _disagreement_resolves(s1, n1, s2, n2,
+                                                   env, v1, v2)):
                 unresolved += 1
                 continue
             return {'status': 'disagree', 'point': env,
@@ -2223,6 +3945,7 @@ def numeric_spot_check(latex1, latex2, assumptions=None, samples=12,
     return result
 
 
+@verdict_cached
 def numeric_relation_check(latex1, latex2, assumptions=None, samples=12,
                            seed=20260727, tol=1e-6):
     """Independently check that two relations hold at exactly the same
@@ -2249,18 +3972,19 @@ def numeric_relation_check(latex1, latex2, assumptions=None, samples=12,
     satisfied = 0
     tried = 0
     budget = _sample_budget(samples, guards)
+    stream = _SampleStream(variables, rng,
+                           [(l1, n1), (r1, n1), (l2, n2), (r2, n2)],
+                           samples, budget)
     while agreed < samples and tried < budget:
         tried += 1
-        env = _sample_point(variables, rng)
+        env, kinds = stream.next()
         if not _admissible_point(guards, env):
             continue
-        try:
-            t1 = _relation_truth(numeric_eval(l1, n1, env),
-                                 numeric_eval(r1, n1, env), rel1, tol)
-            t2 = _relation_truth(numeric_eval(l2, n2, env),
-                                 numeric_eval(r2, n2, env), rel2, tol)
-        except (EvalError, ZeroDivisionError, ValueError, OverflowError):
+        if any(kind is not None for kind, _v in kinds):
             continue
+        (_k, lv1), (_k, rv1), (_k, lv2), (_k, rv2) = kinds
+        t1 = _relation_truth(lv1, rv1, rel1, tol)
+        t2 = _relation_truth(lv2, rv2, rel2, tol)
         if t1 is None or t2 is None:
             continue
         if t1 != t2:
@@ -2281,18 +4005,15 @@ def _union_truths_at(env, tparts, dparts, tol):
     """(target_truth, union_truth) at one point, or None when any side is
     unevaluable or boundary-blurred. Every disjunct must be evaluable — a
     disjunct silently dropping out of the OR would let a junk case ride
-    along unchecked."""
-    tl, tr, trel, tn = tparts
+    along unchecked.  Each side arrives compiled: ``(lhs_fn, rhs_fn, rel)``
+    for the target, a list of those per disjunct."""
+    tl, tr, trel = tparts
     try:
-        t = _relation_truth(numeric_eval(tl, tn, env),
-                            numeric_eval(tr, tn, env), trel, tol)
+        t = _relation_truth(tl(env), tr(env), trel, tol)
         conjunctions = []
         for group in dparts:
-            truths = [
-                _relation_truth(numeric_eval(dl, dn, env),
-                                numeric_eval(dr, dn, env), drel, tol)
-                for dl, dr, drel, dn in group
-            ]
+            truths = [_relation_truth(dl(env), dr(env), drel, tol)
+                      for dl, dr, drel in group]
             if any(truth is None for truth in truths):
                 return None
             conjunctions.append(all(truths))
@@ -2303,26 +4024,37 @@ def _union_truths_at(env, tparts, dparts, tol):
     return t, any(conjunctions)
 
 
-def _simpson_panels(fs, fn, var, a, b, env, n):
-    """One composite-Simpson pass over ``fs`` for ``var`` in [a, b] under
-    ``env``: (value, bad_node).  ``bad_node`` is the first node where the
-    integrand leaves its domain while other nodes evaluate — an
-    x-dependent domain break inside the bounds, a witness rather than
-    ignorance; value None with no bad node is oracle ignorance (an
-    unevaluable draw), never evidence.  Shared oracle infrastructure:
-    the definite-integral evaluation check and the FTC derivative check
-    both integrate through here, neither shares a computation with any
-    symbolic leg."""
-    h = (b - a) / n
+def _node_kinds(fs, fn, var, xs, env):
+    """``_compiled_kind`` of the integrand at every node of ``xs`` (``var``
+    bound to the node over ``env``), in one batched call when the tree
+    and the environment allow it."""
+    batch = compile_batch(fs, fn)
+    if batch is not None and all(v.__class__ in (float, int)
+                                 for v in env.values()):
+        count = len(xs)
+        columns = {k: np.full(count, float(v)) for k, v in env.items()}
+        columns[var] = np.array(xs, float)
+        values, status = batch(columns, count)
+        return [(None, v) if code == _BATCH_OK
+                else (_BATCH_KINDS[code], None)
+                for code, v in zip(status.tolist(), values.tolist())]
+    evaluate = compile_numeric(fs, fn)
+    node_env = dict(env)
+    kinds = []
+    for x in xs:
+        node_env[var] = x
+        kinds.append(_compiled_kind(evaluate, node_env))
+    return kinds
+
+
+def _simpson_sum(xs, kinds, h, n):
+    """The composite-Simpson reduction of ``n`` panels over classified
+    nodes: (value, bad_node), as documented on ``_simpson_panels``."""
     total = 0.0
     evaluated = 0
     domain_break = None
     unknown = False
-    for i in range(n + 1):
-        x = a + i * h
-        node_env = dict(env)
-        node_env[var] = x
-        kind, value = _eval_kind(fs, fn, node_env)
+    for i, (x, (kind, value)) in enumerate(zip(xs, kinds)):
         if kind is None and (isinstance(value, list)
                              or not math.isfinite(value)):
             kind = 'oracle'
@@ -2344,6 +4076,46 @@ def _simpson_panels(fs, fn, var, a, b, env, n):
     return total * h / 3.0, None
 
 
+def _simpson_panels(fs, fn, var, a, b, env, n):
+    """One composite-Simpson pass over ``fs`` for ``var`` in [a, b] under
+    ``env``: (value, bad_node).  ``bad_node`` is the first node where the
+    integrand leaves its domain while other nodes evaluate — an
+    x-dependent domain break inside the bounds, a witness rather than
+    ignorance; value None with no bad node is oracle ignorance (an
+    unevaluable draw), never evidence.  Shared oracle infrastructure:
+    the definite-integral evaluation check and the FTC derivative check
+    both integrate through here, neither shares a computation with any
+    symbolic leg."""
+    h = (b - a) / n
+    xs = [a + i * h for i in range(n + 1)]
+    return _simpson_sum(xs, _node_kinds(fs, fn, var, xs, env), h, n)
+
+
+def _simpson_grids(fs, fn, var, spans, env, n):
+    """The ``n``- and ``2n``-panel Simpson passes over every ``(lo, hi)``
+    of ``spans``, all nodes classified in one batched call:
+    ``[((coarse, bad), (fine, bad))]`` per span.
+
+    Each pair is exactly two ``_simpson_panels`` calls, bit for bit: the
+    coarse nodes ARE the fine grid's even nodes (halving the step and
+    doubling the index round exactly as the coarse ``a + i*h`` does), so
+    only the fine grid is evaluated."""
+    m = 2 * n
+    xs = []
+    for lo, hi in spans:
+        h = (hi - lo) / m
+        xs.extend(lo + j * h for j in range(m + 1))
+    kinds = _node_kinds(fs, fn, var, xs, env)
+    out = []
+    for k, (lo, hi) in enumerate(spans):
+        nodes = xs[k * (m + 1):(k + 1) * (m + 1)]
+        classified = kinds[k * (m + 1):(k + 1) * (m + 1)]
+        out.append((_simpson_sum(nodes[::2], classified[::2],
+                                 (hi - lo) / n, n),
+                    _simpson_sum(nodes, classified, (hi - lo) / m, m)))
+    return out
+
+
 def numeric_definite_check(expr, var, result, samples=4, seed=20260731,
                            panels=64, tol=1e-4):
     """Quadrature leg for a definite-integral evaluation: composite
@@ -2399,6 +4171,8 @@ def numeric_definite_check(expr, var, result, samples=4, seed=20260731,
     params = ((free_symbols(fs, fn) | free_symbols(rs, rn) | bound_syms)
               - {var})
 
+    lower_fn, upper_fn = compile_numeric(ls, ln), compile_numeric(us, un)
+    expected_fn = compile_numeric(rs, rn)
     rng = random.Random(seed)
     rounds = samples if params else 1
     agreed = 0
@@ -2408,8 +4182,8 @@ def numeric_definite_check(expr, var, result, samples=4, seed=20260731,
         env = _sample_point(params, rng) if params else {}
         if bound_syms:
             try:
-                a = numeric_eval(ls, ln, env)
-                b = numeric_eval(us, un, env)
+                a = lower_fn(env)
+                b = upper_fn(env)
             except (EvalError, ValueError, ZeroDivisionError,
                     OverflowError):
                 continue
@@ -2437,7 +4211,7 @@ def numeric_definite_check(expr, var, result, samples=4, seed=20260731,
                     'reason': reason}
 
         try:
-            expected = numeric_eval(rs, rn, env)
+            expected = expected_fn(env)
         except (EvalError, ValueError, ZeroDivisionError, OverflowError):
             expected = None
         if (expected is None or isinstance(expected, list)
@@ -2447,12 +4221,12 @@ def numeric_definite_check(expr, var, result, samples=4, seed=20260731,
                 if bad is not None:
                     return break_refusal(bad)
             continue
-        coarse, bad = simpson(env, panels)
+        (coarse, bad), (fine, _bad) = _simpson_grids(
+            fs, fn, var, [(a, b)], env, panels)[0]
         if bad is not None:
             if bound_syms:
                 continue
             return break_refusal(bad)
-        fine, bad = simpson(env, panels * 2)
         if coarse is None or fine is None:
             continue
         err_est = abs(fine - coarse) / 15.0   # Simpson is O(h^4)
@@ -2584,18 +4358,18 @@ def numeric_improper_check(expr, var, side, result, samples=4,
         deltas = [span * 1e-2 * 10.0 ** (-k) for k in range(rungs)]
     params = (free_symbols(fs, fn) | free_symbols(rs, rn)) - {var}
 
-    def piece(lo, hi, env):
-        """(fine value, richardson error, bad node) for one region."""
+    def pieces(regions, env):
+        """(fine value, richardson error, bad node) per region, every
+        region's nodes classified in one batched pass."""
         with _overflow_saturation():
-            coarse, bad = _simpson_panels(fs, fn, var, lo, hi, env,
-                                          panels)
+            grids = _simpson_grids(fs, fn, var, regions, env, panels)
+        for (coarse, bad), (fine, bad2) in grids:
             if coarse is None:
-                return None, None, bad
-            fine, bad = _simpson_panels(fs, fn, var, lo, hi, env,
-                                        panels * 2)
-        if fine is None:
-            return None, None, bad
-        return fine, abs(fine - coarse) / 15.0, None
+                yield None, None, bad
+            elif fine is None:
+                yield None, None, bad2
+            else:
+                yield fine, abs(fine - coarse) / 15.0, None
 
     def singular_ladder(env):
         """(rung values, accumulated quadrature error, bad node)."""
@@ -2610,8 +4384,7 @@ def numeric_improper_check(expr, var, side, result, samples=4,
         vals = []
         total = 0.0
         err = 0.0
-        for lo, hi in regions:
-            value, piece_err, bad = piece(lo, hi, env)
+        for value, piece_err, bad in pieces(regions, env):
             if value is None:
                 return None, None, bad
             total += value
@@ -2622,21 +4395,20 @@ def numeric_improper_check(expr, var, side, result, samples=4,
     def infinite_ladder(env):
         """(rung values, accumulated quadrature error, None) — each rung
         a full graded quadrature to a decade-farther truncation point."""
-        vals = []
+        rungs_at = [(a, t) if side == 'upper' else (-t, b)
+                    for t in ladder_ts]
+        try:
+            vals = _graded_quadratures(fs, fn, var, rungs_at, env)
+        except (EvalError, ValueError, ZeroDivisionError, OverflowError):
+            return None, None, None
         err = 0.0
-        for t in ladder_ts:
-            lo, hi = (a, t) if side == 'upper' else (-t, b)
-            try:
-                value = _graded_quadrature(fs, fn, var, lo, hi, env)
-            except (EvalError, ValueError, ZeroDivisionError,
-                    OverflowError):
-                return None, None, None
-            vals.append(value)
+        for value in vals:
             err += 1e-6 * max(1.0, abs(value))
         return vals, err, None
 
     rng = random.Random(seed)
     rounds = samples if params else 1
+    expected_fn = compile_numeric(rs, rn)
     agreed = 0
     tried = 0
     last_reason = 'no evaluable sample points'
@@ -2644,7 +4416,7 @@ def numeric_improper_check(expr, var, side, result, samples=4,
         tried += 1
         env = _sample_point(params, rng) if params else {}
         try:
-            expected = numeric_eval(rs, rn, env)
+            expected = expected_fn(env)
         except (EvalError, ValueError, ZeroDivisionError, OverflowError):
             continue
         if isinstance(expected, list) or not math.isfinite(expected):
@@ -2851,6 +4623,7 @@ def numeric_known_integral_check(expr, var, result, assumptions=None,
     rng = random.Random(seed)
     rounds = samples if variables else 1
     budget = _sample_budget(rounds, guards)
+    expected_fn = compile_numeric(rs, rn)
     agreed = 0
     tried = 0
     last_reason = 'no evaluable sample points'
@@ -2860,7 +4633,7 @@ def numeric_known_integral_check(expr, var, result, assumptions=None,
         if not _admissible_point(guards, env):
             continue
         try:
-            expected = numeric_eval(rs, rn, env)
+            expected = expected_fn(env)
         except (EvalError, ValueError, ZeroDivisionError, OverflowError):
             continue
         if isinstance(expected, list) or not math.isfinite(expected):
@@ -2929,6 +4702,10 @@ def numeric_union_check(target, disjuncts, samples=12, seed=20260730,
     for group in dparts:
         for dl, dr, _drel, dn in group:
             variables |= free_symbols(dl, dn) | free_symbols(dr, dn)
+    # lowered once: the sweep alone reads every side ~600 times
+    tparts = (compile_numeric(tl, tn), compile_numeric(tr, tn), trel)
+    dparts = [[(compile_numeric(dl, dn), compile_numeric(dr, dn), drel)
+               for dl, dr, drel, dn in group] for group in dparts]
     agreed = 0
     holding = 0
     if len(variables) == 1:
@@ -666,10 +666,18 @@ class MathProcessor(object):
         if max_expansion_terms <= 0:
             raise ValueError('classic expansion term budget must be positive')
         self.trace = None
-        self.actions = register_actions()
+        self._actions = None
         self.max_iterations = max_iterations
         self.max_expansion_terms = max_expansion_terms
 
+    @property
+    def actions(self):
+        """The cmd_*.py actions, discovered on the first evaluation rather
+        than when the shell is built."""
+        if self._actions is None:
+            self._actions = register_actions()
+        return self._actions
+
     # create True in Notation
     @staticmethod
     def create_true(notation):
@@ -719,13 +727,23 @@ class MathProcessor(object):
         return outs, output_notation
 
 
-def register_actions(*actions):
-    paths = [os.path.join(os.path.dirname(os.path.abspath(__file__)))]
+_ACTION_FILES = None
+
 
-    action_files = []
-    for action_dir in paths:
-        sys.path.append(action_dir)
-        action_files.extend(glob.glob(os.path.join(action_dir, "cmd_*.py")))
+def _action_files():
+    """The cmd_*.py files beside this module, globbed once per process."""
+    global _ACTION_FILES
+    if _ACTION_FILES is None:
+        action_dir = os.path.dirname(os.path.abspath(__file__))
+        if action_dir not in sys.path:
+            sys.path.append(action_dir)
+        _ACTION_FILES = sorted(
+            glob.glob(os.path.join(action_dir, "cmd_*.py")))
+    return _ACTION_FILES
+
+
+def register_actions(*actions):
+    action_files = _action_files()
 
     res = {}
     for action in action_files:
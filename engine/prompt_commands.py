@@ -27,7 +27,6 @@ import os
 import re
 from collections import namedtuple
 
-import yaml
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +65,11 @@ def _split_frontmatter(text):
     end = text.find('\n---', 3)
     if end == -1:
         raise ValueError('unterminated YAML frontmatter (no closing ---)')
-    meta = yaml.safe_load(text[3:end]) or {}
+    import yaml  # deferred: only command discovery parses YAML
+    try:
+        meta = yaml.safe_load(text[3:end]) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f'invalid YAML frontmatter: {e}') from e
     if not isinstance(meta, dict):
         raise ValueError('frontmatter is not a mapping')
     body = text[end + len('\n---'):].lstrip('\n')
@@ -180,7 +183,7 @@ def load_commands(directory=_COMMANDS_DIR):
         try:
             with open(path, 'r', encoding='utf-8') as fh:
                 cmd = parse_command(fh.read(), stem)
-        except (OSError, ValueError, yaml.YAMLError) as e:
+        except (OSError, ValueError) as e:
             logger.warning('skipping command file %s: %s', path, e)
             continue
         registry[cmd.name] = cmd
@@ -327,7 +327,7 @@ class Replicator(object):
             outf = self.output_notation.getf(outsym, f.sym)
             if outf is not None:
                 outlist += outf.args
-                del self.output_notation.rel[outsym]
+                self.output_notation.remove(outsym)
             else:
                 outlist.append(outsym)
         return outlist
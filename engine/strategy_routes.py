@@ -37,18 +37,14 @@ uses the parser for exactly what the parser can see.
 import os
 import re
 
-try:
-    import yaml
-except ImportError:  # pragma: no cover - yaml ships with the kernel env
-    yaml = None
-
 import cell_input
 import primitives
 import tactic_registry
 from notation import Notation
 
 __all__ = ['StrategyRouteError', 'FEATURES', 'CONTROLS', 'ROUTES_PATH',
-           'load', 'features', 'match', 'render', 'validate', 'fixtures']
+           'load', 'features', 'compile_routes', 'match', 'render',
+           'validate', 'fixtures']
 
 ROUTES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
                            'strategy_routes.yaml')
@@ -241,9 +237,8 @@ def _parameter_constraints(text):
     return count
 
 
-def features(text):
-    """The typed feature vector of one instruction."""
-    text = text or ''
+def _shape_features(text):
+    """The features one pass over the flattened command text yields."""
     flat = _flatten_alignment(text)
     indefinite, definite = _integral_kinds(flat)
     shifted = 0
@@ -260,12 +255,54 @@ def features(text):
         'indefinite_integral_count': indefinite,
         'definite_integral_count': definite,
         'shifted_integral_count': shifted,
-        'parameter_constraint_count': _parameter_constraints(text),
         'relation_has_explicit_nonintegral_term': mixed,
-        'asks_for_symbols': _asked_symbols(text),
     }
 
 
+def _ask_features(text):
+    return {'asks_for_symbols': _asked_symbols(text)}
+
+
+def _constraint_features(text):
+    return {'parameter_constraint_count': _parameter_constraints(text)}
+
+
+# feature -> the extractor that computes it (with its siblings), listed
+# cheapest first: the regex scans before the parser leg, so a compiled
+# matcher that has already refused every route never parses at all.
+_EXTRACTORS = {
+    'indefinite_integral_count': _shape_features,
+    'definite_integral_count': _shape_features,
+    'shifted_integral_count': _shape_features,
+    'relation_has_explicit_nonintegral_term': _shape_features,
+    'asks_for_symbols': _ask_features,
+    'parameter_constraint_count': _constraint_features,
+}
+
+# instruction text -> the features extracted from it so far. A kernel that
+# previews every keystroke asks about the same few texts over and over;
+# the oldest entry goes once the memo is full.
+_VECTORS = {}
+_VECTORS_LIMIT = 256
+
+
+def _feature(text, name):
+    known = _VECTORS.get(text)
+    if known is None:
+        while len(_VECTORS) >= _VECTORS_LIMIT:
+            _VECTORS.pop(next(iter(_VECTORS)), None)
+        known = _VECTORS[text] = {}
+    if name not in known:
+        known.update(_EXTRACTORS[name](text))
+    return known[name]
+
+
+def features(text):
+    """The typed feature vector of one instruction."""
+    text = text or ''
+    return {name: _feature(text, name) for name in _EXTRACTORS}
+
+
 # ---------------------------------------------------------------------------
 # schema
 # ---------------------------------------------------------------------------
@@ -436,23 +473,52 @@ def _validate_document(document):
     return document
 
 
+# path -> (mtime, validated document, compiled matcher): each file version
+# is parsed, validated and compiled once per process
 _CACHE = {}
 
 
-def load(path=ROUTES_PATH):
-    """Parse and schema-validate the committed route file."""
+def _read_yaml(path):
+    """The YAML document at `path`, or None without PyYAML. Imported on
+    first use — only do! reads routes — and parsed through libyaml when
+    PyYAML was built with it."""
+    try:
+        import yaml
+    except ImportError:  # pragma: no cover - yaml ships with the kernel env
+        return None
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as handle:
+        return yaml.load(handle, Loader=loader) or {}
+
+
+def _compiled(path):
+    """(validated document, compiled matcher) for the file at `path`, or
+    None when it is absent or yaml is unavailable."""
     key = os.path.abspath(path)
     stamp = os.path.getmtime(key) if os.path.exists(key) else None
     cached = _CACHE.get(key)
     if cached is not None and cached[0] == stamp:
-        return cached[1]
-    if stamp is None or yaml is None:
-        return ()
-    with open(key, 'r', encoding='utf-8') as handle:
-        document = _validate_document(yaml.safe_load(handle) or {})
-    routes = tuple(document.get('routes') or ())
-    _CACHE[key] = (stamp, routes)
-    return routes
+        return cached[1:]
+    if stamp is None:
+        return None
+    document = _read_yaml(key)
+    if document is None:
+        return None
+    document = _validate_document(document)
+    matcher = compile_routes(document.get('routes') or ())
+    _CACHE[key] = (stamp, document, matcher)
+    return document, matcher
+
+
+def _document(path):
+    compiled = _compiled(path)
+    return None if compiled is None else compiled[0]
+
+
+def load(path=ROUTES_PATH):
+    """Parse and schema-validate the committed route file."""
+    compiled = _compiled(path)
+    return () if compiled is None else compiled[1].routes
 
 
 def fixtures(path=ROUTES_PATH):
@@ -462,10 +528,14 @@ def fixtures(path=ROUTES_PATH):
     reference to a notebook cell: notebooks are user-modified and a cell
     index drifts.
     """
-    if yaml is None or not os.path.exists(path):
+    if not os.path.exists(path):
         return {}
-    with open(path, 'r', encoding='utf-8') as handle:
-        return (yaml.safe_load(handle) or {}).get('fixtures') or {}
+    try:
+        document = _document(path)
+    except StrategyRouteError:
+        # the corpus stays readable while a route in the file is broken
+        document = _read_yaml(path)
+    return ((document or {}).get('fixtures') or {})
 
 
 def validate(path=ROUTES_PATH):
@@ -500,6 +570,61 @@ def matches(route, vector):
                for predicate in route['match']['all'])
 
 
+def _test(predicate):
+    """One validated predicate as a test on its feature's value."""
+    kind = FEATURES[predicate['feature']]
+    if kind == 'count':
+        low = max(predicate.get('min', float('-inf')),
+                  predicate.get('equals', float('-inf')))
+        high = min(predicate.get('max', float('inf')),
+                   predicate.get('equals', float('inf')))
+        return lambda value: low <= value <= high
+    if kind == 'flag':
+        wanted = predicate.get('is', True)
+        return lambda value: bool(value) is wanted
+    needed = frozenset(predicate['symbols'])
+    return lambda value: needed <= value
+
+
+class _RouteMatcher:
+    """Routes indexed by the features their predicates test.
+
+    Features are extracted lazily in `_EXTRACTORS` order and each one only
+    re-checks the routes that test it; extraction stops as soon as no
+    route is left standing, so an instruction that fails the cheap integral
+    counts never reaches the parser leg.
+    """
+
+    def __init__(self, routes):
+        self.routes = tuple(routes)
+        tests = {}
+        for position, route in enumerate(self.routes):
+            for predicate in route['match']['all']:
+                tests.setdefault(predicate['feature'], []).append(
+                    (position, _test(predicate)))
+        self.tests = tuple((name, tuple(tests[name]))
+                           for name in _EXTRACTORS if name in tests)
+
+    def __call__(self, text):
+        text = text or ''
+        standing = set(range(len(self.routes)))
+        for name, tests in self.tests:
+            if not standing:
+                return ()
+            value = _feature(text, name)
+            standing.difference_update(
+                position for position, test in tests
+                if position in standing and not test(value))
+        return tuple(self.routes[position] for position in sorted(standing))
+
+
+def compile_routes(routes):
+    """A matcher for validated records: called with an instruction it
+    returns the records that fire, in file order, exactly as `matches`
+    would decide them one by one."""
+    return _RouteMatcher(routes)
+
+
 def match(text, routes=None, path=ROUTES_PATH):
     """The records whose shape matcher fires on this instruction.
 
@@ -508,11 +633,10 @@ def match(text, routes=None, path=ROUTES_PATH):
     able to take a derivation down.
     """
     try:
-        routes = load(path) if routes is None else routes
-        if not routes:
-            return ()
-        vector = features(text)
-        return tuple(route for route in routes if matches(route, vector))
+        if routes is None:
+            compiled = _compiled(path)
+            return () if compiled is None else compiled[1](text)
+        return compile_routes(routes)(text) if routes else ()
     except Exception:
         return ()
 
@@ -6,17 +6,51 @@ The primitive implementation, CLI, do! agent, and ledger replay all consume
 this allowlist.  Markdown skills explain *when* to choose a tactic; this
 module defines *how* it is invoked and replayed.
 """
+import importlib
 from dataclasses import dataclass
 from typing import Any, Callable
 
 import primitives
-from tactics import core
-from tactics import differentiation
-from tactics import equations
-from tactics import finite_operators
-from tactics import integration
-from tactics import limits
-from tactics import matrices
+
+
+class _LazyFunction(object):
+    """A subject-module function named when the registry is built and
+    imported when it is first called."""
+
+    def __init__(self, module, name):
+        self.__module__ = module
+        self.__name__ = name
+
+    def __call__(self, *args, **kwargs):
+        function = getattr(importlib.import_module(self.__module__),
+                           self.__name__)
+        return function(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<tactic {self.__module__}.{self.__name__}>'
+
+
+class _LazyModule(object):
+    """Stands in for a tactics subject module: the specs and handlers below
+    name its functions, and the module itself loads on the first call, so
+    listing, describing or parsing tactics imports none of them."""
+
+    def __init__(self, name):
+        self.__name__ = name
+
+    def __getattr__(self, attr):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        return _LazyFunction(self.__name__, attr)
+
+
+core = _LazyModule('tactics.core')
+differentiation = _LazyModule('tactics.differentiation')
+equations = _LazyModule('tactics.equations')
+finite_operators = _LazyModule('tactics.finite_operators')
+integration = _LazyModule('tactics.integration')
+limits = _LazyModule('tactics.limits')
+matrices = _LazyModule('tactics.matrices')
 
 
 _MISSING = object()
@@ -852,7 +886,11 @@ TACTICS = (
                      'e.g. "x > 0"', default=None, option='--assuming')),
                transforming=False),
     TacticSpec('lemmas', 'lemmas', 'core',
-               'list registered rewrite lemmas', core.list_lemmas,
+               'list registered rewrite lemmas, or only those that apply '
+               'somewhere in an expression', core.list_lemmas,
+               (_arg('expr', 'EXPR', 'list only the lemmas that match a '
+                     'subterm of this expression', default=None,
+                     option='--expr'),),
                transforming=False),
 
     TacticSpec('diff', 'differentiate', 'differentiation',
@@ -1372,6 +1410,93 @@ def invoke_cli(name, values, context=None):
     return result
 
 
+BATCH_PREVIOUS = '@prev'
+
+
+class _BatchStop(Exception):
+    """Unwinds a batch's ledger transaction at its first failed call."""
+
+    def __init__(self, record):
+        Exception.__init__(self, record.get('error'))
+        self.record = record
+
+
+def _batch_argument(value, results):
+    """Resolve one pipeline placeholder: ``@prev`` is the previous call's
+    result, ``@N`` the N-th call's (1-based); anything else is literal."""
+    if not isinstance(value, str) or not value.startswith('@'):
+        return value
+    if value == BATCH_PREVIOUS:
+        index = len(results)
+    elif value[1:].isdigit():
+        index = int(value[1:])
+    else:
+        return value
+    if not 1 <= index <= len(results):
+        raise ValueError(f'{value} names no earlier call')
+    if results[index - 1] is None:
+        raise ValueError(f'{value}: call {index} has no result to pipe')
+    return results[index - 1]
+
+
+def invoke_batch(calls, context, require_loaded=True):
+    """Invoke an ordered pipeline of tactics as one ledger transaction.
+
+    ``calls`` is a list of ``[tactic, arg, ...]`` lists (or ``(tactic,
+    arguments)`` pairs); an argument ``@prev`` or ``@N`` is replaced by the
+    result of the previous or N-th call. Each call goes through
+    `invoke_agent`, so it is checked and recorded exactly as one
+    `run_tactic` would be, but the batch stops at the first failed call
+    and then records nothing. ``context`` needs ``transaction()``
+    besides what `invoke_agent` uses.
+    """
+    if not isinstance(calls, (list, tuple)) or not calls:
+        return _error('batch', 'calls must be a non-empty ordered list of '
+                      '[tactic, arguments...]')
+    records = []
+    results = []
+    try:
+        with context.transaction():
+            for index, call in enumerate(calls, 1):
+                if (isinstance(call, (list, tuple)) and len(call) == 2
+                        and isinstance(call[1], (list, tuple))):
+                    name, argv = call[0], list(call[1])
+                elif isinstance(call, (list, tuple)) and call:
+                    name, argv = call[0], list(call[1:])
+                else:
+                    raise _BatchStop(_error(
+                        'batch', f'call {index} is not [tactic, '
+                        'arguments...]'))
+                try:
+                    argv = [_batch_argument(value, results)
+                            for value in argv]
+                except ValueError as exc:
+                    raise _BatchStop(_error(name, str(exc)))
+                result = invoke_agent(name, argv, context, require_loaded)
+                if not result.get('ok'):
+                    raise _BatchStop(result)
+                records.append(result)
+                results.append(result.get('result'))
+    except _BatchStop as stop:
+        failed = len(records) + 1
+        return {
+            'ok': False, 'op': 'batch', 'failed': failed,
+            'error': f'call {failed} ({stop.record.get("op")}): '
+                     f'{stop.record.get("error")}; nothing was recorded',
+            'records': [{key: value for key, value in record.items()
+                         if key != 'step'} for record in records]
+                       + [stop.record],
+        }
+    steps = [record['step'] for record in records if 'step' in record]
+    return {
+        'ok': True, 'op': 'batch',
+        'input': records[0].get('input'),
+        'result': results[-1],
+        'steps': steps,
+        'records': records,
+    }
+
+
 def replay(op, args):
     """Replay a recorded operation through the same allowlisted registry."""
     spec = BY_OP.get(op)
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """Core algebra, checking, rewrite, and factoring tactics."""
+import hashlib
+import json
 import math
+import os
+import pickle
 import random
 import re
+import stat
+import tempfile
 from fractions import Fraction
 from itertools import combinations
 
@@ -21,10 +27,11 @@ from polyrat import (Poly, NotInFragment, to_ratfunc,
 
 from primitives import (
     FRAC_NAMES, _UNARY_TABLE, PrimitiveError, EvalError,
-    parse_latex, write_latex,
+    parse_latex, parse_latex_frozen, write_latex,
     _write_std, _GroupStripper, _big_operator_name, _bound_symbols,
     _contains_free_infinity, _subscript_var, free_symbols,
-    _num_agree, numeric_eval, _func_power, _func_arg_span, _sample_point,
+    _num_agree, numeric_eval, compile_numeric, _func_power, _func_arg_span,
+    _sample_point,
     numeric_spot_check, numeric_relation_check, Substitutor, _result, _error,
     _paren, _is_sum_str, same_expression,
 )
@@ -435,6 +442,8 @@ def _substitute_check(expr, result, var, value, samples=8, seed=20260705):
                               write_latex(sp2[1], n2), var, value))
     variables = (free_symbols(s1, n1) | free_symbols(s2, n2)
                  | free_symbols(vs, vn)) - {var}
+    value_fn = compile_numeric(vs, vn)
+    f1, f2 = compile_numeric(s1, n1), compile_numeric(s2, n2)
     rng = random.Random(seed)
     agreed = 0
     tried = 0
@@ -442,10 +451,10 @@ def _substitute_check(expr, result, var, value, samples=8, seed=20260705):
         tried += 1
         env = _sample_point(variables, rng)
         try:
-            env[var] = numeric_eval(vs, vn, env)
-            v1 = numeric_eval(s1, n1, env)
+            env[var] = value_fn(env)
+            v1 = f1(env)
             del env[var]
-            v2 = numeric_eval(s2, n2, env)
+            v2 = f2(env)
         except (EvalError, ZeroDivisionError, ValueError, OverflowError):
             continue
         agree = _num_agree(v1, v2, 1e-6)
@@ -919,7 +928,7 @@ class _AtomStore(object):
             sym, notation, canonical_n)
         latex = _write_std(canonical_s, canonical_n)
         try:
-            s2, n2 = parse_latex(latex)
+            s2, n2 = parse_latex_frozen(latex)
             out = Notation()
             key = _write_std(
                 _GroupStripper(n2, out, all_brackets=True)(s2), out)
@@ -1889,10 +1898,58 @@ class Lemma(object):
         self.description = description
 
 
-LEMMAS = {}
+class _LemmaTable(dict):
+    """The lemma registry: a dict that counts its own changes, so the
+    pattern index can tell it is stale without rescanning every entry."""
+
+    version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changed()
+
+    def pop(self, *args):
+        self._changed()
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._changed()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        dict.clear(self)
+        self._changed()
+
+
+LEMMAS = _LemmaTable()
+
+# set once the module is loaded: the committed lemma packs are registered
+# on first use of the table, not at import
+_PACKS_PENDING = False
+
+
+def _committed_packs():
+    if _PACKS_PENDING:
+        _load_committed_packs()
 
 
 def register_lemma(name, lhs, rhs, params, description=''):
+    _committed_packs()
     LEMMAS[name] = Lemma(name, lhs, rhs, params, description)
 
 
@@ -1927,11 +1984,35 @@ register_lemma('cos_double', '\\cos 2a', '\\cos^2 a - \\sin^2 a',
                ['a'], 'cosine double angle')
 
 
-def list_lemmas():
-    return {'ok': True, 'op': 'lemmas',
-            'lemmas': [{'name': l.name, 'lhs': l.lhs, 'rhs': l.rhs,
-                        'description': l.description}
-                       for l in LEMMAS.values()]}
+def list_lemmas(expr=None):
+    """The registered lemmas; with `expr`, only those that match somewhere
+    in it, each with the direction(s) it applies in and where."""
+    _committed_packs()
+    lemmas = [{'name': l.name, 'lhs': l.lhs, 'rhs': l.rhs,
+               'description': l.description} for l in LEMMAS.values()]
+    if expr is None:
+        return {'ok': True, 'op': 'lemmas', 'lemmas': lemmas}
+    args = {'expr': expr}
+    try:
+        sym, notation = parse_latex(expr)
+    except PrimitiveError as e:
+        return _error('lemmas', args, str(e))
+    sym, notation = _normalize_powered_heads(sym, notation)
+    found = _LEMMA_INDEX.applicable(sym, notation)
+    applicable = []
+    for entry in lemmas:
+        for direction in ('forward', 'backward'):
+            nodes = found.get((entry['name'], direction))
+            if not nodes:
+                continue
+            at = []
+            for node in nodes:
+                latex = write_latex(node, notation)
+                if latex not in at:
+                    at.append(latex)
+            applicable.append(dict(entry, direction=direction, at=at))
+    return {'ok': True, 'op': 'lemmas', 'input': expr,
+            'lemmas': applicable}
 
 
 def _int_nth_root(k, n):
@@ -2063,6 +2144,395 @@ def _lemma_power_variants(src, params):
     return variants
 
 
+# ---------------------------------------------------------------------------
+# lemma pattern index
+#
+# A pattern can only match a node with the same head after `{}` groups are
+# stripped (and, for a sum or product, the same number of operands), and only
+# one whose subtree contains every constant leaf the pattern names: \sin,
+# \cos, \ln. The index buckets compiled patterns by that head, so a subterm
+# is handed to the matcher only for the lemmas whose top-level structure and
+# vocabulary can match it.
+# ---------------------------------------------------------------------------
+
+_LIST_HEADS = (Notation.S_LIST, Notation.P_LIST)
+
+
+def _pattern_head(sym, notation, pattern=False):
+    """(head, operand count) of a node with its `{}` groups stripped; the
+    count is None for a head whose operands are not counted, or for a
+    pattern sum/product that spells `...`. None for a leaf."""
+    sym, _ = comparer.unquote(sym, notation, None)
+    if not isinstance(sym, Symbol):
+        return None
+    f = notation.get(sym)
+    if f is None:
+        return None
+    if f.sym not in _LIST_HEADS:
+        return (f.sym, None)
+    operands = [a for a in f.args if a not in Notation.styles]
+    if pattern and any(comparer.dot3(a, notation) for a in operands):
+        return (f.sym, None)         # `...` matches a run of any length
+    return (f.sym, len(operands))
+
+
+def _leaf_names(sym, notation, memo):
+    """Names of the leaf symbols under `sym`, memoized per node."""
+    if isinstance(sym, (list, tuple)):
+        names = set()
+        for item in sym:
+            if item is not None:
+                names |= _leaf_names(item, notation, memo)
+        return frozenset(names)
+    if not isinstance(sym, Symbol):
+        return frozenset()
+    names = memo.get(sym)
+    if names is None:
+        f = notation.get(sym)
+        names = (frozenset((sym.name,)) if f is None
+                 else _leaf_names(f.args, notation, memo))
+        memo[sym] = names
+    return names
+
+
+class _LemmaPattern(object):
+    """One matchable spelling of a lemma side: the written pattern, or a
+    perfect-power variant of it (see `_lemma_power_variants`)."""
+
+    def __init__(self, lemma, direction, stage, src, params, powermap):
+        self.lemma = lemma
+        self.direction = direction
+        self.stage = stage
+        self.powermap = powermap
+        self.comparer = _normalized_pattern(
+            src, [(p, NotationParam.Any) for p in params])
+        pat_sym, pat_notation = self.comparer.sym, self.comparer.notation
+        self.head = _pattern_head(pat_sym, pat_notation, pattern=True)
+        wild = {p.name for p in self.comparer.params}
+        ignored = wild | {Notation.DOT3.name} | {
+            style.name for style in Notation.styles
+            if isinstance(style, Symbol)}
+        self.atoms = _leaf_names(pat_sym, pat_notation, {}) - ignored
+
+    def match(self, node, notation):
+        """(binding, perfect-power roots) at `node`, or None. Wildcards
+        from the power map must bind perfect n-th power monomials, whose
+        roots come back bound to the original lemma parameter."""
+        s = self.comparer.match(node, notation)
+        if s is None:
+            return None
+        bound = {}
+        for wild, (orig, n) in self.powermap.items():
+            if wild not in s:
+                return None
+            root = _perfect_power_root(s[wild], notation, n)
+            if root is None:
+                return None
+            bound[orig] = root
+        return s, bound
+
+
+class _NodeShapes(object):
+    """The index keys of one expression's nodes, computed on demand."""
+
+    def __init__(self, notation):
+        self.notation = notation
+        self._heads = {}
+        self._leaves = {}
+
+    def head(self, node):
+        if node not in self._heads:
+            self._heads[node] = _pattern_head(node, self.notation)
+        return self._heads[node]
+
+    def admits(self, pattern, node):
+        if pattern.head is not None:
+            head = self.head(node)
+            if head is None or head[0] != pattern.head[0]:
+                return False
+            if pattern.head[1] is not None and pattern.head[1] != head[1]:
+                return False
+        return pattern.atoms <= _leaf_names(node, self.notation,
+                                            self._leaves)
+
+
+class _LemmaIndex(object):
+    """Compiled lemma patterns, bucketed by head.
+
+    Each lemma side is parsed once — with its perfect-power variants — the
+    first time the index is used after the lemma is registered; `LEMMAS`
+    stays the source of truth, and a change to it rebuilds the buckets
+    from the compiled sides that are still registered.
+    """
+
+    def __init__(self):
+        self._compiled = {}          # (name, direction) -> (lemma, stages)
+        self._buckets = {}
+        self._version = None
+
+    @staticmethod
+    def compile(lemma, direction):
+        src = lemma.lhs if direction == 'forward' else lemma.rhs
+        stages = [_LemmaPattern(lemma, direction, 0, src, lemma.params, {})]
+        for v_i, (v_src, v_params, v_map) in enumerate(
+                _lemma_power_variants(src, lemma.params)):
+            stages.append(_LemmaPattern(lemma, direction, v_i + 1, v_src,
+                                        v_params, v_map))
+        return stages
+
+    def seed(self, lemma, direction, stages):
+        """Adopt sides compiled elsewhere — a lemma pack's cache."""
+        self._compiled[(lemma.name, direction)] = (lemma, stages)
+
+    def stages(self, lemma, direction):
+        """The patterns `rewrite` tries for one lemma side, in stage
+        order: the written pattern, then its variants."""
+        key = (lemma.name, direction)
+        cached = self._compiled.get(key)
+        if cached is not None and cached[0] is lemma:
+            return cached[1]
+        stages = self.compile(lemma, direction)
+        self._compiled[key] = (lemma, stages)
+        return stages
+
+    def _refresh(self):
+        _committed_packs()
+        if self._version == LEMMAS.version:
+            return
+        buckets = {}
+        for lemma in LEMMAS.values():
+            for direction in ('forward', 'backward'):
+                for pattern in self.stages(lemma, direction):
+                    buckets.setdefault(pattern.head, []).append(pattern)
+        self._compiled = {key: value for key, value in self._compiled.items()
+                          if LEMMAS.get(key[0]) is value[0]}
+        self._buckets = buckets
+        self._version = LEMMAS.version
+
+    def candidates(self, head):
+        """Patterns that may match a node with this head."""
+        self._refresh()
+        found = list(self._buckets.get(None, ()))
+        if head is not None:
+            found += self._buckets.get(head, ())
+            if head[1] is not None:
+                found += self._buckets.get((head[0], None), ())
+        return found
+
+    def applicable(self, sym, notation):
+        """{(lemma name, direction): [matched nodes]} over the whole
+        expression, in one pass: root first, then subterms in parse
+        order."""
+        shapes = _NodeShapes(notation)
+        found = {}
+        for node in [sym] + [n for n in notation.rel if n != sym]:
+            for pattern in self.candidates(shapes.head(node)):
+                if not shapes.admits(pattern, node):
+                    continue
+                key = (pattern.lemma.name, pattern.direction)
+                if node in found.get(key, ()):
+                    continue
+                if pattern.match(node, notation) is not None:
+                    found.setdefault(key, []).append(node)
+        return found
+
+
+_LEMMA_INDEX = _LemmaIndex()
+
+
+# ---------------------------------------------------------------------------
+# lemma packs
+#
+# A pack is a YAML or JSON file of lemmas in the register_lemma shape:
+#
+#   version: 1
+#   lemmas:
+#   - {name: sin_sum, lhs: '\sin(a+b)', rhs: '...', params: [a, b],
+#      description: sine of a sum}
+#
+# Its compiled sides — parsed, powered-head normalized, with their perfect
+# power variants — are pickled under a key covering the pack's bytes and the
+# sources that parse and match patterns, so a warm load reads no YAML and
+# parses no LaTeX, and an edit to either side of the key recompiles. The
+# committed packs register on first use of the lemma table, so importing the
+# tactics touches no cache directory.
+# ---------------------------------------------------------------------------
+
+LEMMA_PACKS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lemmas')
+
+_PACK_SOURCES = ('lexer.py', 'LatexParser.py', 'parsetab.py', 'notation.py',
+                 'value.py', 'comparer.py', 'primitives.py',
+                 os.path.join('tactics', 'core.py'))
+_PACK_FINGERPRINT = None
+
+
+class LemmaPackError(ValueError):
+    """A lemma pack that does not satisfy the schema."""
+
+
+def _pack_fingerprint():
+    global _PACK_FINGERPRINT
+    if _PACK_FINGERPRINT is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        h = hashlib.sha256()
+        for name in _PACK_SOURCES:
+            with open(os.path.join(root, name), 'rb') as fh:
+                h.update(fh.read())
+        _PACK_FINGERPRINT = h.hexdigest()
+    return _PACK_FINGERPRINT
+
+
+def lemma_cache_dir():
+    return os.environ.get('TOYMATH_LEMMA_CACHE') or os.path.join(
+        os.path.expanduser('~'), '.toymath', 'lemma-cache')
+
+
+def _private_dir(folder):
+    """True when `folder` is ours and nobody else can write into it: a
+    cached pack is a pickle, and unpickling runs code, so only a directory
+    no one else controls may feed one."""
+    try:
+        st = os.stat(folder)
+    except OSError:
+        return False
+    getuid = getattr(os, 'getuid', None)
+    return (stat.S_ISDIR(st.st_mode) and not st.st_mode & 0o022
+            and (getuid is None or st.st_uid == getuid()))
+
+
+def _read_pack(path, data):
+    """The validated lemma entries of a pack's bytes."""
+    json_pack = path.endswith('.json')
+    if not json_pack:
+        import yaml             # optional: a JSON pack needs nothing more
+    try:
+        document = (json.loads(data.decode('utf-8')) if json_pack
+                    else yaml.safe_load(data))
+    except Exception as e:              # ValueError or yaml.YAMLError
+        raise LemmaPackError(f'{path}: {e}') from e
+    if not isinstance(document, dict) or document.get('version') != 1:
+        raise LemmaPackError(f'{path}: a pack is a map with version: 1')
+    entries = document.get('lemmas')
+    if not isinstance(entries, list):
+        raise LemmaPackError(f'{path}: a pack needs a lemmas list')
+    seen = set()
+    for entry in entries:
+        name = entry.get('name') if isinstance(entry, dict) else None
+        where = f'{path}: lemma {name!r}'
+        if not isinstance(name, str) or not name or name in seen:
+            raise LemmaPackError(f'{where}: needs a unique string name')
+        seen.add(name)
+        unknown = set(entry) - {'name', 'lhs', 'rhs', 'params',
+                                'description'}
+        if unknown:
+            raise LemmaPackError(f'{where}: unknown keys {sorted(unknown)}')
+        for key in ('lhs', 'rhs'):
+            if not isinstance(entry.get(key), str) or not entry[key]:
+                raise LemmaPackError(f'{where}: {key} must be LaTeX text')
+        params = entry.get('params')
+        if not isinstance(params, list) or not params \
+                or not all(isinstance(p, str) and p for p in params):
+            raise LemmaPackError(f'{where}: params must be a non-empty '
+                                 f'list of names')
+        if not isinstance(entry.get('description', ''), str):
+            raise LemmaPackError(f'{where}: description must be a string')
+    return entries
+
+
+def _compile_pack(path, data):
+    compiled = []
+    for entry in _read_pack(path, data):
+        lemma = Lemma(entry['name'], entry['lhs'], entry['rhs'],
+                      list(entry['params']), entry.get('description', ''))
+        try:
+            parse_latex(lemma.lhs)
+            parse_latex(lemma.rhs)
+        except PrimitiveError as e:
+            raise LemmaPackError(f'{path}: lemma {lemma.name!r}: {e}') from e
+        sides = {direction: _LemmaIndex.compile(lemma, direction)
+                 for direction in ('forward', 'backward')}
+        compiled.append((lemma, sides))
+    return compiled
+
+
+def _write_pack_cache(cached, compiled):
+    """Atomically store a compiled pack; any failure (a full disk, an
+    unpicklable entry) leaves no partial file and only costs the next
+    compile."""
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cached),
+                                   suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            pickle.dump(compiled, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cached)
+    except Exception:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def load_lemma_pack(path, cache_dir=None):
+    """Register every lemma of a pack; returns their names in pack order.
+
+    Later registrations win, as with register_lemma. The compiled pack is
+    read from `cache_dir` (default `lemma_cache_dir()`) when an entry for
+    these exact bytes and engine sources exists, and written there
+    otherwise; an unreadable or unwritable cache only costs the compile,
+    and a directory others can write into is never used.
+    """
+    _committed_packs()
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    key = hashlib.sha256(_pack_fingerprint().encode('ascii') + b'\0'
+                         + data).hexdigest()
+    folder = cache_dir or lemma_cache_dir()
+    cached = os.path.join(folder, key + '.pickle')
+    try:
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+    except OSError:
+        pass
+    usable = _private_dir(folder)
+    compiled = None
+    if usable:
+        try:
+            with open(cached, 'rb') as fh:
+                st = os.fstat(fh.fileno())
+                if not st.st_mode & 0o022:
+                    compiled = pickle.load(fh)
+        except Exception:
+            compiled = None
+    if compiled is None:
+        compiled = _compile_pack(path, data)
+        if usable:
+            _write_pack_cache(cached, compiled)
+    for lemma, sides in compiled:
+        LEMMAS[lemma.name] = lemma
+        for direction, stages in sides.items():
+            _LEMMA_INDEX.seed(lemma, direction, stages)
+    return [lemma.name for lemma, _ in compiled]
+
+
+def _load_committed_packs():
+    global _PACKS_PENDING
+    _PACKS_PENDING = False
+    if not os.path.isdir(LEMMA_PACKS):
+        return
+    for name in sorted(os.listdir(LEMMA_PACKS)):
+        if not name.endswith(('.yaml', '.yml', '.json')):
+            continue
+        try:
+            load_lemma_pack(os.path.join(LEMMA_PACKS, name))
+        except ImportError:   # pragma: no cover - a YAML pack without PyYAML
+            continue
+
+
+_PACKS_PENDING = True
+
+
 def _written_denominators(expr, store):
     """Every distinct written denominator in the expression as
     (latex, Poly), plus their product. Deliberately SYNTACTIC: to_ratfunc
@@ -2207,6 +2677,7 @@ def rewrite(expr, lemma_name, direction='forward', at=None):
     args = {'expr': expr, 'lemma': lemma_name, 'direction': direction}
     if at is not None:
         args['at'] = str(at)
+    _committed_packs()
     lemma = LEMMAS.get(lemma_name)
     if lemma is None:
         return _error('rewrite', args,
@@ -2227,51 +2698,35 @@ def rewrite(expr, lemma_name, direction='forward', at=None):
     # back, and the oracle checks input against result either way.
     sym, notation = _normalize_powered_heads(sym, notation)
 
-    def stage_positions(pat_src, pat_params, powermap, stage, seen):
+    candidates = [sym] + [node for node in notation.rel if node != sym]
+    shapes = _NodeShapes(notation)
+
+    def stage_positions(pattern, seen):
         """Matches of one pattern in position order: root first, then
         subterms in parse order (children precede parents, so an inner
-        match precedes its enclosing one). Wildcards from powermap must
-        bind perfect n-th power monomials, whose roots are returned bound
-        to the original lemma parameter. A node already claimed by an
-        earlier stage keeps that stage's binding."""
-        pat = _normalized_pattern(
-            pat_src, [(p, NotationParam.Any) for p in pat_params])
-
-        def validate(s):
-            bound = {}
-            for wild, (orig, n) in powermap.items():
-                if wild not in s:
-                    return None
-                root = _perfect_power_root(s[wild], notation, n)
-                if root is None:
-                    return None
-                bound[orig] = root
-            return bound
-
+        match precedes its enclosing one). A node already claimed by an
+        earlier stage keeps that stage's binding; a node the index rules
+        out is never handed to the matcher."""
         found = []
-        candidates = [sym] + [node for node in notation.rel if node != sym]
         for order, node in enumerate(candidates):
-            if node in seen:
-                continue
-            s = pat.match(node, notation)
-            if s is None:
+            if node in seen or not shapes.admits(pattern, node):
                 continue
-            v = validate(s)
-            if v is None:
+            matched = pattern.match(node, notation)
+            if matched is None:
                 continue
             seen.add(node)
-            found.append({'node': node, 'subst': s, 'numeric': v,
-                          'stage': stage, 'order': order})
+            found.append({'node': node, 'subst': matched[0],
+                          'numeric': matched[1], 'stage': pattern.stage,
+                          'order': order})
         return found
 
     # every match position across the base pattern and its numeric
     # variants (a^n terms binding perfect n-th power monomials); a node's
     # binding comes from the earliest stage that matches it
     seen = set()
-    positions = stage_positions(src, lemma.params, {}, 0, seen)
-    for v_i, (v_src, v_params, v_map) in enumerate(
-            _lemma_power_variants(src, lemma.params)):
-        positions += stage_positions(v_src, v_params, v_map, v_i + 1, seen)
+    positions = []
+    for pattern in _LEMMA_INDEX.stages(lemma, direction):
+        positions += stage_positions(pattern, seen)
     # a transparent wrapper and its inner content are ONE position: keep
     # the inner node (except at the root, which keeps itself)
     by_node = {p['node'] for p in positions}
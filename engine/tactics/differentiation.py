@@ -11,10 +11,11 @@ from polyrat import (RatFunc, NotInFragment, to_ratfunc,
                      FUNCTION_NAMES as FUNC_NAMES)
 
 from primitives import (
-    FRAC_NAMES, PrimitiveError, EvalError, parse_latex, write_latex,
-    canonical_or_same, definite_integral_parts, derivative_operator_parts,
+    FRAC_NAMES, PrimitiveError, EvalError, parse_latex, parse_latex_frozen,
+    write_latex, canonical_or_same, definite_integral_parts, derivative_operator_parts,
     free_symbols, numeric_eval, _func_power, _func_arg_span, _sample_point,
-    _simpson_panels, _result, _error, _paren, _is_sum_str,
+    _simpson_grids, _result, _error, _paren, _is_sum_str, verdict_cached,
+    dual_eval, compile_numeric,
 )
 
 # integral heads the derivative rule walk must never treat as ordinary
@@ -574,11 +575,15 @@ def differentiate(expr, var):
     return rec
 
 
+@verdict_cached
 def _derivative_check(expr, deriv, var, samples=8, seed=20260705):
-    """Central-difference spot check: f'(x) ~ (f(x+h)-f(x-h))/2h."""
+    """Spot check of f' against dual-number evaluation of f, one pass per
+    point (`dual_eval`); where f leaves the smooth fragment (|.|, floor)
+    or the dual slope disagrees, the central difference
+    f'(x) ~ (f(x+h)-f(x-h))/2h decides the point instead."""
     try:
-        s1, n1 = parse_latex(expr)
-        s2, n2 = parse_latex(deriv)
+        s1, n1 = parse_latex_frozen(expr)
+        s2, n2 = parse_latex_frozen(deriv)
     except PrimitiveError as e:
         return {'status': 'skipped', 'reason': str(e)}
     variables = free_symbols(s1, n1) | free_symbols(s2, n2) | {var}
@@ -586,11 +591,32 @@ def _derivative_check(expr, deriv, var, samples=8, seed=20260705):
     h = 1e-5
     agreed = 0
     tried = 0
+    methods = set()
     while agreed < samples and tried < samples * 10:
         tried += 1
         env = _sample_point(variables, rng)
         try:
             d_sym = numeric_eval(s2, n2, env)
+        except (EvalError, ZeroDivisionError, ValueError, OverflowError):
+            continue
+        if isinstance(d_sym, list):
+            continue   # matrix-valued: no numeric derivative leg
+        try:
+            d_dual = dual_eval(s1, n1, env, var)[1]
+        except EvalError:
+            d_dual = None   # not smooth: central differences below
+        except (ZeroDivisionError, ValueError, OverflowError):
+            continue
+        # the dual slope carries no truncation error, so agreement is
+        # final; a gap may still be cancellation in f's own arithmetic,
+        # and only the difference leg's estimate may call it a
+        # counterexample
+        if d_dual is not None and abs(d_sym - d_dual) \
+                <= 1e-4 * max(1.0, abs(d_sym), abs(d_dual)):
+            agreed += 1
+            methods.add('dual-number')
+            continue
+        try:
             f_vals = []
             for step in (h, -h, h / 2, -h / 2):
                 env_s = dict(env)
@@ -598,8 +624,7 @@ def _derivative_check(expr, deriv, var, samples=8, seed=20260705):
                 f_vals.append(numeric_eval(s1, n1, env_s))
         except (EvalError, ZeroDivisionError, ValueError, OverflowError):
             continue
-        if isinstance(d_sym, list) or any(isinstance(v, list)
-                                          for v in f_vals):
+        if any(isinstance(v, list) for v in f_vals):
             continue   # matrix-valued: central differences not supported
         f_p, f_m, f_p2, f_m2 = f_vals
         d_h = (f_p - f_m) / (2 * h)
@@ -618,10 +643,11 @@ def _derivative_check(expr, deriv, var, samples=8, seed=20260705):
             return {'status': 'disagree', 'point': env,
                     'symbolic': d_sym, 'numeric': d_num}
         agreed += 1
+        methods.add('central-difference')
     if agreed == 0:
         return {'status': 'skipped', 'reason': 'no evaluable sample points'}
     return {'status': 'agree', 'samples': agreed,
-            'method': 'central-difference'}
+            'method': ' + '.join(sorted(methods))}
 
 
 class _DomainBreak(Exception):
@@ -660,20 +686,21 @@ def _ftc_derivative_check(expr, result, var, samples=6, seed=20260803,
     params = (free_symbols(ls, ln) | free_symbols(us, un)
               | free_symbols(rs, rn) | {var}) - {t}
 
+    lower_fn, upper_fn = compile_numeric(ls, ln), compile_numeric(us, un)
+    result_fn = compile_numeric(rs, rn)
+
     def integral_at(env, xv):
         e = dict(env)
         e[var] = xv
-        a = numeric_eval(ls, ln, e)
-        b = numeric_eval(us, un, e)
+        a = lower_fn(e)
+        b = upper_fn(e)
         if isinstance(a, list) or isinstance(b, list) \
                 or not (math.isfinite(a) and math.isfinite(b)):
             raise EvalError('bounds are not finite')
-        coarse, bad = _simpson_panels(fs, fn, t, a, b, e, panels)
-        if bad is not None:
-            raise _DomainBreak(bad)
-        fine, bad = _simpson_panels(fs, fn, t, a, b, e, panels * 2)
-        if bad is not None:
-            raise _DomainBreak(bad)
+        (coarse, bad), (fine, bad2) = _simpson_grids(
+            fs, fn, t, [(a, b)], e, panels)[0]
+        if bad is not None or bad2 is not None:
+            raise _DomainBreak(bad if bad is not None else bad2)
         if coarse is None or fine is None:
             raise EvalError('quadrature holds no evidence')
         # Simpson is O(h^4); Richardson leaves O(h^6) and the residual
@@ -692,7 +719,7 @@ def _ftc_derivative_check(expr, result, var, samples=6, seed=20260803,
         # modest so Simpson converges and undecided points stay rare
         env = {k: v / 4 for k, v in env.items()}
         try:
-            d_sym = numeric_eval(rs, rn, env)
+            d_sym = result_fn(env)
         except (EvalError, ValueError, ZeroDivisionError, OverflowError):
             continue
         if isinstance(d_sym, list) or not math.isfinite(d_sym):
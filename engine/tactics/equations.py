@@ -14,7 +14,7 @@ from notation import Notation, Symbol
 from polyrat import NotInFragment, Poly, to_ratfunc, poly_to_notation
 from primitives import (
     PrimitiveError, EvalError, parse_latex, write_latex, numeric_eval,
-    free_symbols, same_expression, numeric_union_check, _num_agree,
+    compile_numeric, free_symbols, same_expression, numeric_union_check, _num_agree,
     _sample_point, _result, _error, _composite_disagreement_resolves,
     Substitutor,
 )
@@ -81,15 +81,17 @@ def _fraction_latex(value):
     return f'{sign}\\frac{{{value.numerator}}}{{{value.denominator}}}'
 
 
-def _numeric_zero_body(sym, notation, env):
-    """Oracle-only numeric reading of ``expr`` or ``lhs = rhs``."""
+def _numeric_zero_body(sym, notation):
+    """Oracle-only numeric reading of ``expr`` or ``lhs = rhs``, lowered
+    once: a callable ``env -> value``."""
     comp = notation.getf(sym, Notation.COMP)
     if comp is None:
-        return numeric_eval(sym, notation, env)
+        return compile_numeric(sym, notation)
     if comp.sym.props.get('op') != '=':
         raise EvalError('expected an equality')
-    return (numeric_eval(comp.args[0], notation, env)
-            - numeric_eval(comp.args[1], notation, env))
+    lhs = compile_numeric(comp.args[0], notation)
+    rhs = compile_numeric(comp.args[1], notation)
+    return lambda env: lhs(env) - rhs(env)
 
 
 def _quadratic_roots_check(expr, var, roots):
@@ -102,9 +104,10 @@ def _quadratic_roots_check(expr, var, roots):
     """
     try:
         sym, notation = parse_latex(expr)
+        zero_body = _numeric_zero_body(sym, notation)
 
         def value_at(x):
-            value = _numeric_zero_body(sym, notation, {var: float(x)})
+            value = zero_body({var: float(x)})
             if isinstance(value, list) or not math.isfinite(value):
                 raise EvalError('non-scalar quadratic value')
             return value
@@ -317,6 +320,12 @@ def _system_check(relations, pairs, samples=8, seed=20260728, tol=1e-6):
     variables -= unknowns
     closed = not variables
     wanted = 1 if closed else samples
+    # lowered once, evaluated at every sample point
+    value_fns = [(name, compile_numeric(vsym, vnotation))
+                 for name, vsym, vnotation in values]
+    sides = [(relation, compile_numeric(lhs, rnotation),
+              compile_numeric(rhs, rnotation))
+             for relation, lhs, rhs, rnotation in parsed]
     rng = random.Random(seed)
     agreed = 0
     tried = 0
@@ -324,8 +333,8 @@ def _system_check(relations, pairs, samples=8, seed=20260728, tol=1e-6):
     def _bind(point):
         """A sample point with every unknown bound to its recorded value."""
         local = dict(point)
-        for name, vsym, vnotation in values:
-            local[name] = numeric_eval(vsym, vnotation, point)
+        for name, value_fn in value_fns:
+            local[name] = value_fn(point)
         return local
 
     while agreed < wanted and tried < wanted * 8:
@@ -334,8 +343,8 @@ def _system_check(relations, pairs, samples=8, seed=20260728, tol=1e-6):
         env = dict(base_env)
         usable = True
         try:
-            for name, vsym, vnotation in values:
-                value = numeric_eval(vsym, vnotation, env)
+            for name, value_fn in value_fns:
+                value = value_fn(env)
                 if isinstance(value, list):
                     raise EvalError('non-scalar assignment value')
                 env[name] = value
@@ -345,10 +354,10 @@ def _system_check(relations, pairs, samples=8, seed=20260728, tol=1e-6):
             continue
         except (EvalError, OverflowError):
             continue
-        for relation, lhs, rhs, rnotation in parsed:
+        for relation, lhs_fn, rhs_fn in sides:
             try:
-                left = numeric_eval(lhs, rnotation, env)
-                right = numeric_eval(rhs, rnotation, env)
+                left = lhs_fn(env)
+                right = rhs_fn(env)
             except (ValueError, ZeroDivisionError) as exc:
                 # on closed data the relation simply has no value there:
                 # that is evidence, not ignorance
@@ -374,10 +383,9 @@ def _system_check(relations, pairs, samples=8, seed=20260728, tol=1e-6):
                 # loses most of its significant digits. Measured live: the
                 # reduction-formula ansatz's own correct A, B, C were
                 # accused at exactly such a point.
-                def _sides(point, _lhs=lhs, _rhs=rhs, _n=rnotation):
+                def _sides(point, _lhs=lhs_fn, _rhs=rhs_fn):
                     local = _bind(point)
-                    return (numeric_eval(_lhs, _n, local),
-                            numeric_eval(_rhs, _n, local))
+                    return _lhs(local), _rhs(local)
                 if not _composite_disagreement_resolves(
                         _sides, base_env, left, right):
                     usable = False
@@ -814,6 +822,10 @@ def _points_check(expr, var, pairs, samples=8, seed=20260705, tol=1e-6):
         variables |= free_symbols(vsym, vnotation)
     closed = not variables
     target = 1 if closed else samples
+    expr_fn = compile_numeric(esym, enotation)
+    compiled = [(root, compile_numeric(rsym, rnotation),
+                 compile_numeric(vsym, vnotation))
+                for root, rsym, rnotation, vsym, vnotation in parsed]
     rng = random.Random(seed)
     agreed = 0
     tried = 0
@@ -821,15 +833,15 @@ def _points_check(expr, var, pairs, samples=8, seed=20260705, tol=1e-6):
         tried += 1
         env = _sample_point(variables, rng)
         usable = True
-        for root, rsym, rnotation, vsym, vnotation in parsed:
+        for root, root_fn, value_fn in compiled:
             try:
-                root_value = numeric_eval(rsym, rnotation, env)
+                root_value = root_fn(env)
                 if isinstance(root_value, list):
                     raise EvalError('non-scalar root')
                 local = dict(env)
                 local[var] = root_value
-                at_root = numeric_eval(esym, enotation, local)
-                paired = numeric_eval(vsym, vnotation, env)
+                at_root = expr_fn(local)
+                paired = value_fn(env)
             except (ValueError, ZeroDivisionError) as exc:
                 # a genuine domain signal: on closed data the pair simply
                 # has no value, which is evidence, not ignorance
@@ -966,10 +978,11 @@ def _numeric_coefficients(sym, notation, xs, points):
     recovered purely by evaluation — an independent reading of the same
     object. `xs[i]` is the value the matching variable takes at
     `points[i]`."""
+    evaluate = compile_numeric(sym, notation)
     ys = []
     for point in points:
         try:
-            val = numeric_eval(sym, notation, point)
+            val = evaluate(point)
         except (EvalError, PrimitiveError, ZeroDivisionError,
                 ValueError, OverflowError):
             return None
@@ -1003,13 +1016,14 @@ def _coefficient_grid(var, atom, env, degree, rng):
     atom_vars = sorted(free_symbols(atom_sym, atom_n))
     if not atom_vars:
         return None  # a constant atom cannot be varied at all
+    evaluate = compile_numeric(atom_sym, atom_n)
     xs, points = [], []
     for _ in range(_ATOM_DRAWS):
         if len(xs) > degree:
             break
         draw = _sample_point(atom_vars, rng)
         try:
-            val = numeric_eval(atom_sym, atom_n, draw)
+            val = evaluate(draw)
         except (EvalError, PrimitiveError, ZeroDivisionError,
                 ValueError, OverflowError):
             continue
@@ -13,6 +13,7 @@ from primitives import (
     _num_agree, numeric_eval, _sample_point, _result, _error,
     _peel_groups, _int_literal, _strip_limit, _infinity_sign,
     _limit_latex, _paren, _is_sum_str, _normal_form, same_expression,
+    verdict_cached, bigop_prefixes, compile_numeric,
 )
 from tactics.core import (
     equal_exprs, substitute, expand,
@@ -135,6 +136,7 @@ def _proposal_limit_error(proposal_limit, expr_limit, op, label):
     return None
 
 
+@verdict_cached
 def _finite_sum_check(sum_latex, closed_latex, upper_var, lower_int,
                       samples=6, seed=20260705, word='sum'):
     """Evaluate the literal finite sum/product against a closed form at
@@ -151,14 +153,29 @@ def _finite_sum_check(sum_latex, closed_latex, upper_var, lower_int,
     deltas = (-1, 0, 1, 2, 3, 5, 9) if upper_var is not None \
         else tuple(range(samples))
     rng = random.Random(seed)
+    # with no other variable every upper bound reads one pass of running
+    # totals; a term failing anywhere in it leaves each bound to its own
+    # evaluation, as does a bound reaching into the body
+    totals = None
+    if upper_var is not None and not variables:
+        try:
+            lo, totals = bigop_prefixes(ss, sn, {}, lower_int + max(deltas),
+                                        upper_var)
+        except (EvalError, ZeroDivisionError, ValueError, OverflowError):
+            totals = None
+    sum_fn = compile_numeric(ss, sn)
+    closed_fn = compile_numeric(cs, cn)
     agreed = 0
     for delta in deltas:
         env = _sample_point(variables, rng)
         if upper_var is not None:
             env[upper_var] = float(lower_int + delta)
         try:
-            v1 = numeric_eval(ss, sn, env)
-            v2 = numeric_eval(cs, cn, env)
+            if totals is not None:
+                v1 = totals[max(0, lower_int + delta - lo + 1)]
+            else:
+                v1 = sum_fn(env)
+            v2 = closed_fn(env)
         except (EvalError, ZeroDivisionError, ValueError, OverflowError):
             continue
         agree = _num_agree(v1, v2, 1e-6)
@@ -1041,12 +1058,14 @@ def series_converges(expr, dominating):
     except PrimitiveError as e:
         return _error('series_converges', args,
                       f'internal: cannot form |summand|: {e}')
+    f_fn = compile_numeric(fs, fn)
+    g_fn = compile_numeric(g_sym, g_notation)
     checked = []
     for delta in (0, 1, 2, 3, 5, 8, 15, 40):
         nval = lo + delta
         try:
-            fv = numeric_eval(fs, fn, {k: float(nval)})
-            gv = numeric_eval(g_sym, g_notation, {k: float(nval)})
+            fv = f_fn({k: float(nval)})
+            gv = g_fn({k: float(nval)})
         except (EvalError, ValueError, ZeroDivisionError, OverflowError):
             continue
         if not isinstance(fv, float) or not isinstance(gv, float):
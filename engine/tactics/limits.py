@@ -13,10 +13,10 @@ from primitives import (
     same_expression,
     _transparent_inner, _plain_symbol_name, _contains_free_infinity,
     _sample_guards, _admissible_point, _guard_variables,
-    free_symbols, numeric_eval, definite_integral_evaluator,
-    _overflow_saturation,
+    free_symbols, numeric_eval, compile_numeric,
+    definite_integral_evaluator, _overflow_saturation,
     _sample_point, _result, _error, _int_literal, _strip_limit,
-    _infinity_sign, _limit_latex, _paren, _is_sum_str,
+    _infinity_sign, _limit_latex, _paren, _is_sum_str, verdict_cached,
 )
 from tactics.core import (
     equal_exprs, substitute, expand, _merge_checks, _q_str,
@@ -86,8 +86,7 @@ def _body_fn(sym, notation):
     agreement, the one shape this leg must never emit."""
     special = definite_integral_evaluator(sym, notation)
     if special is None:
-        def special(env):
-            return numeric_eval(sym, notation, env)
+        special = compile_numeric(sym, notation)
 
     def guarded(env):
         with _overflow_saturation():
@@ -192,6 +191,7 @@ def _approach_estimate(body, notation, var, point, point_notation,
     return richardson(value_at(h), value_at(h / 2))
 
 
+@verdict_cached
 def _limit_check(body_latex, var, point_latex, direction, expected_latex,
                  samples=6, assumptions=None):
     """Check a claimed limit by approach sampling, independently of tactics."""
@@ -303,13 +303,14 @@ def _limit_indeterminate_form(parts, numerator, denominator):
         return None
     num_eval = _body_fn(ns, nn)
     den_eval = _body_fn(ds, dn)
+    point_fn = compile_numeric(point, pn)
     envs = _limit_sample_envs(
         [(ns, nn), (ds, dn), (point, pn)], parts['var'], 4)
     inf = _infinity_sign(point, pn)
     for env in envs:
         if inf is None:
             try:
-                a = numeric_eval(point, pn, env)
+                a = point_fn(env)
                 at = dict(env)
                 at[parts['var']] = a
                 nv, dv = num_eval(at), den_eval(at)
@@ -322,7 +323,7 @@ def _limit_indeterminate_form(parts, numerator, denominator):
             if inf is not None:
                 xs = (inf * 1e2, inf * 1e3)
             else:
-                a = numeric_eval(point, pn, env)
+                a = point_fn(env)
                 sign = -1 if parts['direction'] == 'left' else 1
                 h = 1e-2 * max(1.0, abs(a))
                 xs = (a + sign * h, a + sign * h / 2)
@@ -925,13 +926,17 @@ def _squeeze_bound_check(lower_latex, body_latex, upper_latex, var,
     envs = _limit_sample_envs(
         [(lo, lo_n), (bo, bo_n), (up, up_n), (point, pn)], var, samples)
     inf = _infinity_sign(point, pn)
+    point_fn = compile_numeric(point, pn)
+    low_fn, mid_fn, high_fn = (compile_numeric(lo, lo_n),
+                               compile_numeric(bo, bo_n),
+                               compile_numeric(up, up_n))
     agreed = 0
     for env in envs:
         if inf is not None:
             offsets = [inf * x for x in (10.0, 30.0, 1e2, 1e3, 1e4)]
         else:
             try:
-                a = numeric_eval(point, pn, env)
+                a = point_fn(env)
             except (EvalError, ZeroDivisionError, ValueError,
                     OverflowError):
                 continue
@@ -950,9 +955,7 @@ def _squeeze_bound_check(lower_latex, body_latex, upper_latex, var,
             e = dict(env)
             e[var] = x
             try:
-                low = numeric_eval(lo, lo_n, e)
-                mid = numeric_eval(bo, bo_n, e)
-                high = numeric_eval(up, up_n, e)
+                low, mid, high = low_fn(e), mid_fn(e), high_fn(e)
             except (EvalError, ZeroDivisionError, ValueError,
                     OverflowError):
                 continue
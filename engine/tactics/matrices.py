@@ -15,7 +15,7 @@ import random
 
 from notation import Notation, Symbol
 from primitives import (
-    PrimitiveError, EvalError, parse_latex, write_latex, numeric_eval,
+    PrimitiveError, EvalError, parse_latex, write_latex, compile_numeric,
     numeric_spot_check, free_symbols, _num_agree, _sample_point,
     _result, _error,
 )
@@ -115,6 +115,8 @@ def _numeric_pairs_check(sym, notation, rsym, rnotation, compare,
     at sampled points and hand both values to ``compare(v_in, v_out)``,
     which returns True/False or raises EvalError to skip the point."""
     variables = free_symbols(sym, notation) | free_symbols(rsym, rnotation)
+    f_in = compile_numeric(sym, notation)
+    f_out = compile_numeric(rsym, rnotation)
     rng = random.Random(seed)
     agreed = 0
     tried = 0
@@ -122,8 +124,8 @@ def _numeric_pairs_check(sym, notation, rsym, rnotation, compare,
         tried += 1
         env = _sample_point(variables, rng)
         try:
-            v_in = numeric_eval(sym, notation, env)
-            v_out = numeric_eval(rsym, rnotation, env)
+            v_in = f_in(env)
+            v_out = f_out(env)
             ok = compare(v_in, v_out)
         except (EvalError, ZeroDivisionError, ValueError, OverflowError):
             continue
@@ -1,5 +1,11 @@
+import threading
+import time
 import unittest
 from comparer import *
+from LatexParser import _ParserPool
+from replicator import Replicator
+from notation import Func
+from unittest import mock
 from processor import (
     FixedPointCycleError,
     FixedPointLimitError,
@@ -366,5 +372,143 @@ class TestScenario(unittest.TestCase):
             "{3} \\sum_{n=1}^{\\infty} \\frac{1}{n^2}",
         )
 
+
+class TestParserPool(unittest.TestCase):
+    SAMPLE = '\\frac{x^2+1}{x-1}+\\sin x - \\sqrt{y}'
+
+    def _written(self, notation, sym):
+        return LaTexWriter(notation)(sym)
+
+    def test_pooled_parse_matches_a_freshly_built_parser(self):
+        n1 = Notation()
+        fresh = MathParser(n1, pool=_ParserPool()).parse(self.SAMPLE)
+        n2 = Notation()
+        pooled = MathParser(n2).parse(self.SAMPLE)
+        self.assertEqual(self._written(n1, fresh), self._written(n2, pooled))
+
+    def test_pool_reuses_one_machine_for_sequential_parses(self):
+        pool = _ParserPool()
+        for latex in ('x+1', 'y^2', '\\text{a} + b', 'x!'):
+            MathParser(Notation(), pool=pool).parse(latex)
+        self.assertEqual(pool.built, 1)
+
+    def test_failed_parse_does_not_poison_the_pooled_lexer(self):
+        pool = _ParserPool()
+        with self.assertRaises(Exception):
+            MathParser(Notation(), pool=pool).parse('\\text{open')
+        n = Notation()
+        sym = MathParser(n, pool=pool).parse('x+1')
+        self.assertEqual(self._written(n, sym), 'x+{1}')
+
+    def test_command_names_are_bound_per_parse(self):
+        pool = _ParserPool()
+        n = Notation()
+        sym = MathParser(n, command_names={'go'}, pool=pool).parse('go!')
+        self.assertTrue(n.get(sym).sym.props.get('command'))
+        n = Notation()
+        sym = MathParser(n, pool=pool).parse('go!')
+        self.assertIsNone(n.getf(sym, Symbol('go', command=True)))
+
+    def test_concurrent_parses_keep_their_own_notation(self):
+        pool = _ParserPool()
+        inputs = ['x^{%d}+%d' % (i, i) for i in range(16)]
+        results = {}
+
+        def work(latex):
+            for _ in range(20):
+                n = Notation()
+                sym = MathParser(n, pool=pool).parse(latex)
+                results.setdefault(latex, set()).add(self._written(n, sym))
+
+        threads = [threading.Thread(target=work, args=(latex,))
+                   for latex in inputs]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for latex in inputs:
+            n = Notation()
+            expected = self._written(n, MathParser(n).parse(latex))
+            self.assertEqual(results[latex], {expected})
+        self.assertLessEqual(pool.built, len(inputs))
+
+    def _per_parse(self, fresh_pool, parses=10, repeats=3):
+        """Best-of-`repeats` seconds per parse of SAMPLE."""
+        shared = _ParserPool()
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(parses):
+                pool = _ParserPool() if fresh_pool else shared
+                MathParser(Notation(), pool=pool).parse(self.SAMPLE)
+            took = (time.perf_counter() - start) / parses
+            best = took if best is None else min(best, took)
+        return best
+
+    def test_pooled_parses_beat_a_machine_per_parse(self):
+        # before: every MathParser built its own LALR machine and lexer
+        # (a fresh pool per parse); after: one pool serves every parse.
+        # Measured about 6x here; the bar is loose so load never trips it
+        before = self._per_parse(fresh_pool=True)
+        after = self._per_parse(fresh_pool=False)
+        self.assertGreater(before / after, 1.5)
+
+
+class TestHashConsedNotation(unittest.TestCase):
+    def _interned(self, latex):
+        n = Notation()
+        sym = MathParser(n).parse(latex)
+        return HashConsedNotation.intern(sym, n)
+
+    def test_identical_subtrees_share_one_node(self):
+        sym, n = self._interned('\\sqrt{x+1} + \\sqrt{x+1}')
+        first, second = n.get(sym).args
+        self.assertEqual(n.get(second).args[0], first)
+        other_sym, other = self._interned('\\sqrt{x+1}')
+        self.assertEqual(other_sym, first)
+        self.assertTrue(n.identical(first, other, other_sym))
+
+    def test_pass_reuses_unchanged_subtrees(self):
+        sym, n = self._interned('\\sin{x} + y^{2}')
+        before = set(n.rel)
+        autonum = Symbol.autonum
+        out = HashConsedNotation()
+        self.assertEqual(Replicator(n, out)(sym), sym)
+        self.assertEqual(Symbol.autonum, autonum)
+        self.assertTrue(set(out.rel) <= before)
+
+    def test_sym_hint_is_ignored(self):
+        n = HashConsedNotation()
+        a = n.setf(Notation.P_LIST, (Symbol('x'), Symbol('y')))
+        b = n.repf(Symbol('z'), Func(Notation.P_LIST, (Symbol('x'), Symbol('y'))))
+        self.assertEqual(a, b)
+        self.assertNotEqual(n.setf(Notation.P_LIST, [Symbol('x'), Symbol('y')]), a)
+
+    def test_s_equal_skips_the_comparer_on_one_node(self):
+        sym1, n1 = self._interned('\\frac{a}{b} + c')
+        sym2, n2 = self._interned('\\frac{a}{b} + c')
+        self.assertEqual(sym1, sym2)
+        with mock.patch.object(NotationComparer, 'match') as match:
+            self.assertTrue(s_equal(sym1, n1, sym2, n2))
+        match.assert_not_called()
+        sym3, n3 = self._interned('c + \\frac{a}{b}')
+        self.assertNotEqual(sym1, sym3)
+        self.assertTrue(s_equal(sym1, n1, sym3, n3))
+
+    def test_ellipsis_still_goes_through_the_comparer(self):
+        n = HashConsedNotation()
+        sym = n.setf(Notation.S_LIST, (Symbol('a'), Notation.DOT3, Symbol('z')))
+        self.assertFalse(n.get(sym).plain)
+        self.assertEqual(s_equal(sym, n, sym, n),
+                         NotationComparer(sym, n).match(sym, n) is not None)
+
+    def test_removed_node_stays_for_other_parents(self):
+        n = HashConsedNotation()
+        inner = n.setf(Notation.S_LIST, (Symbol('a'), Symbol('b')))
+        n.setf(Notation.GROUP, (inner,), br='()')
+        n.remove(inner)
+        self.assertIsNotNone(n.get(inner))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -325,6 +325,56 @@ class TestShellPreview(unittest.TestCase):
                           {'kind': 'ref', 'text': '[[7]]'}])
 
 
+class TestIncrementalPreview(unittest.TestCase):
+    def setUp(self):
+        self.names = command_names()
+        self.cache = cell_input.PreviewCache()
+
+    def preview(self, code, cache=None):
+        return cell_input.preview(code, self.names, {'do'}, cache=cache)
+
+    def test_a_cached_preview_reads_the_same_as_a_fresh_one(self):
+        for code in (r'int! \int x^2 dx', 'x^2\ny = 2x', 'int! [[1]] + x',
+                     r'do! find \int x^2 dx for n > 1', 'do! hello there'):
+            self.assertEqual(self.preview(code, self.cache),
+                             self.preview(code))
+            self.assertEqual(self.preview(code, self.cache),
+                             self.preview(code))
+
+    def test_only_the_edited_line_is_parsed_again(self):
+        lines = ['x^{%d} + %d' % (n, n) for n in range(12)]
+        self.preview('\n'.join(lines), self.cache)
+        lines[5] = 'y^2 - 1'
+        with mock.patch.object(primitives, 'parse_latex',
+                               wraps=primitives.parse_latex) as parse:
+            segments = self.preview('\n'.join(lines), self.cache)
+        self.assertIn('y^{2}', segments[10]['latex'])
+        parsed = [call.args[0] for call in parse.call_args_list]
+        self.assertTrue(parsed)
+        self.assertTrue(all('y' in text for text in parsed), parsed)
+
+    def test_a_cached_reading_cannot_be_changed_by_its_caller(self):
+        self.preview('x^2', self.cache)[0]['latex'] = 'tampered'
+        self.assertEqual(self.preview('x^2', self.cache)[0]['latex'],
+                         'x^{2}')
+
+    def test_the_cache_is_bounded(self):
+        cache = cell_input.PreviewCache(limit=4)
+        for n in range(10):
+            self.preview('x^{%d}' % n, cache)
+        self.assertLessEqual(len(cache), 4)
+
+    def test_a_segment_diff_rebuilds_the_new_list(self):
+        old = [{'kind': 'math', 'latex': c} for c in 'abcde']
+        new = [{'kind': 'math', 'latex': c} for c in 'abXYe']
+        start, end, changed = cell_input.diff_segments(old, new)
+        self.assertEqual((start, end, [s['latex'] for s in changed]),
+                         (2, 4, ['X', 'Y']))
+        self.assertEqual(old[:start] + changed + old[end:], new)
+        self.assertEqual(cell_input.diff_segments(new, new), (5, 5, []))
+        self.assertEqual(cell_input.diff_segments([], new), (0, 0, new))
+
+
 class TestRenderComm(unittest.TestCase):
     """The kernel side of the comm: one reply per request, never a raise."""
 
@@ -333,8 +383,8 @@ class TestRenderComm(unittest.TestCase):
         from toymathkernel import MathKernel
         self.kernel = mock.Mock(spec=['mathShell', 'log'])
         self.kernel.mathShell = MathShell()
-        self.render = lambda comm, msg: MathKernel._render_cell(
-            self.kernel, comm, msg)
+        self.render = lambda comm, msg, sent=None: MathKernel._render_cell(
+            self.kernel, comm, msg, sent)
 
     @staticmethod
     def message(code, ident='7'):
@@ -352,6 +402,31 @@ class TestRenderComm(unittest.TestCase):
         self.render(comm, self.message('do! find the derivative'))
         self.assertIsNone(comm.send.call_args[0][0]['segments'])
 
+    def test_a_request_since_an_earlier_reply_gets_only_the_change(self):
+        comm, sent = mock.Mock(spec=['send']), {}
+        self.render(comm, self.message('x^2\ny^2\nz^2', '1'), sent)
+        full = comm.send.call_args[0][0]['segments']
+        message = self.message('x^2\ny^3\nz^2', '2')
+        message['content']['data']['since'] = '1'
+        self.render(comm, message, sent)
+        payload = comm.send.call_args[0][0]
+        self.assertEqual((payload['since'], payload['start'], payload['end']),
+                         ('1', 2, 3))
+        self.assertEqual(len(payload['segments']), 1)
+        rebuilt = (full[:payload['start']] + payload['segments']
+                   + full[payload['end']:])
+        self.assertEqual(rebuilt,
+                         self.kernel.mathShell.preview_cell('x^2\ny^3\nz^2'))
+
+    def test_an_unknown_base_gets_the_whole_list(self):
+        comm = mock.Mock(spec=['send'])
+        message = self.message('x^2')
+        message['content']['data']['since'] = 'gone'
+        self.render(comm, message, {})
+        payload = comm.send.call_args[0][0]
+        self.assertNotIn('since', payload)
+        self.assertEqual(payload['segments'][0]['latex'], 'x^{2}')
+
     def test_a_failing_preview_answers_instead_of_raising(self):
         comm = mock.Mock(spec=['send'])
         with mock.patch.object(type(self.kernel.mathShell), 'preview_cell',
@@ -266,6 +266,40 @@ class TestDoSessionApi(unittest.TestCase):
         self.assertFalse(rec['ok'])
         self.assertEqual(session.new_steps(), [])
 
+    def test_run_tactics_pipes_results_and_streams_on_commit(self):
+        seen = []
+        session = DoSession(on_step=seen.append)
+        api = make_api(session)
+        rec = json.loads(api['run_tactics']([
+            ['expand', '(x+1)^2 - 4'],
+            ['collect', '@prev', 'x'],
+            ['factor_quadratic', '@2', 'x']]))
+        self.assertTrue(rec['ok'], rec.get('error'))
+        self.assertEqual([s['id'] for s in rec['steps']], ['s1', 's2', 's3'])
+        self.assertEqual(rec['records'][1]['input'],
+                         rec['records'][0]['result'])
+        self.assertEqual(rec['result'], rec['records'][2]['result'])
+        self.assertEqual([s['id'] for s in seen], ['s1', 's2', 's3'])
+        self.assertEqual(session.ledger.replay()['status'], 'verified')
+
+    def test_run_tactics_records_nothing_when_a_call_fails(self):
+        seen = []
+        session = DoSession(on_step=seen.append)
+        api = make_api(session)
+        api['expand']('(x+2)^2')
+        rec = json.loads(api['run_tactics']([
+            ['expand', '(x+1)^2'],
+            ['apply', '2x = 1', '/', '0']]))
+        self.assertFalse(rec['ok'])
+        self.assertEqual(rec['failed'], 2)
+        self.assertNotIn('step', rec['records'][0])
+        self.assertEqual([s['id'] for s in session.ledger.steps], ['s1'])
+        self.assertEqual([s['id'] for s in seen], ['s1'])
+        follow = json.loads(api['expand']('(x+3)^2'))
+        self.assertEqual(follow['step']['id'], 's2')
+        refused = json.loads(api['run_tactics']([['diff', 'x^2', 'x']]))
+        self.assertIn('unloaded skill', refused['error'])
+
     def test_set_result_validates_query_only_as_unverified(self):
         session = DoSession()
         api = make_api(session)
@@ -1697,8 +1731,8 @@ class TestCanonicalToolBindings(unittest.TestCase):
         api = make_api(session)
         bindings = agent_do.make_tool_bindings(session)
         self.assertEqual([b.name for b in bindings], [
-            'load_skill', 'run_tactic', 'comment', 'claim', 'conclude',
-            'set_result', 'set_open', 'plot', 'tikz'])
+            'load_skill', 'run_tactic', 'run_tactics', 'comment', 'claim',
+            'conclude', 'set_result', 'set_open', 'plot', 'tikz'])
         for binding in bindings:
             derived = function_tool(api[binding.name])
             self.assertEqual(binding.description, derived.description,
@@ -1815,8 +1849,8 @@ class TestBackendToolParity(unittest.TestCase):
         # Anything else must fail closed before a live model runs.
         _, dispatcher = self._dispatcher()
         self.assertEqual(codex_backend.expected_model_tools(dispatcher), (
-            'load_skill', 'run_tactic', 'comment', 'claim', 'conclude',
-            'set_result', 'set_open',
+            'load_skill', 'run_tactic', 'run_tactics', 'comment', 'claim',
+            'conclude', 'set_result', 'set_open',
             'update_plan', 'request_user_input', 'view_image'))
 
     def test_tactic_names_never_reach_the_codex_surface(self):
@@ -2099,7 +2133,8 @@ class TestCodexExecution(unittest.TestCase):
                         backend=self._backend(None, transport=transport))
         thread = transport.requests[0]
         names = [tool['name'] for tool in thread.dynamic_tools]
-        self.assertEqual(names[:7], list(agent_do.TOOL_NAMES))
+        tools = list(agent_do.TOOL_NAMES)
+        self.assertEqual(names[:len(tools)], tools)
         # the per-thread instructions enumerate, then carry the do! rules
         self.assertTrue(thread.developer_instructions.startswith(
             codex_backend.POLICY_HEADER))
@@ -6661,7 +6696,7 @@ class TestUnknownToolSteering(unittest.TestCase):
         self.assertIn('integration', second)
         third = json.dumps(captured[2], default=str)
         self.assertIn('does not exist', third)
-        self.assertIn('load_skill, run_tactic, comment', third)
+        self.assertIn('load_skill, run_tactic, run_tactics, comment', third)
 
 
 @unittest.skipUnless(codex_backend.available(),
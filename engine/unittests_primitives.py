@@ -4,10 +4,14 @@
 import math
 import os
 import json
+import subprocess
+import sys
 import tempfile
 import unittest
+from fractions import Fraction
+from unittest import mock
 
-from notation import Notation
+from notation import Notation, Symbol
 from LatexParser import MathParser
 from polyrat import (Poly, RatFunc, NotInFragment, to_ratfunc,
                      ratfunc_to_notation)
@@ -90,12 +94,56 @@ class TestPolyRat(unittest.TestCase):
         self.assertEqual(rf('\\frac{x+y}{(x+y)^2}'),
                          rf('\\frac{1}{x+y}'))
 
-    def test_partial_common_factor_stays(self):
-        # no full multivariate GCD: partial factors stay uncancelled but
-        # cross-multiplying equality still decides exactly
+    def test_partial_common_factor_cancels(self):
+        # multivariate gcd: a factor shared only in part still cancels,
+        # leaving the canonical reduced pair
         r = rf('\\frac{(x+y)(x-z)}{(x+y)(x-w)}')
         self.assertFalse(r.is_poly())
         self.assertEqual(r, rf('\\frac{x-z}{x-w}'))
+        self.assertEqual(r.num.degree(), 1)
+        self.assertEqual(r.den.degree(), 1)
+
+    def test_multivariate_gcd(self):
+        from polyrat import poly_gcd
+        x, y, z = Poly.var('x'), Poly.var('y'), Poly.var('z')
+        one = Poly.const(1)
+        g = x * y + z * z + one
+        self.assertEqual(poly_gcd(g * (x - y), g * (x + z) * (x + z)), g)
+        # content-only common factors, and none at all
+        self.assertEqual(poly_gcd((x + one) * y, (x + one) * z), x + one)
+        self.assertEqual(poly_gcd(x + y, x - y), one)
+        self.assertEqual(poly_gcd(y + one, z + one), one)
+        # rational scalings do not matter: the canonical associate
+        self.assertEqual(poly_gcd((x - y).scale(-3), (x - y).scale(2)),
+                         x - y)
+        self.assertEqual(poly_gcd(Poly(), (y - x).scale(4)), x - y)
+
+    def test_coprime_three_variable_pair_stays_small(self):
+        # a primitive PRS that scaled by lc every step and never reduced
+        # ran for minutes on this pair; the subresultant PRS is instant
+        x, y, z = Poly.var('x'), Poly.var('y'), Poly.var('z')
+        a = (x * y ** 3 * z ** 2).scale(Fraction(-5, 2)) \
+            + (x ** 2 * y ** 3 * z).scale(-2) \
+            + (x * z ** 3).scale(Fraction(-1, 3)) \
+            + (x ** 3 * z ** 3).scale(Fraction(-3, 2))
+        b = (y ** 2 * z ** 3).scale(2) + y.scale(4) \
+            + z.scale(Fraction(-2, 3)) \
+            + (x ** 3 * y ** 2 * z ** 3).scale(Fraction(-5, 2))
+        r = RatFunc(a, b)
+        self.assertEqual(r.num * b, r.den * a)
+        self.assertEqual(r.den.degree(), 8)
+        g = x * y + z * z - Poly.const(3)
+        self.assertEqual(RatFunc(g * a, g * b), r)
+
+    def test_arithmetic_chains_stay_reduced(self):
+        r = rf('\\frac{1}{x+y}')
+        s = rf('\\frac{x}{x-y}')
+        acc = r
+        for _ in range(6):
+            acc = acc * s + r - r * s
+        acc = acc - (acc - r)
+        self.assertEqual(acc, r)
+        self.assertEqual((acc.num.degree(), acc.den.degree()), (0, 1))
 
     def test_deterministic_output(self):
         self.assertEqual(canon('(x+1)(x-2)'), canon('(x-2)(x+1)'))
@@ -104,6 +152,121 @@ class TestPolyRat(unittest.TestCase):
         once = canon('(x+1)^2')
         self.assertEqual(once, canon(once))
 
+    def test_packed_products_keep_term_order(self):
+        # packing is internal: the product's terms come out as sorted
+        # (var, exp) tuples, in the order the tuple loop inserted them
+        x, y, z = Poly.var('x'), Poly.var('y'), Poly.var('z')
+        p = x + y * y - Poly.const(2) * z + Poly.const(1)
+        q = x * y - z
+        prod = p * q
+        naive = {}
+        for m1, c1 in p.terms.items():
+            for m2, c2 in q.terms.items():
+                d = dict(m1)
+                for v, e in m2:
+                    d[v] = d.get(v, 0) + e
+                mono = tuple(sorted(d.items()))
+                naive[mono] = naive.get(mono, 0) + c1 * c2
+        self.assertEqual(list(prod.terms.items()),
+                         [(m, c) for m, c in naive.items() if c != 0])
+        cube = p ** 3
+        self.assertEqual(list(cube.terms), list((p * p * p).terms))
+        self.assertEqual((x - x) ** 2, Poly())
+        self.assertEqual(p ** 0, Poly.const(1))
+
+    def test_integer_form_arithmetic(self):
+        from fractions import Fraction as Q
+        x, y = Poly.var('x'), Poly.var('y')
+        p = x.scale(Q(1, 2)) + y.scale(Q(2, 3)) - Poly.const(Q(5, 6))
+        self.assertEqual(p._scaled(), ({(('x', 1),): 3, (('y', 1),): 4,
+                                        (): -5}, 6))
+        self.assertEqual(p.content(), Q(1, 6))
+        sq = p * p
+        self.assertEqual(sq.terms[(('x', 1), ('y', 1))], Q(2, 3))
+        self.assertTrue(all(isinstance(c, Q) for c in sq.terms.values()))
+        self.assertEqual(p ** 2, sq)
+        self.assertEqual((sq + p.scale(-1) * p).terms, {})
+        # a rational divisor with a non-unit integer content
+        d = x.scale(Q(4, 3)) - y.scale(2)
+        self.assertEqual((sq * d).div_exact(d), sq)
+        self.assertIsNone((x * x + Poly.const(1)).div_exact(x.scale(2) + y))
+        # integral results keep their integer form for the next operation
+        self.assertEqual(((x + y) * (x - y))._scaled_form[1], 1)
+
+    def test_dense_univariate_engine(self):
+        import random
+        from polyrat import (_dense_mul, _school_mul, _dense_trim,
+                             _dense_gcd, _dense_div_exact, _dense_pow)
+        rng = random.Random(5)
+
+        def rand(n, lead=1):
+            return [rng.randint(-9, 9) for _ in range(n)] + [lead]
+
+        for n, m in ((40, 40), (100, 33), (257, 300), (70, 20)):
+            a, b = rand(n), rand(m, -2)
+            self.assertEqual(_dense_mul(a, b),
+                             _dense_trim(_school_mul(a, b)))
+        a = rand(40)
+        self.assertEqual(_dense_pow(a, 5),
+                         _dense_mul(_dense_mul(_dense_mul(a, a), a),
+                                    _dense_mul(a, a)))
+        g = rand(30, 3)
+        u, v = _dense_mul(g, rand(25)), _dense_mul(g, rand(35, 7))
+        h = _dense_gcd([6 * c for c in u], v)
+        self.assertEqual(len(h), len(g))
+        self.assertIsNotNone(_dense_div_exact(u, h))
+        self.assertIsNotNone(_dense_div_exact(v, h))
+        self.assertEqual(_dense_gcd([1, 1], [1, 0, 1]), [1])
+
+    def test_dense_paths_through_poly_and_ratfunc(self):
+        x = Poly.var('x')
+        p = x + Poly.const(1)
+        big = p ** 60
+        self.assertEqual(big.terms[(('x', 30),)], math.comb(60, 30))
+        self.assertEqual(big, (p ** 30) * (p ** 30))
+        r = RatFunc(big * (x - Poly.const(2)),
+                    (p ** 59).scale(3) * (x + Poly.const(3)))
+        self.assertEqual(r, RatFunc(p * (x - Poly.const(2)),
+                                    (x + Poly.const(3)).scale(3)))
+        self.assertEqual(r.den.degree(), 1)
+
+    def test_karatsuba_does_less_coefficient_work(self):
+        # counted in coefficient products, not seconds: the schoolbook
+        # leaves of a degree-512 Karatsuba product cost well under half
+        # of the one schoolbook product
+        import random
+        import polyrat
+        rng = random.Random(9)
+        a = [rng.randint(-99, 99) for _ in range(512)] + [1]
+        b = [rng.randint(-99, 99) for _ in range(512)] + [1]
+        school = polyrat._school_mul
+        work = []
+
+        def counted(x, y):
+            work.append(len(x) * len(y))
+            return school(x, y)
+        with mock.patch.object(polyrat, '_school_mul', counted):
+            product = polyrat._dense_mul(a, b)
+        self.assertEqual(product, school(a, b))
+        self.assertLess(2 * sum(work), len(a) * len(b))
+        g = polyrat._dense_gcd(polyrat._dense_mul(a[:100], [1, 1]),
+                               polyrat._dense_mul(b[:100], [1, 1]))
+        self.assertEqual(g, [1, 1])
+
+    def test_packed_exact_division(self):
+        x, y = Poly.var('x'), Poly.var('y')
+        d = x + y ** 5
+        q = x ** 3 - Poly.const(3) * x * y + y ** 2
+        self.assertEqual((q * d).div_exact(d), q)
+        self.assertIsNone((q * d + Poly.const(1)).div_exact(d))
+        self.assertIsNone(y.div_exact(x))
+        self.assertEqual((x ** 2 - y ** 20).div_exact(x + y ** 10),
+                         x - y ** 10)
+        # the remainder's y exponent (y^160) outgrows the packed layout;
+        # the tuple loop decides instead
+        self.assertIsNone((x ** 4).div_exact(x + y ** 40))
+        self.assertIsNone((x ** 4)._div_exact_tuples(x + y ** 40))
+
 
 class TestSubstitute(unittest.TestCase):
     def test_numeric(self):
@@ -603,6 +766,172 @@ class TestTrigLemmaCatalog(unittest.TestCase):
         self.assertEqual(Core.expand(step['result'])['result'], 'y+1')
 
 
+class TestLemmaIndex(unittest.TestCase):
+    # the head/vocabulary index may only skip work: every node it rules out
+    # must be one the matcher itself refuses
+
+    EXPRS = ('\\sin^2 x + \\cos^2 x', '(x+1)^2 - (y-2)^3 + \\sin 2t',
+             '4x^2 - 9', '\\cos 2a \\cdot \\ln(a b) + {(a+b)}^2',
+             'x^3 + 8', '2 \\sin x \\cos x', '\\frac{a^2-b^2}{\\cos^2 y}')
+
+    def test_the_index_never_rules_out_a_match(self):
+        for expr in self.EXPRS:
+            sym, notation = Core._normalize_powered_heads(*P.parse_latex(expr))
+            shapes = Core._NodeShapes(notation)
+            for lemma in Core.LEMMAS.values():
+                for direction in ('forward', 'backward'):
+                    for pattern in Core._LEMMA_INDEX.stages(lemma, direction):
+                        for node in [sym] + list(notation.rel):
+                            if shapes.admits(pattern, node):
+                                continue
+                            self.assertIsNone(
+                                pattern.match(node, notation),
+                                (expr, lemma.name, direction, pattern.stage))
+
+    def test_the_query_lists_what_rewrite_applies(self):
+        expr = '(x+1)^2 + \\sin 2t'
+        found = Core.list_lemmas(expr)
+        self.assertTrue(found['ok'])
+        pairs = {(l['name'], l['direction']) for l in found['lemmas']}
+        self.assertIn(('square_of_sum', 'forward'), pairs)
+        self.assertIn(('sin_double', 'forward'), pairs)
+        self.assertNotIn(('diff_cubes', 'forward'), pairs)
+        for name, direction in pairs:
+            self.assertTrue(Core.rewrite(expr, name, direction)['ok'],
+                            (name, direction))
+        self.assertFalse(Core.list_lemmas('\\frac{')['ok'])
+
+    def test_a_registered_lemma_joins_the_index(self):
+        expr = '\\tan^2 x'
+        self.assertEqual(Core.list_lemmas(expr)['lemmas'], [])
+        Core.register_lemma('g_tan_sq', '\\tan^2 a', '\\sec^2 a - 1', ['a'])
+        try:
+            self.assertEqual([l['name'] for l in
+                              Core.list_lemmas(expr)['lemmas']],
+                             ['g_tan_sq'])
+            self.assertTrue(Core.rewrite(expr, 'g_tan_sq')['ok'])
+        finally:
+            Core.LEMMAS.pop('g_tan_sq', None)
+        self.assertEqual(Core.list_lemmas(expr)['lemmas'], [])
+
+
+class TestLemmaPacks(unittest.TestCase):
+    PACK = {'version': 1, 'lemmas': [
+        {'name': 'g_tan_sq', 'lhs': '\\tan^2 a', 'rhs': '\\sec^2 a - 1',
+         'params': ['a'], 'description': 'tangent square'}]}
+
+    def setUp(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        self.folder = scratch.name
+        self.cache = os.path.join(self.folder, 'cache')
+        self.addCleanup(Core.LEMMAS.pop, 'g_tan_sq', None)
+
+    def write(self, document, name='pack.json'):
+        path = os.path.join(self.folder, name)
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(document, fh)
+        return path
+
+    def test_the_committed_packs_are_registered_and_hold(self):
+        names = {l['name'] for l in Core.list_lemmas()['lemmas']}
+        for name in ('sin_sum', 'cos_diff', 'hyperbolic_pythagorean'):
+            self.assertIn(name, names)
+        for name in ('sin_sum', 'sin_diff', 'cos_sum', 'cos_diff',
+                     'cos_double_sin', 'sinh_double'):
+            src = Core.LEMMAS[name].lhs.replace('a', 'x').replace('b', 'y')
+            r = Core.rewrite(src, name)
+            self.assertEqual(r['check']['status'], 'agree', name)
+
+    def test_a_pack_registers_and_rewrites(self):
+        path = self.write(self.PACK)
+        self.assertEqual(Core.load_lemma_pack(path, self.cache),
+                         ['g_tan_sq'])
+        r = Core.rewrite('\\tan^2 x', 'g_tan_sq')
+        self.assertTrue(r['ok'], r)
+
+    def test_a_warm_load_parses_nothing(self):
+        path = self.write(self.PACK)
+        Core.load_lemma_pack(path, self.cache)
+        self.assertEqual(len(os.listdir(self.cache)), 1)
+        Core.LEMMAS.pop('g_tan_sq')
+        with mock.patch.object(Core, '_read_pack',
+                               side_effect=AssertionError('parsed')), \
+                mock.patch.object(Core, 'parse_latex',
+                                  side_effect=AssertionError('parsed')):
+            Core.load_lemma_pack(path, self.cache)
+        self.assertTrue(Core.rewrite('\\tan^2 x', 'g_tan_sq')['ok'])
+
+    def test_an_edited_pack_is_recompiled(self):
+        path = self.write(self.PACK)
+        Core.load_lemma_pack(path, self.cache)
+        edited = json.loads(json.dumps(self.PACK))
+        edited['lemmas'][0]['rhs'] = '\\frac{1}{\\cos^2 a} - 1'
+        self.write(edited)
+        Core.load_lemma_pack(path, self.cache)
+        self.assertEqual(len(os.listdir(self.cache)), 2)
+        self.assertEqual(Core.LEMMAS['g_tan_sq'].rhs, edited['lemmas'][0]['rhs'])
+
+    def test_a_shared_cache_directory_is_never_read(self):
+        path = self.write(self.PACK)
+        Core.load_lemma_pack(path, self.cache)
+        os.chmod(self.cache, 0o777)
+        with mock.patch.object(Core.pickle, 'load',
+                               side_effect=AssertionError('unpickled')):
+            Core.load_lemma_pack(path, self.cache)
+        self.assertTrue(Core.rewrite('\\tan^2 x', 'g_tan_sq')['ok'])
+
+    def test_a_failed_write_leaves_no_file(self):
+        path = self.write(self.PACK)
+        with mock.patch.object(Core.pickle, 'dump',
+                               side_effect=Core.pickle.PicklingError('no')):
+            Core.load_lemma_pack(path, self.cache)
+        self.assertEqual(os.listdir(self.cache), [])
+        self.assertIn('g_tan_sq', Core.LEMMAS)
+
+    def test_importing_the_tactics_writes_no_cache(self):
+        here = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, HOME=self.folder, PYTHONPATH=os.pathsep.join(
+            [here, os.path.dirname(here)]))
+        env.pop('TOYMATH_LEMMA_CACHE', None)
+        home = os.path.join(self.folder, '.toymath')
+        subprocess.run([sys.executable, '-c', 'import tactics.core'],
+                       env=env, check=True)
+        self.assertFalse(os.path.exists(home))
+        probe = ('from tactics import core; '
+                 'print("sin_sum" in core.LEMMAS, end=""); '
+                 'core.list_lemmas(); '
+                 'print("", "sin_sum" in core.LEMMAS)')
+        out = subprocess.run([sys.executable, '-c', probe], env=env,
+                             capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.split(), ['False', 'True'])
+        self.assertTrue(os.listdir(os.path.join(home, 'lemma-cache')))
+
+    def test_the_fingerprints_cover_the_lexer(self):
+        self.assertIn('lexer.py', Core._PACK_SOURCES)
+        # an engine tree without a lemmas folder still has a fingerprint
+        root = os.path.join(self.folder, 'engine')
+        os.makedirs(os.path.join(root, 'tactics'))
+        for name in ('primitives.py', os.path.join('tactics', 'core.py')):
+            with open(os.path.join(root, name), 'w') as fh:
+                fh.write('# stand-in\n')
+        with mock.patch.object(P, '_ENGINE_FINGERPRINT', None), \
+                mock.patch.object(P, '__file__',
+                                  os.path.join(root, 'primitives.py')):
+            self.assertEqual(len(P.engine_fingerprint()), 64)
+
+    def test_a_malformed_pack_is_refused(self):
+        for document in ({'lemmas': []},
+                         {'version': 1, 'lemmas': [{'name': 'x'}]},
+                         {'version': 1, 'lemmas': [dict(
+                             self.PACK['lemmas'][0], lhs='\\frac{')]},
+                         {'version': 1, 'lemmas': [dict(
+                             self.PACK['lemmas'][0], when='always')]}):
+            with self.assertRaises(Core.LemmaPackError):
+                Core.load_lemma_pack(self.write(document), self.cache)
+        self.assertNotIn('g_tan_sq', Core.LEMMAS)
+
+
 class TestRewriteAs(unittest.TestCase):
     # gen 59: congruence with an agent-supplied witness. Reaches identities
     # with no registered lemma and spellings the structural matcher cannot
@@ -2095,6 +2424,181 @@ class TestParsingEdges(unittest.TestCase):
                                           '\\frac{13}{15}')['verdict'], 'yes')
 
 
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self._prev = (P.PARSE_CACHE.enabled, P.PARSE_CACHE.maxsize)
+        P.PARSE_CACHE.enabled = True
+        P.PARSE_CACHE.clear()
+
+    def tearDown(self):
+        P.PARSE_CACHE.enabled, P.PARSE_CACHE.maxsize = self._prev
+        P.PARSE_CACHE.clear()
+
+    def test_repeat_parse_is_a_hit_on_one_frozen_snapshot(self):
+        s1, n1 = P.parse_latex_frozen('x^{2}+1')
+        s2, n2 = P.parse_latex_frozen('x^{2}+1')
+        self.assertIs(n1, n2)
+        self.assertEqual(P.PARSE_CACHE.stats()['hits'], 1)
+        self.assertEqual(P.PARSE_CACHE.stats()['misses'], 1)
+
+    def test_frozen_snapshot_refuses_writes(self):
+        sym, n = P.parse_latex_frozen('x+1')
+        with self.assertRaises(TypeError):
+            n.setf(Notation.P_LIST, (sym,))
+        with self.assertRaises(TypeError):
+            n.rel[sym] = None
+
+    def test_instantiated_copy_writes_without_touching_the_snapshot(self):
+        sym, frozen = P.parse_latex_frozen('2 x y')
+        before = P.write_latex(sym, frozen)
+        sym2, mine = P.parse_latex('2 x y')
+        # the in-place edits the parser and cmd_mul make to a node
+        head = mine.get(sym2)
+        head.args.insert(0, Symbol('z'))
+        head.props['negative'] = True
+        self.assertNotIn('negative', frozen.get(sym).props)
+        self.assertEqual(P.write_latex(sym, frozen), before)
+        mine.clear()
+        self.assertTrue(mine.is_empty())
+        self.assertEqual(P.write_latex(sym, frozen), before)
+        sym3, again = P.parse_latex('2 x y')
+        self.assertEqual(P.write_latex(sym3, again), before)
+
+    def test_each_parse_gets_its_own_node_names(self):
+        # Replicator keeps node names, so two parses spliced into one
+        # notation must not share any (live: {int! f} - {int! f} lost its
+        # second constant to the first splice)
+        s1, n1 = P.parse_latex('x^{2}+C')
+        s2, n2 = P.parse_latex('x^{2}+C')
+        self.assertFalse(set(n1.rel) & set(n2.rel))
+        self.assertEqual(P.write_latex(s1, n1), P.write_latex(s2, n2))
+
+    def test_key_covers_ellipsis_and_command_flags(self):
+        P.parse_latex('1+2+\\ldots+n', allow_ellipsis=True)
+        with self.assertRaises(P.PrimitiveError):
+            P.parse_latex('1+2+\\ldots+n')
+        s1, n1 = P.parse_latex_frozen('go!')
+        s2, n2 = P.parse_latex_frozen('go!', command_names={'go'})
+        self.assertIsNot(n1, n2)
+
+    def test_lru_bound_evicts_oldest(self):
+        P.PARSE_CACHE.maxsize = 2
+        P.parse_latex('a')
+        P.parse_latex('b')
+        P.parse_latex('a')
+        P.parse_latex('c')
+        self.assertEqual(P.PARSE_CACHE.stats()['size'], 2)
+        P.parse_latex('b')
+        self.assertEqual(P.PARSE_CACHE.stats()['misses'], 4)
+
+    def test_disabled_cache_parses_afresh(self):
+        with P.parse_cache_disabled():
+            _, n1 = P.parse_latex_frozen('y-2')
+            _, n2 = P.parse_latex_frozen('y-2')
+        self.assertIsNot(n1, n2)
+        self.assertEqual(P.PARSE_CACHE.stats()['size'], 0)
+
+
+class TestVerdictCache(unittest.TestCase):
+    def setUp(self):
+        cache = P.VERDICT_CACHE
+        self._prev = (cache.enabled, cache.maxsize, cache.path)
+        cache.enabled = True
+        cache.attach(None)
+        cache.clear()
+
+    def tearDown(self):
+        cache = P.VERDICT_CACHE
+        cache.enabled, cache.maxsize, _ = self._prev
+        cache.attach(self._prev[2])
+        cache.clear()
+
+    def test_repeat_check_is_a_hit(self):
+        v1 = P.numeric_spot_check('(x+1)^2', 'x^2+2x+1')
+        v2 = P.numeric_spot_check('(x+1)^2', 'x^2+2x+1')
+        self.assertEqual(v1, v2)
+        self.assertEqual(P.VERDICT_CACHE.stats()['hits'], 1)
+        self.assertEqual(P.VERDICT_CACHE.stats()['misses'], 1)
+
+    def test_spelled_out_defaults_share_the_entry(self):
+        P.numeric_spot_check('\\sin x', '\\sin x')
+        P.numeric_spot_check('\\sin x', '\\sin x', None, samples=12)
+        self.assertEqual(P.VERDICT_CACHE.stats()['hits'], 1)
+        P.numeric_spot_check('\\sin x', '\\sin x', samples=5)
+        self.assertEqual(P.VERDICT_CACHE.stats()['misses'], 2)
+
+    def test_callers_get_their_own_copy(self):
+        v1 = P.numeric_spot_check('2x', 'x+x')
+        v1['status'] = 'scribbled'
+        v2 = P.numeric_spot_check('2x', 'x+x')
+        self.assertEqual(v2['status'], 'agree')
+
+    def test_tactic_checks_are_cached(self):
+        Differentiation._derivative_check('x^3', 'x', '3x^2')
+        Differentiation._derivative_check('x^3', 'x', '3x^2')
+        self.assertEqual(P.VERDICT_CACHE.stats()['hits'], 1)
+
+    def test_lru_bound_evicts_oldest(self):
+        P.VERDICT_CACHE.maxsize = 2
+        for a in ('x', 'y', 'x', 'z', 'y'):
+            P.numeric_spot_check(a, a)
+        self.assertEqual(P.VERDICT_CACHE.stats()['size'], 2)
+        self.assertEqual(P.VERDICT_CACHE.stats()['misses'], 4)
+
+    def test_disk_tier_survives_a_cleared_memory(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        P.VERDICT_CACHE.attach(scratch.name)
+        v1 = P.numeric_spot_check('x^2-1', '(x-1)(x+1)')
+        P.VERDICT_CACHE.clear()
+        with mock.patch.object(P, '_SampleStream',
+                               side_effect=AssertionError('re-ran')):
+            v2 = P.numeric_spot_check('x^2-1', '(x-1)(x+1)')
+        self.assertEqual(v1, v2)
+        self.assertEqual(P.VERDICT_CACHE.stats()['disk_hits'], 1)
+
+    def test_disk_tier_drops_the_least_recently_read(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        cache = P._VerdictCache(disk_maxsize=4)
+        cache.attach(scratch.name)
+        keys = [cache.key('check', {'n': n}) for n in range(4)]
+        for age, key in enumerate(keys):
+            cache.put(key, {'status': 'agree', 'n': age})
+            os.utime(cache._file(scratch.name, key), (age, age))
+        cache.clear()
+        self.assertEqual(cache.get(keys[0])['n'], 0)  # read: now the newest
+        cache.put(cache.key('check', {'n': 4}), {'status': 'agree'})
+        on_disk = sorted(os.path.basename(name)[:-5]
+                         for name in cache._disk_files(scratch.name))
+        self.assertEqual(len(on_disk), 3)
+        self.assertIn(keys[0], on_disk)
+        self.assertNotIn(keys[1], on_disk)
+        self.assertNotIn(keys[2], on_disk)
+
+    def test_eviction_clears_a_stale_fingerprint(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        stale = os.path.join(scratch.name, 'f' * 16, 'ab')
+        os.makedirs(stale)
+        with open(os.path.join(stale, 'ab.json'), 'w') as fh:
+            fh.write('{}')
+        os.utime(os.path.join(stale, 'ab.json'), (0, 0))
+        cache = P._VerdictCache(disk_maxsize=2)
+        cache.attach(scratch.name)
+        for n in range(2):
+            cache.put(cache.key('check', {'n': n}), {'status': 'agree'})
+        self.assertEqual(os.listdir(scratch.name),
+                         [P.engine_fingerprint()[:16]])
+
+    def test_disabled_cache_checks_afresh(self):
+        with P.verdict_cache_disabled():
+            P.numeric_spot_check('x', 'x')
+            P.numeric_spot_check('x', 'x')
+        self.assertEqual(P.VERDICT_CACHE.stats()['size'], 0)
+        self.assertEqual(P.VERDICT_CACHE.stats()['misses'], 0)
+
+
 class TestIntegration(unittest.TestCase):
     def ok(self, rec):
         self.assertTrue(rec['ok'], rec.get('error'))
@@ -2346,6 +2850,235 @@ class TestEqual(unittest.TestCase):
         self.assertEqual(Core.equal_exprs('x = 2', 'x + 2')['verdict'], 'no')
 
 
+class TestCompiledOracle(unittest.TestCase):
+    # numeric_eval is the compiled tree: a tree compiled afresh and one
+    # kept on a frozen snapshot read the same known values, and split
+    # failures into domain/oracle the same way
+    CASES = [
+        '\\frac{x^2+1}{x-1}+\\sin x - \\sqrt{y}',
+        '(x+y)^{16}',
+        '\\sum_{k=1}^{10} k x^k',
+        '\\prod_{k=1}^{y} x',
+        '\\ln(x) + |x| - \\lfloor y \\rfloor',
+        '\\sin^{2} x + \\cos^2 x',
+        '2\\sin 3x y',
+        'x!', '\\binom{5}{2} x', '\\frac{1}{x-x}', '\\sqrt[3]{x}',
+        'f(x)', 'x_{1}^2+x', 'e^{x}\\pi', '\\sqrt{x}\\ln y',
+        '\\sinh(800 x)', '\\frac{1}{x} + g(x)', 'g(x) + \\frac{1}{0 y}',
+        '\\begin{pmatrix}1&x\\\\y&2\\end{pmatrix}^2',
+        '\\begin{pmatrix}1&x\\end{pmatrix} + 1',
+    ]
+
+    # (latex, env, kind, value): kind None carries the value
+    KNOWN = [
+        ('\\frac{x^2+1}{x-1}+\\sin x - \\sqrt{y}', {'x': 2.0, 'y': 4.0},
+         None, 5 + math.sin(2) - 2),
+        ('\\frac{x^2+1}{x-1}+\\sin x - \\sqrt{y}', {'x': 1.0, 'y': 4.0},
+         'domain', None),
+        ('\\frac{x^2+1}{x-1}+\\sin x - \\sqrt{y}', {'x': 2.0, 'y': -1.0},
+         'domain', None),
+        ('(x+y)^{16}', {'x': 1.0, 'y': 1.0}, None, 65536.0),
+        ('\\sum_{k=1}^{10} k x^k', {'x': 2.0},
+         None, float(sum(k * 2 ** k for k in range(1, 11)))),
+        ('\\prod_{k=1}^{y} x', {'x': 3.0, 'y': 4.0}, None, 81.0),
+        ('\\ln(x) + |x| - \\lfloor y \\rfloor', {'x': 1.0, 'y': 2.5},
+         None, -1.0),
+        ('\\ln(x) + |x| - \\lfloor y \\rfloor', {'x': -1.0, 'y': 2.5},
+         'domain', None),
+        ('\\sin^{2} x + \\cos^2 x', {'x': 0.7}, None, 1.0),
+        ('2\\sin 3x y', {'x': 0.5, 'y': 2.0}, None, 2 * math.sin(3.0)),
+        ('x!', {'x': 5.0}, None, 120.0),
+        ('x!', {'x': 2.5}, 'domain', None),
+        ('\\binom{5}{2} x', {'x': 3.0}, None, 30.0),
+        ('\\frac{1}{x-x}', {'x': 1.0}, 'domain', None),
+        ('\\sqrt[3]{x}', {'x': 8.0}, None, 2.0),
+        ('\\sqrt[3]{x}', {'x': -8.0}, 'domain', None),
+        ('f(x)', {'x': 1.0}, 'oracle', None),
+        ('x_{1}^2+x', {'x_{1}': 3.0, 'x': 1.0}, None, 10.0),
+        ('e^{x}\\pi', {'x': 1.0}, None, math.e * math.pi),
+        ('\\sqrt{x}\\ln y', {'x': 4.0, 'y': 1.0}, None, 0.0),
+        ('\\sinh(800 x)', {'x': 1.0}, 'oracle', None),
+        ('\\frac{1}{x} + g(x)', {'x': 0.0}, 'domain', None),
+        ('g(x) + \\frac{1}{0 y}', {'y': 1.0}, 'oracle', None),
+        ('\\begin{pmatrix}1&x\\\\y&2\\end{pmatrix}^2', {'x': 1.0, 'y': 2.0},
+         None, [[3.0, 3.0], [6.0, 6.0]]),
+        ('\\begin{pmatrix}1&x\\end{pmatrix} + 1', {'x': 1.0}, 'oracle', None),
+    ]
+
+    def test_fresh_and_snapshot_trees_read_known_values(self):
+        for latex, env, kind, value in self.KNOWN:
+            sym, n = P.parse_latex(latex)
+            fsym, frozen = P.parse_latex_frozen(latex)
+            for evaluate in (P.compile_numeric(sym, n),
+                             P.compile_numeric(fsym, frozen)):
+                got_kind, got = P._compiled_kind(evaluate, env)
+                self.assertEqual(got_kind, kind, (latex, env))
+                if isinstance(value, list):
+                    self.assertEqual(got, value, (latex, env))
+                elif value is not None:
+                    self.assertAlmostEqual(got, value, delta=1e-12 * max(
+                        1.0, abs(value)), msg=(latex, env))
+
+    def test_a_cached_failure_does_not_grow_its_traceback(self):
+        import traceback
+        sym, frozen = P.parse_latex_frozen('\\operatorname{foo}(x)+1')
+        evaluate = P.compile_numeric(sym, frozen)
+        caught = []
+        for _ in range(50):
+            try:
+                evaluate({'x': 1.0})
+            except P.EvalError as e:
+                caught.append(e)
+        self.assertEqual(len(caught), 50)
+        self.assertIsNot(caught[0], caught[-1])
+        self.assertLess(len(traceback.extract_tb(caught[-1].__traceback__)),
+                        10)
+
+    def test_failures_keep_evaluation_order(self):
+        # the pole is reached before the unknown function: 'domain', not
+        # the 'oracle' a compile-time refusal would give
+        sym, n = P.parse_latex('\\frac{1}{x-x} + g(x)')
+        evaluate = P.compile_numeric(sym, n)
+        self.assertEqual(P._compiled_kind(evaluate, {'x': 1.0})[0], 'domain')
+        sym, n = P.parse_latex('g(x) + \\frac{1}{x-x}')
+        evaluate = P.compile_numeric(sym, n)
+        self.assertEqual(P._compiled_kind(evaluate, {'x': 1.0})[0], 'oracle')
+
+    def test_frozen_snapshot_keeps_its_compiled_tree(self):
+        sym, frozen = P.parse_latex_frozen('x^{3} - 2x')
+        self.assertIs(P.compile_numeric(sym, frozen),
+                      P.compile_numeric(sym, frozen))
+        self.assertEqual(P.numeric_eval(sym, frozen, {'x': 2.0}), 4.0)
+
+    def test_overflow_saturation_is_read_per_call(self):
+        sym, n = P.parse_latex('\\frac{1}{\\cosh^{3}(300)}')
+        evaluate = P.compile_numeric(sym, n)
+        self.assertEqual(P._compiled_kind(evaluate, {})[0], 'oracle')
+        with P._overflow_saturation():
+            self.assertEqual(evaluate({}), 0.0)
+
+
+@unittest.skipIf(P.np is None, 'numpy is not installed')
+class TestBatchOracle(unittest.TestCase):
+    # compile_batch must classify every point as _eval_kind does, with
+    # values equal up to the libm's last bit
+    CASES = TestCompiledOracle.CASES + [
+        '\\ln(x) + \\ln(-x)', '\\arcsin(x) + \\cot(y)',
+        '\\sec x \\csc y + \\coth(x y)', '\\exp(400 x) - \\tan y',
+        'x^{y}', '(x-y)^{-2}', '\\sqrt[x]{y}', '\\lceil x y \\rceil!',
+        '\\binom{\\lfloor 4 x \\rfloor}{2}', '\\log(x^2) \\sinh(y)',
+        '\\sum_{k=0}^{5} \\frac{x^k}{k!}',
+    ]
+
+    def _points(self, rng, count):
+        points = [P._sample_point(['x', 'y', 'x_{1}'], rng)
+                  for _ in range(count)]
+        # exact poles and integers, which random jitter never hits
+        points += [{'x': 0.0, 'y': 0.0, 'x_{1}': 0.0},
+                   {'x': 1.0, 'y': -1.0, 'x_{1}': 2.0},
+                   {'x': -3.0, 'y': 3.0, 'x_{1}': -0.5}]
+        return points
+
+    def test_matches_the_scalar_oracle_pointwise(self):
+        import random
+        rng = random.Random(11)
+        batched = 0
+        for latex in self.CASES:
+            sym, n = P.parse_latex(latex)
+            batch = P.compile_batch(sym, n)
+            if batch is None:
+                continue
+            batched += 1
+            envs = self._points(rng, 40)
+            got = P._batch_kinds(batch, P.compile_numeric(sym, n), envs)
+            for env, (kind, value) in zip(envs, got):
+                want = P._eval_kind(sym, n, env)
+                self.assertEqual(kind, want[0], (latex, env))
+                if kind is None:
+                    if math.isnan(want[1]):
+                        self.assertTrue(math.isnan(value), (latex, env))
+                    else:
+                        self.assertAlmostEqual(
+                            value, want[1],
+                            delta=1e-12 * max(1.0, abs(want[1])),
+                            msg=(latex, env))
+        self.assertGreater(batched, len(self.CASES) - 5)
+
+    def test_status_mask_over_columns(self):
+        np = P.np
+        sym, n = P.parse_latex('\\frac{\\ln x}{x-2}')
+        values, status = P.compile_batch(sym, n)(
+            {'x': np.array([1.0, 2.0, -1.0, 3.0])}, 4)
+        self.assertEqual(status.tolist(), [0, 1, 1, 0])
+        self.assertEqual(values[0], 0.0)
+        self.assertAlmostEqual(values[3], math.log(3.0))
+
+    def test_scalar_fallbacks(self):
+        for latex in ('\\begin{pmatrix}1&x\\\\y&2\\end{pmatrix}^2',
+                      '\\sum_{k=1}^{y} k x'):
+            sym, n = P.parse_latex(latex)
+            self.assertIsNone(P.compile_batch(sym, n), latex)
+        # a declined tree still classifies, one point at a time
+        sym, n = P.parse_latex('\\prod_{k=1}^{y} x')
+        envs = [{'x': 2.0, 'y': 3.0}, {'x': 2.0, 'y': 2.5}]
+        self.assertEqual(P._batch_kinds(None, P.compile_numeric(sym, n),
+                                        envs),
+                         [(None, 8.0), ('oracle', None)])
+
+    def test_overflow_saturation_is_read_per_call(self):
+        np = P.np
+        sym, n = P.parse_latex('\\frac{1}{\\cosh^{3}(x)}')
+        batch = P.compile_batch(sym, n)
+        column = {'x': np.array([300.0, 0.0])}
+        self.assertEqual(batch(column, 2)[1].tolist(), [2, 0])
+        with P._overflow_saturation():
+            values, status = batch(column, 2)
+        self.assertEqual(status.tolist(), [0, 0])
+        self.assertEqual(values.tolist(), [0.0, 1.0])
+
+    def test_checks_keep_their_verdicts(self):
+        r = P.numeric_spot_check('\\frac{x^2-1}{x-1}', 'x+1')
+        self.assertEqual(r['status'], 'agree')
+        self.assertEqual(r['samples'], 12)
+        r = P.numeric_spot_check('\\ln(x^2)', '2\\ln x')
+        self.assertEqual(r['status'], 'domain-differs')
+        r = P.numeric_relation_check('x < y', '-x > -y')
+        self.assertEqual(r['status'], 'agree')
+        r = P.numeric_relation_check('x < y', '-x < -y')
+        self.assertEqual(r['status'], 'disagree')
+
+
+class TestQuadratureGrids(unittest.TestCase):
+    # the shared-grid passes must reproduce the per-call passes bit for
+    # bit: the improper ladders compare against their residuals
+
+    def test_grid_pairs_are_two_simpson_passes(self):
+        for latex, lo, hi in (('e^{-x^2} \\sin(3x)', -1.3, 2.7),
+                              ('\\frac{1}{x-1}', 0.0, 3.0),
+                              ('\\sqrt{x}', -1.0, 1.0),
+                              ('\\ln(x) g(x)', 0.5, 1.5)):
+            fs, fn = P.parse_latex(latex)
+            spans = [(lo, hi), (hi, lo), (lo, lo + 1e-7)]
+            grids = P._simpson_grids(fs, fn, 'x', spans, {}, 16)
+            for (a, b), (coarse, fine) in zip(spans, grids):
+                self.assertEqual(coarse, P._simpson_panels(
+                    fs, fn, 'x', a, b, {}, 16), (latex, a, b))
+                self.assertEqual(fine, P._simpson_panels(
+                    fs, fn, 'x', a, b, {}, 32), (latex, a, b))
+
+    def test_batched_graded_quadratures_match_single_calls(self):
+        fs, fn = P.parse_latex('\\frac{a}{t^2}')
+        env = {'a': 1.5}
+        intervals = [(0.01, 1.0), (1.0, 1.0), (3.0, 0.2), (1.0, 1e3)]
+        self.assertEqual(
+            P._graded_quadratures(fs, fn, 't', intervals, env),
+            [P._graded_quadrature(fs, fn, 't', lo, hi, env)
+             for lo, hi in intervals])
+        with self.assertRaises(P.EvalError):
+            P._graded_quadratures(fs, fn, 't', [(1.0, 2.0), (-1.0, 1.0)],
+                                  env)
+
+
 class TestDomainAwareOracle(unittest.TestCase):
     # gen 9: a sample point where exactly one side is defined is a
     # definedness witness — the sides differ as real functions
@@ -2925,12 +3658,218 @@ class TestLedger(unittest.TestCase):
         ledger.record(Core.expand('(y+1)^2'))
         self.assertFalse(ledger.steps[1]['continues'])
 
+    def _three_step_ledger(self):
+        ledger = Ledger()
+        r1 = Core.apply_both_sides('2x + 3 = 7', '-', '3')
+        ledger.record(r1)
+        ledger.record(Core.expand(r1['result']))
+        ledger.record(Core.expand('(x+1)^{3}'))
+        return ledger
+
+    def test_parallel_replay_matches_serial(self):
+        ledger = self._three_step_ledger()
+        serial = ledger.replay()
+        self.assertEqual(ledger.replay(workers=2), serial)
+        for degree in range(2, 9):
+            ledger.record(Core.expand(f'(x+y)^{{{degree}}}'))
+        serial = ledger.replay()
+        self.assertEqual(ledger.replay(workers=2), serial)
+        ledger.steps[1]['result'] = 'x = 5'
+        serial = ledger.replay()
+        self.assertEqual(serial['status'], 'failed')
+        self.assertEqual(serial['reason'], 'result mismatch')
+        self.assertEqual(ledger.replay(workers=2), serial)
+
+    def test_replay_cache_skips_steps_verified_before(self):
+        from unittest import mock
+        cache = ledger_module.ReplayCache(tempfile.mkdtemp())
+        ledger = self._three_step_ledger()
+        first = ledger.replay(cache=cache)
+        self.assertEqual(first['status'], 'verified')
+        self.assertEqual((first['cached'], first['verified']), (0, 3))
+        with mock.patch.object(ledger_module, '_verify_transform') as run:
+            again = ledger.replay(cache=cache)
+        run.assert_not_called()
+        self.assertEqual((again['cached'], again['verified']), (3, 0))
+        full = ledger.replay(cache=cache, full=True)
+        self.assertEqual((full['cached'], full['verified']), (0, 3))
+
+    def test_replay_cache_never_vouches_for_an_edited_step(self):
+        cache = ledger_module.ReplayCache(tempfile.mkdtemp())
+        ledger = self._three_step_ledger()
+        ledger.replay(cache=cache)
+        ledger.steps[2]['result'] = 'x^{3}+1'
+        for _ in range(2):
+            report = ledger.replay(cache=cache)
+            self.assertEqual(report['status'], 'failed')
+            self.assertEqual(report['step'], ledger.steps[2]['id'])
+
+    def _read(self, path):
+        with open(path, 'r', encoding='utf-8') as fh:
+            return fh.read()
+
+    def test_save_appends_only_what_was_recorded(self):
+        path = os.path.join(tempfile.mkdtemp(), 'session.json')
+        ledger = Ledger(path)
+        r1 = Core.apply_both_sides('2x + 3 = 7', '-', '3')
+        ledger.record(r1)
+        ledger.save()
+        before = self._read(path)
+        self.assertTrue(before.startswith('{"version": 3'))
+        ledger.record(Core.expand(r1['result']))
+        ledger.record_claim('x = 2')
+        ledger.save()
+        after = self._read(path)
+        self.assertTrue(after.startswith(before))
+        self.assertEqual(len(after.splitlines()),
+                         len(before.splitlines()) + 2)
+        again = Ledger(path)
+        self.assertEqual(again.data, ledger.data)
+        self.assertEqual(again.replay()['status'], 'verified')
+
+    def test_unread_sections_stay_encoded(self):
+        path = os.path.join(tempfile.mkdtemp(), 'session.json')
+        ledger = Ledger(path)
+        ledger.record(Core.expand('(x+1)^2'))
+        ledger.save()
+        again = Ledger(path)
+        again.record_claim('x = 1')
+        again.save()
+        self.assertTrue(again.data.pending('steps'))
+        self.assertEqual(len(Ledger(path).claims), 1)
+        self.assertEqual(Ledger(path).steps, ledger.steps)
+
+    def test_mapped_log_is_released_on_compact_and_close(self):
+        path = os.path.join(tempfile.mkdtemp(), 'session.json')
+        ledger = Ledger(path)
+        ledger.record(Core.expand('(x+1)^2'))
+        ledger.save()
+        again = Ledger(path)
+        buf = again.data._buf
+        again.compact()
+        self.assertTrue(buf.closed)
+        self.assertEqual(again.steps, ledger.steps)
+        dropped = Ledger(path)
+        buf = dropped.data._buf
+        dropped.close()
+        self.assertTrue(buf.closed)
+
+    def test_a_refused_log_releases_its_map(self):
+        import mmap
+        path = os.path.join(tempfile.mkdtemp(), 'session.json')
+        header = json.dumps(ledger_module._LOG_HEADER) + '\n'
+        newer = dict(ledger_module._LOG_HEADER,
+                     version=ledger_module.LEDGER_VERSION + 1)
+        maps = []
+        mapping = mmap.mmap
+
+        def recorded(*args, **kwargs):
+            maps.append(mapping(*args, **kwargs))
+            return maps[-1]
+        for body, refused in (('{"steps": []}', None),
+                              (json.dumps(newer) + '\n', ValueError),
+                              (header + 'not a record\n', ValueError),
+                              (header + '{"k":"zz","v":1}\n', ValueError)):
+            with open(path, 'w', encoding='utf-8') as fh:
+                fh.write(body)
+            with mock.patch.object(ledger_module.mmap, 'mmap', recorded):
+                if refused is None:
+                    self.assertIsNone(ledger_module._read_log(path))
+                else:
+                    with self.assertRaises(refused):
+                        ledger_module._read_log(path)
+            self.assertTrue(maps[-1].closed, body)
+        self.assertEqual(len(maps), 4)
+
+    def test_umask_is_read_without_setting_it(self):
+        if not os.path.exists('/proc/self/status'):
+            self.skipTest('no /proc')
+        with mock.patch.object(ledger_module.os, 'umask',
+                               side_effect=AssertionError('umask set')):
+            mask = ledger_module._read_umask()
+        self.assertEqual(mask, ledger_module._UMASK)
+
+    def test_indexes_follow_appends_and_reloads(self):
+        path = os.path.join(tempfile.mkdtemp(), 'session.json')
+        ledger = Ledger(path)
+        source = ledger.record(Core.expand('(x+1)^2'))
+        marker = ledger.record_branch(source['id'], 'try another route')
+        self.assertIs(ledger._pending_branch(None), marker)
+        claim = ledger.record_claim('x = 1')
+        self.assertIs(ledger.get_claim(claim['id']), claim)
+        ledger.save()
+
+        again = Ledger(path)
+        self.assertEqual(again._pending_branch(None), marker)
+        self.assertEqual(again.last_result(), source['result'])
+        target = again.record(Core.expand(source['input']))
+        self.assertIsNone(again._pending_branch(None))
+        self.assertEqual(again.last_result(), target['result'])
+        self.assertEqual([e['to'] for e in again.branch_edges()],
+                         [target['id']])
+        self.assertEqual(again.get_claim(claim['id']), claim)
+        self.assertIsNone(again.get_claim('c999'))
+
+    def test_indexes_rebuild_when_the_lists_are_replaced(self):
+        ledger = Ledger()
+        first = ledger.record(Core.expand('(x+1)^2'))
+        ledger.record(Core.apply_both_sides('x y = 1', '/', 'y'))
+        ledger.record(Core.apply_both_sides('x y = 1', '/', 'y'))
+        self.assertEqual(len(ledger.assumptions), 1)
+        ledger.data['steps'] = ledger.steps[:1]
+        self.assertEqual(ledger.last_result(), first['result'])
+        ledger.data['assumptions'] = []
+        ledger.record(Core.apply_both_sides('x y = 1', '/', 'y'))
+        self.assertEqual(len(ledger.assumptions), 1)
+
+    def test_changed_claims_are_relogged_and_compacted(self):
+        from unittest import mock
+        path = os.path.join(tempfile.mkdtemp(), 'session.json')
+        ledger = Ledger(path)
+        claim = ledger.record_claim('x = 1')
+        ledger.save()
+        with mock.patch.object(ledger_module, '_COMPACT_STALE', 2):
+            for verdict in ('proved', 'open', 'proved'):
+                claim['verdict'] = verdict
+                ledger.save()
+                self.assertEqual(Ledger(path).claims, [claim])
+        # three re-logged versions crossed the limit: one line per record
+        self.assertEqual(len(self._read(path).splitlines()), 2)
+
+    def test_torn_append_is_ignored_then_rewritten(self):
+        path = os.path.join(tempfile.mkdtemp(), 'session.json')
+        ledger = Ledger(path)
+        ledger.record(Core.expand('(x+1)^2'))
+        ledger.save()
+        with open(path, 'a', encoding='utf-8') as fh:
+            fh.write('{"k":"step","v":{"id":"s2"')
+        again = Ledger(path)
+        self.assertEqual(again.steps, ledger.steps)
+        again.record(Core.expand('(y+1)^2'))
+        again.save()
+        self.assertEqual(len(Ledger(path).steps), 2)
+        self.assertTrue(self._read(path).endswith('\n'))
+
+    def test_v2_session_upgrades_on_save(self):
+        path = os.path.join(tempfile.mkdtemp(), 'session.json')
+        ledger = Ledger()
+        ledger.record(Core.expand('(x+1)^2'))
+        data = dict(ledger.data, version=2)
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, indent=1)
+        legacy = Ledger(path)
+        self.assertEqual(legacy.steps, ledger.steps)
+        self.assertEqual(legacy.replay()['status'], 'verified')
+        legacy.save()
+        self.assertTrue(self._read(path).startswith('{"version": 3'))
+        self.assertEqual(Ledger(path).steps, ledger.steps)
+
     def test_v1_session_upgrades_in_memory(self):
         path = os.path.join(tempfile.mkdtemp(), 'session.json')
         with open(path, 'w', encoding='utf-8') as fh:
             json.dump({'version': 1, 'steps': [], 'assumptions': []}, fh)
         ledger = Ledger(path)
-        self.assertEqual(ledger.data['version'], 2)
+        self.assertEqual(ledger.data['version'], 3)
         self.assertEqual(ledger.claims, [])
         self.assertEqual(ledger.selections, [])
         self.assertEqual(ledger.replay()['status'], 'verified')
@@ -3202,6 +4141,79 @@ class TestDisagreementNeedsEvidence(unittest.TestCase):
         self.assertTrue(
             P._disagreement_resolves(s1, n1, s2, n2, env, v1, v2))
 
+    def test_exact_evaluation_stays_rational_on_the_polynomial_fragment(self):
+        from fractions import Fraction
+        env = {'x': 2.0006072315296617, 'y': -2.33288936992431}
+        s1, n1 = P.parse_latex('(x+y)^{16}')
+        s2, n2 = P.parse_latex(Core.expand('(x+y)^{16}')['result'])
+        v1 = P.exact_eval(s1, n1, env)
+        self.assertIsInstance(v1, Fraction)
+        self.assertEqual(v1, (Fraction(env['x']) + Fraction(env['y'])) ** 16)
+        self.assertEqual(P.exact_eval(s2, n2, env), v1)
+        self.assertIs(P._exact_agree(s1, n1, s2, n2, env), True)
+        s3, n3 = P.parse_latex('\\frac{x!}{\\binom{6}{2}} - 0.1')
+        self.assertEqual(P.exact_eval(s3, n3, {'x': 5.0}),
+                         Fraction(8) - Fraction(1, 10))
+        # a transcendental node hands its subtree to the float oracle
+        s4, n4 = P.parse_latex('x^{2} + \\sin x')
+        self.assertIsInstance(P.exact_eval(s4, n4, env), float)
+        self.assertIsNone(P._exact_agree(s1, n1, s4, n4, env))
+
+    def test_cancellation_heavy_check_decides_without_retries(self):
+        good = Core.expand('(x+y)^{16}')['result']
+        result = P.numeric_spot_check('(x+y)^{16}', good)
+        self.assertEqual(result['status'], 'agree')
+        self.assertNotIn('unresolved_points', result)
+        self.assertEqual(
+            P.numeric_spot_check('(x+y)^{16}',
+                                 good.replace('12870', '12871'))['status'],
+            'disagree')
+
+    def _nudged(self, sym, notation, env, value):
+        worst = 0.0
+        for key, coord in env.items():
+            for toward in (math.inf, -math.inf):
+                nudged = dict(env, **{key: math.nextafter(coord, toward)})
+                worst = max(worst, abs(
+                    P.numeric_eval(sym, notation, nudged) - value))
+        return worst
+
+    def test_tracked_noise_bounds_the_nudge_in_one_pass(self):
+        env = {'x': 2.0006072315296617, 'y': -2.33288936992431,
+               'z': 0.5003}
+        for latex in ('(x+y)^{16}', Core.expand('(x+y)^{16}')['result'],
+                      '\\frac{\\sin(xy)}{z} + \\sqrt{x} - \\ln z',
+                      '\\exp(x) \\cos(y)^{2} + \\sqrt[3]{x+z}'):
+            sym, notation = P.parse_latex(latex)
+            value = P.numeric_eval(sym, notation, env)
+            tracked = P._tracked_noise(
+                lambda e: P.numeric_eval(sym, notation, e), env)
+            self.assertIsNotNone(tracked, latex)
+            nudged = self._nudged(sym, notation, env, value)
+            self.assertGreaterEqual(tracked, nudged, latex)
+            self.assertLess(tracked, 1e4 * max(nudged, 1e-15 * abs(value)),
+                            latex)
+
+    def test_untracked_pipeline_falls_back_to_nudging(self):
+        calls = []
+
+        def quiet(point):
+            calls.append(point)
+            return 1.0, 5.0 + (point['x'] - 2.0)
+        self.assertTrue(P._composite_disagreement_resolves(
+            quiet, {'x': 2.0}, 1.0, 5.0))
+        self.assertEqual(len(calls), 1)
+        calls.clear()
+
+        def pipeline(point):
+            calls.append(point)
+            return 1.0, math.exp(point['x'])
+        self.assertIsNone(P._tracked_noise(pipeline, {'x': 2.0}))
+        calls.clear()
+        self.assertTrue(P._composite_disagreement_resolves(
+            pipeline, {'x': 2.0}, 1.0, math.exp(2.0)))
+        self.assertEqual(len(calls), 3)     # one tracked try, two nudges
+
 
 class TestAssembledAnswerNeedsEvidenceToo(unittest.TestCase):
     # The same discipline on the leg that checks an ASSEMBLED answer, where
@@ -3804,6 +4816,52 @@ class TestDerivativeCheckNearPoles(unittest.TestCase):
         self.assertEqual(c['status'], 'disagree')
 
 
+class TestDualNumberOracle(unittest.TestCase):
+    def slope(self, latex, env, var='x'):
+        sym, notation = P.parse_latex_frozen(latex)
+        return P.dual_eval(sym, notation, env, var)
+
+    def test_slopes_match_the_closed_forms(self):
+        x = 0.7
+        for latex, want in (
+                ('x^x', x ** x * (math.log(x) + 1)),
+                ('\\sin^{2}(3x)', 3 * math.sin(6 * x)),
+                ('\\frac{1}{(1+x)^2}', -2 / (1 + x) ** 3),
+                ('\\sqrt[3]{x^2+1}', 2 * x / 3 * (x * x + 1) ** (-2 / 3)),
+                ('\\arctan(x^2)', 2 * x / (1 + x ** 4)),
+                ('x y^2', 1.69)):
+            value, slope = self.slope(latex, {'x': x, 'y': 1.3})
+            self.assertAlmostEqual(slope, want, places=12, msg=latex)
+
+    def test_only_the_chosen_variable_moves(self):
+        self.assertEqual(self.slope('x y^2', {'x': 2.0, 'y': 3.0}, 'y'),
+                         (18.0, 12.0))
+
+    def test_nonsmooth_nodes_leave_the_fragment(self):
+        for latex in ('\\left|x\\right|', '\\lfloor x\\rfloor + x',
+                      '\\sum_{k=1}^{3} k x^k'):
+            with self.assertRaises(P.EvalError, msg=latex):
+                self.slope(latex, {'x': 0.7})
+
+    def test_check_runs_one_pass_per_point(self):
+        with P.verdict_cache_disabled(), \
+                mock.patch.object(Differentiation, 'numeric_eval',
+                                  wraps=Differentiation.numeric_eval) as ev:
+            c = Differentiation._derivative_check('e^{x}\\sin x',
+                                    'e^{x}(\\sin x+\\cos x)', 'x')
+        self.assertEqual(c['status'], 'agree')
+        self.assertEqual(c['method'], 'dual-number')
+        self.assertEqual(ev.call_count, c['samples'])  # f' only
+
+    def test_nonsmooth_expression_falls_back_to_differences(self):
+        with P.verdict_cache_disabled():
+            c = Differentiation._derivative_check(
+                '\\left|x\\right| + x^2', '\\frac{x}{\\left|x\\right|} + 2x',
+                'x')
+        self.assertEqual(c['status'], 'agree')
+        self.assertEqual(c['method'], 'central-difference')
+
+
 class TestTextbookDifferential(unittest.TestCase):
     def test_dx_in_numerator(self):
         r = Integration.integrate_power_rule('\\int \\frac{dx}{x^2}', 'x')
@@ -4503,6 +5561,66 @@ class TestSumOracle(unittest.TestCase):
             Core.equal_exprs('\\sum_{k=1}^{4} 2k', '20')['verdict'], 'yes')
 
 
+class TestBigOperatorPrefixes(unittest.TestCase):
+    def values(self, latex, env=None):
+        sym, notation = P.parse_latex(latex)
+        return P.numeric_eval(sym, notation, env or {})
+
+    def test_running_totals_serve_every_upper_bound(self):
+        sym, notation = P.parse_latex('\\sum_{k=2}^{n} k^2')
+        lo, totals = P.bigop_prefixes(sym, notation, {}, 6, 'n')
+        self.assertEqual(lo, 2)
+        self.assertEqual(totals, [0.0, 4.0, 13.0, 29.0, 54.0, 90.0])
+
+    def test_bound_inside_the_body_is_refused(self):
+        sym, notation = P.parse_latex('\\sum_{k=1}^{n} (n-k)')
+        with self.assertRaises(P.EvalError):
+            P.bigop_prefixes(sym, notation, {}, 6, 'n')
+
+    def test_long_sum_is_compensated(self):
+        # 0.1 is not a binary fraction: a plain loop drifts by ~1e-10 here
+        self.assertEqual(self.values('\\sum_{k=1}^{100000} 0.1'),
+                         math.fsum([0.1] * 100000))
+
+    def test_vectorized_and_scalar_paths_agree(self):
+        latex = '\\sum_{k=1}^{500} \\frac{\\sin(k a)}{k}'
+        vectorized = self.values(latex, {'a': 0.3})
+        with mock.patch.object(P, '_batch_body', return_value=None):
+            scalar = self.values(latex, {'a': 0.3})
+        self.assertAlmostEqual(vectorized, scalar, places=12)
+
+    def test_a_failing_term_raises_as_the_loop_does(self):
+        with self.assertRaises(ZeroDivisionError):
+            self.values('\\sum_{k=-50}^{50} \\frac{1}{k}')
+        with self.assertRaises(ValueError):
+            self.values('\\sum_{k=1}^{60} \\ln(40-k)')
+
+    def test_product_keeps_the_loop_order(self):
+        self.assertEqual(
+            self.values('\\prod_{k=1}^{40} (1+\\frac{1}{k})'),
+            math.prod(1 + 1 / k for k in range(1, 41)))
+
+    def test_check_reads_one_pass(self):
+        compile_numeric = FiniteOperators.compile_numeric
+        calls = []
+
+        def counting(sym, notation):
+            evaluate = compile_numeric(sym, notation)
+
+            def run(env):
+                calls.append(sym)
+                return evaluate(env)
+            return run
+        with P.verdict_cache_disabled(), \
+                mock.patch.object(FiniteOperators, 'compile_numeric',
+                                  counting):
+            c = FiniteOperators._finite_sum_check(
+                '\\sum_{k=1}^{n} k^3', '\\frac{n^2(n+1)^2}{4}', 'n', 1)
+        self.assertEqual(c['status'], 'agree')
+        self.assertEqual(len(calls), 7)   # the closed form only
+        self.assertEqual(len(set(calls)), 1)
+
+
 class TestSumFromEllipsis(unittest.TestCase):
     def test_interprets_inside_limit_binder(self):
         rec = FiniteOperators.sum_from_ellipsis(TELESCOPING_LIMIT, TELESCOPING_SUM_FORM)
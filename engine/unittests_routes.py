@@ -296,6 +296,55 @@ class TestMatcher(unittest.TestCase):
         self.assertEqual(
             strategy_routes.match('x', path=os.path.join(folder, 'gone')), ())
 
+    def test_the_compiled_matcher_agrees_with_the_predicates(self):
+        routes = strategy_routes.load()
+        matcher = strategy_routes.compile_routes(routes)
+        for entry in strategy_routes.fixtures().values():
+            for text in entry['positive'] + entry['negative']:
+                vector = strategy_routes.features(text)
+                self.assertEqual(
+                    matcher(text),
+                    tuple(r for r in routes
+                          if strategy_routes.matches(r, vector)))
+
+    def test_a_refused_shape_never_reaches_the_parser_leg(self):
+        with mock.patch.object(strategy_routes, '_parameter_constraints',
+                               side_effect=AssertionError('parsed')):
+            self.assertEqual(
+                strategy_routes.match(r'find A, B and C if n > 1 (compiled)'),
+                ())
+
+    def test_features_are_extracted_once_per_instruction(self):
+        text = r'\int f dx = \int g dx + x^2, n > 1 (memoized)'
+        calls = []
+        original = strategy_routes._parameter_constraints
+
+        def counted(value):
+            calls.append(value)
+            return original(value)
+
+        with mock.patch.object(strategy_routes, '_parameter_constraints',
+                               counted):
+            first = strategy_routes.features(text)
+            self.assertEqual(strategy_routes.features(text), first)
+        self.assertEqual(calls, [text])
+
+    def test_an_edited_route_file_is_recompiled(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'routes.yaml')
+            route = ('version: 1\nroutes:\n- id: r\n  summary: s\n'
+                     '  match: {all: [{feature: %s, min: 1}]}\n'
+                     '  stages: [{id: a, action: control, tool: comment}]\n')
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write(route % 'indefinite_integral_count')
+            self.assertEqual(len(strategy_routes.match(r'\int f', path=path)),
+                             1)
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write(route % 'definite_integral_count')
+            stamp = os.path.getmtime(path) + 5
+            os.utime(path, (stamp, stamp))
+            self.assertEqual(strategy_routes.match(r'\int f', path=path), ())
+
 
 class TestRendering(unittest.TestCase):
     def setUp(self):
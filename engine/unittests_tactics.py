@@ -4,6 +4,8 @@
 import io
 import json
 import os
+import subprocess
+import sys
 import tempfile
 import unittest
 from contextlib import redirect_stdout
@@ -89,11 +91,12 @@ class TestTacticRegistry(unittest.TestCase):
 
     def test_runtime_tool_surface_is_constant_and_small(self):
         tools = agent_do.make_tools(agent_do.DoSession())
-        # seven fixed non-plot tools: six since gen 27 plus the run-level
-        # open-outcome control. Tactic growth must never grow this list.
+        # eight fixed non-plot tools: six since gen 27, the run-level
+        # open-outcome control, and the batch dispatcher. Tactic growth must
+        # never grow this list.
         self.assertEqual([tool.name for tool in tools], [
-            'load_skill', 'run_tactic', 'comment', 'claim', 'conclude',
-            'set_result', 'set_open'])
+            'load_skill', 'run_tactic', 'run_tactics', 'comment', 'claim',
+            'conclude', 'set_result', 'set_open'])
         prompt = agent_do.build_prompt()
         payload_chars = len(prompt)
         payload_chars += sum(len(json.dumps(tool.params_json_schema,
@@ -186,6 +189,25 @@ class TestTacticRegistry(unittest.TestCase):
                          {'roots': 's2', 'values': ['s3', 's4']})
         self.assertEqual(Ledger(path).replay()['status'], 'verified')
 
+    def test_cli_verdict_cache_sits_beside_the_session(self):
+        cache = primitives.VERDICT_CACHE
+        self.addCleanup(cache.attach, cache.path)
+        folder = tempfile.mkdtemp()
+        path = os.path.join(folder, 'work.json')
+        with redirect_stdout(io.StringIO()):
+            code = toymath_cli.main(['expand', '(x+2)^2', '--session', path,
+                                     '--verdict-cache'])
+        self.assertEqual(code, 0)
+        store = os.path.join(folder, '.toymath-verdicts')
+        self.assertEqual(cache.path, store)
+        self.assertTrue(any(name.endswith('.json')
+                            for _, _, names in os.walk(store)
+                            for name in names))
+        # the next run without the flag leaves the folder alone
+        with redirect_stdout(io.StringIO()):
+            toymath_cli.main(['expand', '(x+3)^2', '--session', path])
+        self.assertIsNone(cache.path)
+
     def test_cli_integrate_improper_reads_recorded_steps(self):
         from ledger import Ledger
         from tactics import core, integration, limits
@@ -466,6 +488,49 @@ class TestTacticRegistry(unittest.TestCase):
         self.assertEqual(loaded.steps[-1]['op'], 'branch')
         self.assertEqual(loaded.replay()['status'], 'verified')
 
+    def test_cli_batch_records_the_pipeline_all_or_nothing(self):
+        from ledger import Ledger
+
+        path = os.path.join(tempfile.mkdtemp(), 'batch.json')
+        calls = [['expand', '(x+1)^2 - 4'], ['collect', '@prev', 'x'],
+                 ['factor_quadratic', '@prev', 'x']]
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = toymath_cli.main(['batch', json.dumps(calls),
+                                     '--session', path])
+        self.assertEqual(code, 0)
+        rec = json.loads(output.getvalue())
+        self.assertEqual(rec['result'],
+                         r'\left(x - 1\right)\left(x + 3\right)')
+        self.assertEqual(len(Ledger(path).steps), 3)
+        before = Ledger(path).steps
+        with redirect_stdout(io.StringIO()):
+            code = toymath_cli.main([
+                'batch', json.dumps(calls[:2] + [['diff', '@prev', '@9']]),
+                '--session', path])
+        self.assertNotEqual(code, 0)
+        self.assertEqual(Ledger(path).steps, before)
+        self.assertEqual(Ledger(path).replay()['status'], 'verified')
+
+    def test_cli_single_and_batch_steps_record_alike(self):
+        folder = tempfile.mkdtemp()
+        records = []
+        for argv in (['expand', '(x+1)^2'],
+                     ['batch', json.dumps([['expand', '(x+1)^2']])]):
+            for goal in (['--goal', 'c9'], []):
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    toymath_cli.main(argv + goal + [
+                        '--session', os.path.join(folder, argv[0] + '.json')])
+                rec = json.loads(output.getvalue())
+                records.append(rec.get('records', [rec])[0])
+        refused, single, refused_in_batch, batched = records
+        self.assertEqual(refused, refused_in_batch)
+        self.assertEqual(refused['error'], "unknown goal 'c9'")
+        self.assertNotIn('step', refused)
+        self.assertEqual(single, batched)
+        self.assertEqual(single['step']['id'], 's1')
+
     def test_cli_open_records_replayable_open_outcome(self):
         from ledger import Ledger
         from tactics import core
@@ -599,5 +664,143 @@ class TestTacticRegistry(unittest.TestCase):
         self.assertIn('under the stated assumptions', verdict['method'])
 
 
+class TestCliDaemon(unittest.TestCase):
+    def setUp(self):
+        import threading
+        from unittest import mock
+        self.folder = tempfile.mkdtemp()
+        self.socket = os.path.join(self.folder, 'cli.sock')
+        env = mock.patch.dict(os.environ, {
+            'TOYMATH_REPLAY_CACHE': os.path.join(self.folder, 'cache')})
+        env.start()
+        self.addCleanup(env.stop)
+        self.daemon = toymath_cli.CliDaemon(self.socket)
+        self.thread = threading.Thread(target=self.daemon.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.daemon.shutdown()
+        self.thread.join()
+        self.daemon.server_close()
+
+    def forward(self, argv):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = toymath_cli.forward(argv, self.socket)
+        return code, output.getvalue()
+
+    def test_forwarded_runs_match_in_process_runs(self):
+        from ledger import Ledger
+
+        path = os.path.join(self.folder, 'work.json')
+        code, out = self.forward(['expand', '(x+1)^2', '--session', path])
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out)['step']['id'], 's1')
+        code, out = self.forward(['claim', 'x = 1', '--session', path])
+        self.assertEqual((code, json.loads(out)['id']), (0, 'c1'))
+        self.assertEqual(len(Ledger(path).steps), 1)
+        for argv in (['describe', 'expand'],
+                     ['replay', '--session', path, '--full', '--jobs', '1'],
+                     ['describe', 'no_such_tactic']):
+            local = io.StringIO()
+            with redirect_stdout(local):
+                expected = toymath_cli.main(argv)
+            self.assertEqual(self.forward(argv),
+                             (expected, local.getvalue()))
+        self.assertEqual(self.forward(['nonsense'])[0], 2)
+
+    def test_open_ledgers_notice_outside_writes(self):
+        from ledger import Ledger
+        from tactics import core
+
+        path = os.path.join(self.folder, 'work.json')
+        self.assertEqual(
+            self.forward(['expand', '(x+1)^2', '--session', path])[0], 0)
+        outside = Ledger(path)
+        outside.record(core.expand('(x+2)^2'))
+        outside.save()
+        code, out = self.forward(['expand', '(x+3)^2', '--session', path])
+        self.assertEqual(json.loads(out)['step']['id'], 's3')
+        self.assertEqual(Ledger(path).replay()['status'], 'verified')
+
+    def test_batch_reads_the_callers_stdin(self):
+        from unittest import mock
+
+        calls = '[["expand", "(x+1)^2"]]'
+        with mock.patch('sys.stdin', io.StringIO(calls)):
+            code, out = self.forward(['batch', '-'])
+        self.assertEqual(code, 0, out)
+        self.assertEqual(json.loads(out)['result'], 'x^{2}+2x+1')
+        # the daemon never falls back to reading its own stdin
+        with mock.patch('sys.stdin', io.StringIO('')):
+            code, out = self.forward(['batch', '[["expand", "(x+2)^2"]]'])
+        self.assertEqual(json.loads(out)['result'], 'x^{2}+4x+4')
+
+    def test_no_daemon_means_run_in_process(self):
+        self.assertIsNone(toymath_cli.forward(
+            ['tactics'], os.path.join(self.folder, 'absent.sock')))
+
+
+class TestColdStart(unittest.TestCase):
+    """Front ends must start without the heavy optional stack."""
+
+    HEAVY = ('numpy', 'IPython', 'yaml', 'tactics', 'concurrent',
+             'agent_config', 'agent_backends', 'agent_do', 'observability')
+
+    # cumulative microseconds `python -X importtime` may report per front
+    # end: several times a warm import, so only a heavy stack dragged back
+    # in trips it, never a slow machine
+    IMPORT_BUDGET_US = {'mathShell': 500000, 'toymath_cli': 500000,
+                        'ledger': 500000}
+
+    def probe_env(self):
+        here = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+            [here, os.path.dirname(here)]))
+        # timed imports read compiled bytecode, as a user's second start does
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        return env
+
+    def loaded_roots(self, module):
+        probe = (f'import sys, {module}; '
+                 'print(" ".join(sorted({n.split(".")[0] '
+                 'for n in sys.modules})))')
+        out = subprocess.run([sys.executable, '-c', probe],
+                             env=self.probe_env(), capture_output=True,
+                             text=True, check=True)
+        return set(out.stdout.split())
+
+    def import_time_us(self, module):
+        env = self.probe_env()
+        subprocess.run([sys.executable, '-c', f'import {module}'], env=env,
+                       check=True)
+        out = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            env=env, capture_output=True, text=True, check=True)
+        for line in out.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                return int(fields[1])
+        self.fail(f'-X importtime reported no {module}')
+
+    def test_kernel_and_cli_import_without_heavy_modules(self):
+        for module in ('mathShell', 'toymath_cli', 'ledger'):
+            with self.subTest(module=module):
+                self.assertFalse(
+                    self.loaded_roots(module).intersection(self.HEAVY))
+
+    def test_kernel_and_cli_import_within_budget(self):
+        for module, budget in self.IMPORT_BUDGET_US.items():
+            with self.subTest(module=module):
+                self.assertLess(self.import_time_us(module), budget)
+
+    def test_lazy_tactic_modules_load_on_first_call(self):
+        expand = tactic_registry.core.expand
+        self.assertEqual((expand.__module__, expand.__name__),
+                         ('tactics.core', 'expand'))
+        record = tactic_registry.invoke_cli('expand', {'expr': '(x+1)*(x+1)'})
+        self.assertTrue(record['ok'], record)
+
+
 if __name__ == '__main__':
     unittest.main()
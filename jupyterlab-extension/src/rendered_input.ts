@@ -54,24 +54,28 @@ export type PreviewSegment =
   | IRefSegment
   | IBreakSegment;
 
-/** The reply payload the kernel sends back over the render comm. */
+/**
+ * The reply payload the kernel sends back over the render comm.
+ *
+ * A reply to a request that named `since` may carry only what changed
+ * against that earlier reply: `segments` then replaces its
+ * `segments[start:end]`.
+ */
 export interface IPreviewReply {
   id?: unknown;
   segments?: unknown;
+  since?: unknown;
+  start?: unknown;
+  end?: unknown;
 }
 
-/**
- * Validate one comm reply into segments, or null to keep the source.
- *
- * A reply that carries nothing but a label renders nothing: an input area
- * showing only `int!` would hide the cell instead of explaining it.
- */
-export function readSegments(data: IPreviewReply): PreviewSegment[] | null {
-  if (!Array.isArray(data?.segments)) {
+/** Validate a list of raw segments, or null if any of them is malformed. */
+function readList(list: unknown): PreviewSegment[] | null {
+  if (!Array.isArray(list)) {
     return null;
   }
   const segments: PreviewSegment[] = [];
-  for (const raw of data.segments) {
+  for (const raw of list) {
     const kind = (raw as { kind?: unknown })?.kind;
     const text = (raw as { text?: unknown })?.text;
     const latex = (raw as { latex?: unknown })?.latex;
@@ -88,9 +92,68 @@ export function readSegments(data: IPreviewReply): PreviewSegment[] | null {
       return null;
     }
   }
+  return segments;
+}
+
+/**
+ * Keep only a list that has something to render, else null.
+ *
+ * A reply that carries nothing but a label renders nothing: an input area
+ * showing only `int!` would hide the cell instead of explaining it.
+ */
+function renderable(
+  segments: PreviewSegment[] | null
+): PreviewSegment[] | null {
   const carries = (segment: PreviewSegment): boolean =>
     segment.kind === 'math' || segment.kind === 'ref';
-  return segments.some(carries) ? segments : null;
+  return segments?.some(carries) ? segments : null;
+}
+
+/** Validate one comm reply into segments, or null to keep the source. */
+export function readSegments(data: IPreviewReply): PreviewSegment[] | null {
+  return renderable(readList(data?.segments));
+}
+
+/** A reply already read in full, kept as the base for the next `since`. */
+export interface IPreviewBase {
+  readonly id: string;
+  readonly segments: PreviewSegment[];
+}
+
+/**
+ * The full segment list a reply stands for, before the render check.
+ *
+ * A reply naming `since` splices its segments into that base; one naming a
+ * base other than the one the request offered, or a range outside it, is
+ * unreadable rather than guessed at.
+ */
+export function replyList(
+  data: IPreviewReply,
+  base: IPreviewBase | null
+): PreviewSegment[] | null {
+  const changed = readList(data?.segments);
+  if (data?.since === undefined || changed === null) {
+    return changed;
+  }
+  const { start, end } = data;
+  if (
+    base === null ||
+    data.since !== base.id ||
+    !Number.isInteger(start) ||
+    !Number.isInteger(end)
+  ) {
+    return null;
+  }
+  const from = start as number;
+  const to = end as number;
+  if (from < 0 || from > to || to > base.segments.length) {
+    return null;
+  }
+  return [
+    ...base.segments.slice(0, from),
+    ...changed,
+    ...base.segments.slice(to)
+  ];
 }
 
 /**
@@ -130,12 +193,13 @@ export function shouldRender(state: IRenderState): boolean {
 }
 
 export interface IPreviewTransport {
-  send(payload: { id: string; code: string }): void;
+  send(payload: { id: string; code: string; since?: string }): void;
 }
 
 interface IPendingPreview {
   readonly code: string;
   readonly cacheable: boolean;
+  readonly base: IPreviewBase | null;
   readonly settle: (segments: PreviewSegment[] | null) => void;
 }
 
@@ -144,6 +208,11 @@ interface IPendingPreview {
  *
  * Several cells ask at once — a freshly opened notebook asks for all of
  * them — so replies are matched by request id rather than by arrival order.
+ *
+ * Each request names the last reply read in full as its `since`: while a
+ * cell is being typed in, that is the same cell one keystroke ago, and the
+ * kernel answers with the few segments that changed. The base travels with
+ * the request, so replies arriving out of order still splice correctly.
  */
 export class PreviewRequests {
   constructor(transport: IPreviewTransport, limit = 256) {
@@ -164,10 +233,13 @@ export class PreviewRequests {
       return Promise.resolve(this._cache.get(code)!);
     }
     const id = `${++this._counter}`;
+    const base = this._base;
     return new Promise(resolve => {
-      this._pending.set(id, { code, cacheable, settle: resolve });
+      this._pending.set(id, { code, cacheable, base, settle: resolve });
       try {
-        this._transport.send({ id, code });
+        this._transport.send(
+          base === null ? { id, code } : { id, code, since: base.id }
+        );
       } catch (error) {
         this._pending.delete(id);
         resolve(null);
@@ -186,7 +258,11 @@ export class PreviewRequests {
       return;
     }
     this._pending.delete(id);
-    const segments = readSegments(data);
+    const list = replyList(data, pending.base);
+    if (list !== null) {
+      this._base = { id, segments: list };
+    }
+    const segments = renderable(list);
     if (pending.cacheable) {
       this._remember(pending.code, segments);
     }
@@ -204,6 +280,7 @@ export class PreviewRequests {
     const pending = Array.from(this._pending.values());
     this._pending.clear();
     this._cache.clear();
+    this._base = null;
     // Settled without an answer, so nothing is learned: a request abandoned
     // here must not leave "renders as nothing" behind in the cache.
     pending.forEach(entry => entry.settle(null));
@@ -222,6 +299,7 @@ export class PreviewRequests {
   private _transport: IPreviewTransport;
   private _limit: number;
   private _counter = 0;
+  private _base: IPreviewBase | null = null;
   private _pending = new Map<string, IPendingPreview>();
   private _cache = new Map<string, PreviewSegment[] | null>();
 }
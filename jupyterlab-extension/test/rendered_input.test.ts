@@ -5,16 +5,17 @@ import {
   displayMath,
   PreviewRequests,
   readSegments,
+  replyList,
   shouldRender
 } from '../src/rendered_input.ts';
 import type { IPreviewTransport } from '../src/rendered_input.ts';
 
 /** A transport that records what was sent and answers on demand. */
 class FakeTransport implements IPreviewTransport {
-  sent: { id: string; code: string }[] = [];
+  sent: { id: string; code: string; since?: string }[] = [];
   failing = false;
 
-  send(payload: { id: string; code: string }): void {
+  send(payload: { id: string; code: string; since?: string }): void {
     if (this.failing) {
       throw new Error('kernel is gone');
     }
@@ -194,3 +195,70 @@ test('the cache does not grow without bound', async () => {
   void requests.request('c'); // still known
   assert.equal(transport.sent.length, 4);
 });
+
+test('a reply against a base splices in what changed', () => {
+  const segments = readSegments({ segments: [LABEL, MATH] })!;
+  const base = { id: '3', segments };
+  const list = replyList(
+    {
+      id: '4',
+      since: '3',
+      start: 1,
+      end: 2,
+      segments: [{ kind: 'math', latex: 'x^{3}' }]
+    },
+    base
+  );
+  assert.deepEqual(list, [
+    { kind: 'command', text: 'int!' },
+    { kind: 'math', latex: 'x^{3}' }
+  ]);
+});
+
+test('a splice that does not fit its base is unreadable', () => {
+  const base = { id: '3', segments: readSegments({ segments: [MATH] })! };
+  const change = { id: '4', since: '3', start: 0, end: 1, segments: [] };
+  assert.equal(replyList({ ...change, since: '2' }, base), null);
+  assert.equal(replyList({ ...change, end: 2 }, base), null);
+  assert.equal(replyList({ ...change, start: 'a' }, base), null);
+  assert.equal(replyList(change, null), null);
+  assert.deepEqual(replyList(change, base), []);
+});
+
+test('each request offers the last full reply as its base', async () => {
+  const transport = new FakeTransport();
+  const requests = new PreviewRequests(transport);
+  const first = requests.request('x^2');
+  assert.equal(transport.sent[0].since, undefined);
+  requests.resolve({ id: transport.sent[0].id, segments: [LABEL, MATH] });
+  await first;
+
+  const second = requests.request('x^2+1');
+  const third = requests.request('x^2+2');
+  assert.equal(transport.sent[1].since, transport.sent[0].id);
+  assert.equal(transport.sent[2].since, transport.sent[0].id);
+  // answered out of order, each against the base its request offered
+  requests.resolve({
+    id: transport.sent[2].id,
+    since: transport.sent[0].id,
+    start: 1,
+    end: 2,
+    segments: [{ kind: 'math', latex: 'x^{2}+2' }]
+  });
+  requests.resolve({
+    id: transport.sent[1].id,
+    since: transport.sent[0].id,
+    start: 1,
+    end: 2,
+    segments: [{ kind: 'math', latex: 'x^{2}+1' }]
+  });
+  assert.deepEqual(await second, [LABEL, { kind: 'math', latex: 'x^{2}+1' }]);
+  assert.deepEqual(await third, [LABEL, { kind: 'math', latex: 'x^{2}+2' }]);
+
+  void requests.request('y');
+  assert.equal(transport.sent[3].since, transport.sent[1].id);
+  // a new kernel never saw these ids
+  requests.reset();
+  void requests.request('z');
+  assert.equal(transport.sent[4].since, undefined);
+});
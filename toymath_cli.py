@@ -2,17 +2,102 @@
 # -*- coding: utf-8 -*-
 """Deterministic JSON CLI for the verified-derivation tactic registry."""
 import argparse
+import contextlib
+import io
 import json
 import os
+import socket
+import socketserver
 import sys
 from types import SimpleNamespace
 
+# Client half of `serve`: with TOYMATH_SOCKET set, a run hands its argv
+# to the warm daemon, before paying for the engine imports below.  The
+# server half is at the end of the file.
+
+SOCKET_ENV = 'TOYMATH_SOCKET'
+DEFAULT_SOCKET = os.path.join('~', '.toymath', 'cli.sock')
+
+
+def default_socket():
+    return os.path.expanduser(os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET)
+
+
+def _connect(path, timeout=None):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _call(sock, method, params=None):
+    with sock:
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': method,
+                   'params': params or {}}
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError('daemon closed the connection')
+    reply = json.loads(line)
+    if 'error' in reply:
+        raise RuntimeError(reply['error']['message'])
+    return reply['result']
+
+
+def _daemon_alive(path):
+    try:
+        _call(_connect(path, timeout=1.0), 'ping')
+    except (OSError, ValueError, RuntimeError):
+        return False
+    return True
+
+
+def _reads_stdin(argv):
+    return argv[:1] == ['batch'] and '-' in argv[1:]
+
+
+def forward(argv, path=None):
+    """Run ``argv`` on the daemon and replay its output here.
+
+    Returns the exit code, or None when no daemon answers — the caller
+    then runs the command in-process, so a stale TOYMATH_SOCKET only
+    costs the cold start it was meant to save."""
+    if path is None:
+        if not os.environ.get(SOCKET_ENV) or argv[:1] == ['serve']:
+            return None
+        path = default_socket()
+    try:
+        sock = _connect(path)
+    except OSError:
+        return None
+    # connected: the daemon owns the command now, and a failure past this
+    # point must not run it a second time here
+    params = {'argv': list(argv), 'cwd': os.getcwd()}
+    if _reads_stdin(argv):
+        # the daemon's own stdin is not ours: the input travels with the call
+        params['stdin'] = sys.stdin.read()
+    result = _call(sock, 'run', params)
+    sys.stdout.write(result['stdout'])
+    sys.stderr.write(result['stderr'])
+    return result['code']
+
+
+if __name__ == '__main__':
+    _forwarded = forward(sys.argv[1:])
+    if _forwarded is not None:
+        sys.exit(_forwarded)
+
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
                                 'engine'))
 
 import tactic_registry  # noqa: E402
-import tactic_skills  # noqa: E402
-from ledger import Ledger, TRANSFORMING_OPS  # noqa: E402
+from ledger import (Ledger, ReplayCache, TRANSFORMING_OPS,  # noqa: E402
+                    verdict_cache_path)
 
 
 def emit(obj, pretty=False):
@@ -23,25 +108,71 @@ def emit(obj, pretty=False):
     return 0 if obj.get('ok', True) else 1
 
 
+def _open_ledger(path):
+    if _SESSIONS is not None:
+        return _SESSIONS.open(path)
+    return Ledger(path)
+
+
+def _records(result):
+    return bool(result.get('ok')) and result['op'] in TRANSFORMING_OPS
+
+
+def _record_step(ledger, result, goal=None):
+    """Record a transforming result into `ledger`.
+
+    Returns (result, recorded): a copy carrying its `step` id and hash, or
+    a refused copy with the ledger's reason; anything that is not a
+    successful transforming result comes back as it is."""
+    if not _records(result):
+        return result, False
+    try:
+        step = ledger.record(result, goal=goal)
+    except ValueError as exc:
+        refused = dict(result)
+        refused['ok'] = False
+        refused['error'] = str(exc)
+        return refused, False
+    result = dict(result)
+    result['step'] = {'id': step['id'], 'hash': step['hash']}
+    return result, True
+
+
 def with_session(result, session_path, goal=None):
-    if session_path and result.get('ok') and result['op'] in TRANSFORMING_OPS:
-        ledger = Ledger(session_path)
-        try:
-            step = ledger.record(result, goal=goal)
-        except ValueError as exc:
-            refused = dict(result)
-            refused['ok'] = False
-            refused['error'] = str(exc)
-            return refused
-        ledger.save()
-        result['step'] = {'id': step['id'], 'hash': step['hash']}
+    if session_path and _records(result):
+        ledger = _open_ledger(session_path)
+        result, recorded = _record_step(ledger, result, goal=goal)
+        if recorded:
+            ledger.save()
     return result
 
 
+class _BatchContext(object):
+    """What `tactic_registry.invoke_batch` needs from a CLI session: a
+    ledger to record into (or none), and its transaction."""
+
+    def __init__(self, ledger, goal=None):
+        self.ledger = ledger
+        self.goal = goal
+
+    def transaction(self):
+        if self.ledger is None:
+            return contextlib.nullcontext()
+        return self.ledger.transaction()
+
+    def record(self, result):
+        if self.ledger is None:
+            return result
+        return _record_step(self.ledger, result, goal=self.goal)[0]
+
+
 def build_parser():
     common = argparse.ArgumentParser(add_help=False)
     common.add_argument('--session', help='ledger JSON file to append to')
     common.add_argument('--goal', help='claim id this step serves (e.g. c1)')
+    common.add_argument('--verdict-cache', action='store_true',
+                        help='keep oracle verdicts on disk beside the '
+                             '--session file, for later runs to reuse')
     common.add_argument('--pretty', action='store_true',
                         help='indented JSON output')
     parser = argparse.ArgumentParser(
@@ -53,6 +184,12 @@ def build_parser():
     for spec in tactic_registry.TACTICS:
         tactic_registry.add_cli_parser(sub, common, spec)
 
+    p = sub.add_parser('batch', parents=[common],
+                       help='run a fixed tactic pipeline as one step '
+                            'group, all-or-nothing')
+    p.add_argument('calls', help='JSON list of [tactic, arg, ...]; "@prev" '
+                                 'or "@N" pipes an earlier result; - reads '
+                                 'stdin')
     p = sub.add_parser('skills', parents=[common],
                        help='list progressively loadable tactic skills')
     p = sub.add_parser('tactics', parents=[common],
@@ -82,8 +219,17 @@ def build_parser():
     p = sub.add_parser('show', parents=[common],
                        help='render the session ledger')
     p.add_argument('--format', choices=['text', 'md'], default='text')
-    sub.add_parser('replay', parents=[common],
-                   help='re-verify every step in the session')
+    p = sub.add_parser('replay', parents=[common],
+                       help='re-verify every step in the session')
+    p.add_argument('--full', action='store_true',
+                   help='re-run steps the replay cache already verified')
+    p.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                   help='worker processes for transforming steps')
+    p = sub.add_parser('serve',
+                       help='keep a warm CLI on a local socket; runs with '
+                            'TOYMATH_SOCKET set forward to it')
+    p.add_argument('--socket', help=f'socket path (default '
+                                    f'${SOCKET_ENV} or {DEFAULT_SOCKET})')
     return parser
 
 
@@ -93,15 +239,28 @@ def _require_session(args, op):
     return {'ok': False, 'op': op, 'error': '--session required'}
 
 
+def _attach_verdicts(args):
+    """Point the oracle's disk tier at the session's folder for this run,
+    or detach it: a warm daemon carries it over from the previous one."""
+    path = None
+    if getattr(args, 'verdict_cache', False) and args.session:
+        path = verdict_cache_path(args.session)
+    elif 'primitives' not in sys.modules:
+        return
+    import primitives
+    primitives.VERDICT_CACHE.attach(path)
+
+
 def main(argv=None):
     args = build_parser().parse_args(argv)
+    _attach_verdicts(args)
 
     if args.cmd in tactic_registry.BY_NAME:
         spec = tactic_registry.BY_NAME[args.cmd]
         values = tactic_registry.parsed_cli_values(args, spec)
         context = None
         if spec.cli_handler is not None and args.session:
-            context = SimpleNamespace(ledger=Ledger(args.session))
+            context = SimpleNamespace(ledger=_open_ledger(args.session))
         result = tactic_registry.invoke_cli(args.cmd, values, context)
         try:
             result = with_session(result, args.session, goal=args.goal)
@@ -110,13 +269,33 @@ def main(argv=None):
                       'error': str(exc)}
         return emit(result, args.pretty)
 
+    if args.cmd == 'batch':
+        try:
+            calls = json.loads(sys.stdin.read() if args.calls == '-'
+                               else args.calls)
+        except ValueError as exc:
+            return emit({'ok': False, 'op': 'batch',
+                         'error': f'calls are not JSON: {exc}'}, args.pretty)
+        ledger = _open_ledger(args.session) if args.session else None
+        try:
+            result = tactic_registry.invoke_batch(
+                calls, _BatchContext(ledger, goal=args.goal),
+                require_loaded=False)
+        except ValueError as exc:
+            result = {'ok': False, 'op': 'batch', 'error': str(exc)}
+        if ledger is not None and result.get('ok') and result['steps']:
+            ledger.save()
+        return emit(result, args.pretty)
+
     if args.cmd == 'skills':
+        import tactic_skills  # the skill documents (and yaml) load here only
         errors = tactic_skills.validate()
         return emit({'ok': not errors,
                      'skills': tactic_skills.catalog_records(),
                      **({'errors': errors} if errors else {})}, args.pretty)
 
     if args.cmd == 'tactics':
+        import tactic_skills
         if args.skill and args.skill not in tactic_skills.discover():
             return emit({'ok': False, 'op': 'tactics',
                          'error': f'unknown skill {args.skill!r}'},
@@ -138,7 +317,7 @@ def main(argv=None):
         error = _require_session(args, 'claim')
         if error:
             return emit(error, args.pretty)
-        ledger = Ledger(args.session)
+        ledger = _open_ledger(args.session)
         try:
             claim = ledger.record_claim(args.statement, parent=args.parent)
         except ValueError as exc:
@@ -151,7 +330,7 @@ def main(argv=None):
         error = _require_session(args, 'conclude')
         if error:
             return emit(error, args.pretty)
-        ledger = Ledger(args.session)
+        ledger = _open_ledger(args.session)
         try:
             claim = ledger.conclude(args.claim_id, args.step_ids)
         except ValueError as exc:
@@ -166,7 +345,7 @@ def main(argv=None):
         error = _require_session(args, 'branch')
         if error:
             return emit(error, args.pretty)
-        ledger = Ledger(args.session)
+        ledger = _open_ledger(args.session)
         try:
             marker = ledger.record_branch(
                 args.from_step, args.reason, goal=args.goal)
@@ -182,7 +361,7 @@ def main(argv=None):
         error = _require_session(args, 'open')
         if error:
             return emit(error, args.pretty)
-        ledger = Ledger(args.session)
+        ledger = _open_ledger(args.session)
         try:
             selection = ledger.record_open(args.reason, goal=args.goal)
         except ValueError as exc:
@@ -196,7 +375,7 @@ def main(argv=None):
         error = _require_session(args, 'show')
         if error:
             return emit(error, args.pretty)
-        ledger = Ledger(args.session)
+        ledger = _open_ledger(args.session)
         print(ledger.render_markdown() if args.format == 'md'
               else ledger.render())
         return 0
@@ -205,12 +384,186 @@ def main(argv=None):
         error = _require_session(args, 'replay')
         if error:
             return emit(error, args.pretty)
-        report = Ledger(args.session).replay()
+        report = _open_ledger(args.session).replay(
+            cache=ReplayCache.default(), full=args.full, workers=args.jobs)
         report['ok'] = report['status'] == 'verified'
         return emit(report, args.pretty)
 
+    if args.cmd == 'serve':
+        if _SESSIONS is not None:
+            return emit({'ok': False, 'op': 'serve',
+                         'error': 'already serving'}, args.pretty)
+        return serve(args.socket or default_socket())
+
     return emit({'ok': False, 'error': f'unknown command {args.cmd}'})
 
 
+# ---------------------------------------------------------------------------
+# Daemon: `serve` keeps one warm interpreter — imported tactic modules, parse
+# caches and open ledgers — behind a UNIX socket. One JSON-RPC 2.0 request
+# per line; "run" answers {code, stdout, stderr}, exactly what the same argv
+# would have printed and returned in-process.
+
+# the open-ledger pool while serving; None runs every command from disk
+_SESSIONS = None
+
+
+def _file_state(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class _LedgerPool(object):
+    """Ledgers kept open between requests, keyed by real path.
+
+    A pooled ledger is reused only while its file is exactly as this
+    process left it; an outside writer, or a request that failed and may
+    have left the in-memory ledger ahead of its file, sends the next
+    request back to disk."""
+
+    def __init__(self):
+        self._open = {}
+        self._used = {}
+
+    def open(self, path):
+        key = os.path.realpath(path)
+        held = self._open.get(key)
+        if held is not None and held[1] == _file_state(key):
+            ledger = held[0]
+        else:
+            if held is not None:
+                del self._open[key]
+                held[0].close()
+            ledger = Ledger(path)
+        self._used[key] = ledger
+        return ledger
+
+    def settle(self, ok):
+        for key, ledger in self._used.items():
+            if ok:
+                self._open[key] = (ledger, _file_state(key))
+            else:
+                self._open.pop(key, None)
+                ledger.close()
+        self._used = {}
+
+
+def _run_captured(argv, cwd=None, stdin=None):
+    out, err = io.StringIO(), io.StringIO()
+    here = os.getcwd()
+    code = 1
+    held_stdin = sys.stdin
+    try:
+        if cwd:
+            os.chdir(cwd)
+        # never the daemon's own stdin: a read there would block the server
+        sys.stdin = io.StringIO(stdin or '')
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                code = main(argv)
+            except SystemExit as exc:
+                # argparse: usage errors and --help
+                code = exc.code if isinstance(exc.code, int) else 1
+            except Exception as exc:
+                print(f'toymath: {type(exc).__name__}: {exc}',
+                      file=sys.stderr)
+    finally:
+        sys.stdin = held_stdin
+        os.chdir(here)
+        _SESSIONS.settle(code == 0)
+    return {'code': code, 'stdout': out.getvalue(),
+            'stderr': err.getvalue()}
+
+
+def _rpc_error(rid, code, message):
+    return {'jsonrpc': '2.0', 'id': rid,
+            'error': {'code': code, 'message': message}}
+
+
+class _RpcHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                reply = _rpc_error(None, -32700, 'parse error')
+            else:
+                reply = self.server.dispatch(request)
+            self.wfile.write(json.dumps(reply, ensure_ascii=False,
+                                        default=str).encode('utf-8')
+                             + b'\n')
+            self.wfile.flush()
+
+
+class CliDaemon(socketserver.UnixStreamServer):
+    """JSON-RPC server for `serve`. Requests are handled one at a time:
+    commands share the process's stdout and working directory, and
+    commands on one session must not interleave anyway."""
+
+    def __init__(self, path):
+        global _SESSIONS
+        path = os.path.abspath(path)
+        folder = os.path.dirname(path)
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+        if os.path.exists(path):
+            if _daemon_alive(path):
+                raise OSError(f'a daemon already serves {path}')
+            os.unlink(path)
+        _SESSIONS = _LedgerPool()
+        socketserver.UnixStreamServer.__init__(self, path, _RpcHandler)
+        os.chmod(path, 0o600)
+
+    def dispatch(self, request):
+        rid = request.get('id') if isinstance(request, dict) else None
+        if not isinstance(request, dict) or request.get('jsonrpc') != '2.0':
+            return _rpc_error(rid, -32600, 'invalid request')
+        method = request.get('method')
+        params = request.get('params') or {}
+        if method == 'ping':
+            return {'jsonrpc': '2.0', 'id': rid, 'result': {'pid': os.getpid()}}
+        if method == 'shutdown':
+            # shutdown() waits for serve_forever, which is running us
+            import threading
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'jsonrpc': '2.0', 'id': rid, 'result': None}
+        if method != 'run':
+            return _rpc_error(rid, -32601, f'unknown method {method!r}')
+        argv = params.get('argv')
+        if (not isinstance(argv, list)
+                or not all(isinstance(a, str) for a in argv)):
+            return _rpc_error(rid, -32602, 'argv must be a list of strings')
+        stdin = params.get('stdin')
+        if stdin is not None and not isinstance(stdin, str):
+            return _rpc_error(rid, -32602, 'stdin must be a string')
+        return {'jsonrpc': '2.0', 'id': rid,
+                'result': _run_captured(argv, params.get('cwd'), stdin)}
+
+    def server_close(self):
+        global _SESSIONS
+        socketserver.UnixStreamServer.server_close(self)
+        _SESSIONS = None
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def serve(path):
+    try:
+        daemon = CliDaemon(path)
+    except OSError as exc:
+        return emit({'ok': False, 'op': 'serve', 'error': str(exc)})
+    print(json.dumps({'ok': True, 'op': 'serve', 'socket': path,
+                      'pid': os.getpid()}), flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+    return 0
+
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -144,18 +144,40 @@ class MathKernel(Kernel):
         the engine does not read as a formula answers with no segments, and
         the extension keeps showing the source — so a failure here costs the
         rendered view, never the cell.
+
+        A request may name, as `since`, the id of an earlier reply the
+        frontend still shows. The reply then carries only what changed:
+        `segments` replaces that reply's `segments[start:end]`. A request
+        without `since`, or naming a reply this comm no longer remembers,
+        gets the whole list as before.
         """
-        comm.on_msg(lambda msg: self._render_cell(comm, msg))
+        sent = {}
+        comm.on_msg(lambda msg: self._render_cell(comm, msg, sent))
+
+    # replies a render comm remembers as bases for `since`
+    RENDER_MEMORY = 64
 
-    def _render_cell(self, comm, msg):
+    def _render_cell(self, comm, msg, sent=None):
         data = msg['content']['data']
         try:
             segments = self.mathShell.preview_cell(data.get('code', ''))
         except Exception:
             self.log.debug('cell preview failed', exc_info=True)
             segments = None
+        reply = {'id': data.get('id'), 'segments': segments}
+        if sent is not None:
+            base = sent.get(data.get('since'))
+            if base is not None and segments is not None:
+                import cell_input        # one identity; see _model_endpoints
+                start, end, changed = cell_input.diff_segments(base, segments)
+                reply.update(since=data['since'], start=start, end=end,
+                             segments=changed)
+            if segments is not None:
+                while len(sent) >= MathKernel.RENDER_MEMORY:
+                    sent.pop(next(iter(sent)))
+                sent[data.get('id')] = segments
         try:
-            comm.send({'id': data.get('id'), 'segments': segments})
+            comm.send(reply)
         except Exception:
             self.log.debug('cell preview reply failed', exc_info=True)
 